@@ -1,5 +1,4 @@
 # standard imports
-import json
 import logging
 from typing import Union, Optional
 
@@ -10,7 +9,7 @@ from cic_types.condiments import MetadataPointer
 
 # local imports
 from cic_ussd.account.transaction import from_wei
-from cic_ussd.cache import cache_data_key, get_cached_data
+from cic_ussd.cache import cache_data_key, get_cached_data, get_cached_object
 from cic_ussd.error import CachedDataNotFoundError
 from cic_ussd.worker import Worker
 
@@ -126,9 +125,10 @@ def get_cached_display_balance(decimals: int, identifier: Union[list, bytes]) ->
     :rtype: float
     """
 
-    if not (cached_balances := get_cached_balances(identifier=identifier)):
+    key = cache_data_key(identifier=identifier, salt=MetadataPointer.BALANCES)
+    if not (cached_balances := get_cached_object(key)):
         raise CachedDataNotFoundError('No cached display balance.')
-    balances = BalancesHandler(balances=json.loads(cached_balances), decimals=decimals)
+    balances = BalancesHandler(balances=cached_balances, decimals=decimals)
     return balances.display_balance()
 
 
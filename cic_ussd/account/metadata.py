@@ -1,7 +1,10 @@
 # standard imports
 import enum
+import hashlib
 import json
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 # external imports
@@ -9,6 +12,7 @@ from cic_types.models.person import Person
 from cic_types.condiments import MetadataPointer
 
 # local imports
+from cic_ussd.cache import cache_data_key, get_many
 from cic_ussd.metadata import PreferencesMetadata
 
 logg = logging.getLogger(__name__)
@@ -53,9 +57,73 @@ def parse_account_metadata(account_metadata: dict) -> str:
     return unique_tag
 
 
+class DisplayNames:
+    """This class describes a bounded in-process cache of the names accounts are displayed with, parsed from their person
+    metadata. Names are keyed by a digest of the metadata they were parsed from, so that a change to the metadata is
+    never served a stale name and unchanged metadata is not deserialized again.
+    :cvar capacity: The maximum number of names held, the least recently used name is evicted beyond it.
+    :type capacity: int
+    """
+    capacity: int = 4096
+    entries: OrderedDict = OrderedDict()
+    hits: int = 0
+    misses: int = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, person_metadata: str) -> str:
+        """This function returns the name parsed from person metadata, parsing it only if it has not been parsed before.
+        :param person_metadata: Person metadata JSON str.
+        :type person_metadata: str
+        :return: The account's standard metadata identification information.
+        :rtype: str
+        """
+        digest = hashlib.sha256(person_metadata.encode('utf-8')).digest()
+        with cls._lock:
+            if (name := cls.entries.get(digest)) is not None:
+                cls.entries.move_to_end(digest)
+                cls.hits += 1
+                return name
+        name = parse_account_metadata(json.loads(person_metadata))
+        with cls._lock:
+            cls.misses += 1
+            cls.entries[digest] = name
+            while len(cls.entries) > cls.capacity:
+                cls.entries.popitem(last=False)
+        return name
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls.entries.clear()
+
+
+def standard_metadata_ids(accounts: list) -> list:
+    """This function returns the standard metadata identification information of several accounts, reading their person
+    metadata in a single round trip. An account without person metadata is identified by its phone number.
+    :param accounts: Account objects, None entries are answered with None.
+    :type accounts: list
+    :return: Standard metadata identification information in the order of the accounts.
+    :rtype: list
+    """
+    keys = [cache_data_key(bytes.fromhex(account.blockchain_address), MetadataPointer.PERSON)
+            for account in accounts if account is not None]
+    person_metadata = iter(get_many(keys) if keys else [])
+    metadata_ids = []
+    for account in accounts:
+        if account is None:
+            metadata_ids.append(None)
+        elif cached_person_metadata := next(person_metadata):
+            metadata_ids.append(DisplayNames.get(cached_person_metadata))
+        else:
+            metadata_ids.append(account.phone_number)
+    return metadata_ids
+
+
 class UssdMetadataPointer(enum.Enum):
     BALANCE_SPENDABLE = ":cic.balance.adjusted_spendable"
     LOCKED_ACCOUNT_TOKEN = ":cic.account.locked_account_token"
     COMMUNITY_FUND_BALANCE = ":cic.account.community_fund_balance"
     TOKEN_SINK_ADDRESS = ":cic.token.sink.address"
+    STATEMENT_PAGES = ":cic.statement.pages"
     ACCOUNT_VILLAGE = "cic.account.village"
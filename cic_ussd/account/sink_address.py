@@ -0,0 +1,86 @@
+# standard imports
+import logging
+import time
+from itertools import count
+
+# external imports
+import requests
+from chainlib.eth.address import to_checksum_address
+from chainlib.hash import strip_0x
+
+# local imports
+from cic_ussd.account.chain import Chain
+from cic_ussd.error import JsonRpcError
+from cic_ussd.http.requests import error_handler, HttpClient
+
+logg = logging.getLogger(__file__)
+
+# first four bytes of keccak256(b'sinkAddress()')
+SINK_ADDRESS_SELECTOR = '0x84dde4af'
+
+
+class SinkAddressResolver:
+    """This class resolves the sink address of a token by calling its sinkAddress() method on the chain node directly,
+    over the pooled http session that is shared by all calls in the process. Resolved addresses are kept per token
+    address for the length of the ttl.
+    :cvar timeout: The number of seconds to wait for the chain node to respond.
+    :type timeout: int
+    :cvar ttl: The number of seconds a resolved sink address is kept.
+    :type ttl: int
+    """
+    resolved: dict = {}
+    timeout: int = 10
+    ttl: int = 3600
+    _request_ids = count(1)
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        return HttpClient.session()
+
+    @classmethod
+    def eth_call(cls, to: str, data: str, gas: int) -> str:
+        """This function calls a contract method without creating a transaction.
+        :param to: The address of the contract.
+        :type to: str
+        :param data: The abi encoded method call.
+        :type data: str
+        :param gas: The maximum gas the call may use.
+        :type gas: int
+        :raises JsonRpcError: If the chain node responds with an error.
+        :return: The hex encoded value returned by the method.
+        :rtype: str
+        """
+        payload = {
+            'jsonrpc': '2.0',
+            'id': next(cls._request_ids),
+            'method': 'eth_call',
+            'params': [{'to': to, 'data': data, 'gas': hex(gas)}, 'latest']
+        }
+        result = cls.session().post(Chain.rpc_provider, json=payload, timeout=cls.timeout)
+        if not result.ok:
+            error_handler(result)
+        response = result.json()
+        if 'error' in response:
+            raise JsonRpcError(f'Call to: {to} failed: {response.get("error")}')
+        return response.get('result')
+
+    @classmethod
+    def resolve(cls, token_address: str, fee_limit: int = 100000) -> str:
+        """This function returns a token's sink address.
+        :param token_address: The address of the token contract.
+        :type token_address: str
+        :param fee_limit: The maximum gas the call may use.
+        :type fee_limit: int
+        :return: The sink address as lowercase hex without a 0x prefix.
+        :rtype: str
+        """
+        token_address = to_checksum_address(token_address)
+        now = time.monotonic()
+        cached = cls.resolved.get(token_address)
+        if cached and cached[1] > now:
+            return cached[0]
+        result = cls.eth_call(to=token_address, data=SINK_ADDRESS_SELECTOR, gas=int(fee_limit))
+        sink_address = strip_0x(result)[-40:].lower()
+        logg.debug(f'Resolved sink address: {sink_address} for token: {token_address}')
+        cls.resolved[token_address] = (sink_address, now + cls.ttl)
+        return sink_address
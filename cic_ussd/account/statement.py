@@ -10,13 +10,24 @@ from cic_types.condiments import MetadataPointer
 
 # local import
 from cic_ussd.account.chain import Chain
+from cic_ussd.account.metadata import UssdMetadataPointer
 from cic_ussd.account.transaction import from_wei
-from cic_ussd.cache import cache_data_key, get_cached_data
+from cic_ussd.cache import cache_data_key, get_cached_data, update_cached_objects
 from cic_ussd.time import TimezoneHandler
+from cic_ussd.translation import translation_for
 from cic_ussd.worker import Worker
 
 logg = logging.getLogger(__name__)
 
+# the maximum number of transactions kept in an account's statement.
+statement_limit = 9
+
+# translation keys of the action and direction tags by an account's role in a transaction.
+statement_tag_keys = {
+    'recipient': ('helpers.received', 'helpers.from'),
+    'sender': ('helpers.sent', 'helpers.to')
+}
+
 
 def filter_statement_transactions(transaction_list: list) -> list:
     """This function parses a transaction list and removes all transactions that entail interactions with the
@@ -29,21 +40,20 @@ def filter_statement_transactions(transaction_list: list) -> list:
     return [tx for tx in transaction_list if tx.get('source_token') != '0x0000000000000000000000000000000000000000' and tx.get('status') == 'SUCCESS']
 
 
-def generate(querying_party: str, queue: Optional[str], transaction: dict):
+def process(querying_party: str, queue: Optional[str], transactions: list):
+    """This function queues a single task that parses a batch of an account's transactions and caches them in its
+    statement.
+    :param querying_party: The blockchain address of the account the statement belongs to.
+    :type querying_party: str
+    :param queue: The queue the task is routed to.
+    :type queue: str
+    :param transactions: The account's transaction objects as produced by transaction_actors.
+    :type transactions: list
     """
-    :param querying_party:
-    :type querying_party:
-    :param queue:
-    :type queue:
-    :param transaction:
-    :type transaction:
-    :return:
-    :rtype:
-    """
-    s_generate_statement = celery.signature(
-        'cic_ussd.tasks.processor.generate_statement', [querying_party, transaction], queue=queue
+    s_process_statement = celery.signature(
+        'cic_ussd.tasks.processor.process_statement', [querying_party, transactions], queue=queue
     )
-    s_generate_statement.apply_async()
+    s_process_statement.apply_async()
 
 
 def get_cached_statement(blockchain_address: str) -> bytes:
@@ -66,24 +76,103 @@ def parse_statement_transactions(statement: list):
     :return:
     :rtype:
     """
-    parsed_transactions = []
     statement.sort(key=lambda d: d['timestamp'], reverse=True)
-    for transaction in statement:
-        action_tag = transaction.get('action_tag')
-        decimals = transaction.get('token_decimals')
-        amount = from_wei(decimals, transaction.get('token_value'))
-        direction_tag = transaction.get('direction_tag')
-        token_symbol = transaction.get('token_symbol')
-        metadata_id = transaction.get('alt_metadata_id')
-        timezone_handler = TimezoneHandler()
-        timestamp = transaction.get('timestamp')
-        timestamp = timezone_handler.convert(timestamp)
-        transaction_repr = f'{action_tag} {amount} {token_symbol} {direction_tag} {metadata_id} {timestamp}'
-        parsed_transactions.append(transaction_repr)
-    return parsed_transactions
-
-
-def query_statement(blockchain_address: str, limit: int = 9):
+    timezone_handler = TimezoneHandler()
+    return [render_statement_transaction(transaction, timezone_handler) for transaction in statement]
+
+
+def render_statement_transaction(transaction: dict,
+                                 timezone_handler: TimezoneHandler,
+                                 preferred_language: Optional[str] = None) -> str:
+    """This function renders a transaction object as a line in an account's statement.
+    :param transaction: A transaction object.
+    :type transaction: dict
+    :param timezone_handler: A handler converting timestamps to the configured timezone.
+    :type timezone_handler: TimezoneHandler
+    :param preferred_language: The language to render action and direction tags in, defaults to the tags the transaction
+    was parsed with.
+    :type preferred_language: str
+    :return: A statement line.
+    :rtype: str
+    """
+    action_tag = transaction.get('action_tag')
+    direction_tag = transaction.get('direction_tag')
+    if preferred_language and (tag_keys := statement_tag_keys.get(transaction.get('role'))):
+        action_tag = translation_for(tag_keys[0], preferred_language)
+        direction_tag = translation_for(tag_keys[1], preferred_language)
+    decimals = transaction.get('token_decimals')
+    amount = from_wei(decimals, transaction.get('token_value'))
+    token_symbol = transaction.get('token_symbol')
+    metadata_id = transaction.get('alt_metadata_id')
+    timestamp = timezone_handler.convert(transaction.get('timestamp'))
+    return f'{action_tag} {amount} {token_symbol} {direction_tag} {metadata_id} {timestamp}'
+
+
+def insert_statement_transaction(statement: list, transaction: dict, limit: int = statement_limit) -> list:
+    """This function inserts a transaction into a statement ordered from the latest transaction. A transaction already
+    in the statement is replaced, and the oldest transactions are dropped beyond the limit.
+    :param statement: A list of transaction objects.
+    :type statement: list
+    :param transaction: The transaction object to insert.
+    :type transaction: dict
+    :param limit: The maximum number of transactions kept in the statement.
+    :type limit: int
+    :return: The updated statement.
+    :rtype: list
+    """
+    tx_hash = transaction.get('tx_hash')
+    statement = [item for item in statement if item != transaction and not (tx_hash and item.get('tx_hash') == tx_hash)]
+    timestamp = transaction.get('timestamp') or 0
+    position = 0
+    while position < len(statement) and (statement[position].get('timestamp') or 0) >= timestamp:
+        position += 1
+    statement.insert(position, transaction)
+    return statement[:limit]
+
+
+def statement_pages_key(identifier: bytes) -> str:
+    return cache_data_key(identifier, UssdMetadataPointer.STATEMENT_PAGES)
+
+
+def render_statement_pages(statement: list, languages: list) -> dict:
+    """This function renders the lines of a statement ordered from the latest transaction in each language.
+    :param statement: A list of transaction objects ordered from the latest transaction.
+    :type statement: list
+    :param languages: The languages to render the statement in.
+    :type languages: list
+    :return: Statement lines by language.
+    :rtype: dict
+    """
+    timezone_handler = TimezoneHandler()
+    return {
+        language: [render_statement_transaction(transaction, timezone_handler, language) for transaction in statement]
+        for language in languages
+    }
+
+
+def cache_statement_transactions(identifier: bytes, transactions: list):
+    """This function inserts parsed transactions into an account's cached statement and updates the statement lines
+    rendered for each language already held, along with the transactions' languages. The statement and its lines are
+    written atomically, so that transactions cached concurrently are not lost.
+    :param identifier: Bytes representation of an account's blockchain address.
+    :type identifier: bytes
+    :param transactions: The parsed transaction objects to insert.
+    :type transactions: list
+    """
+    def update(cached: list) -> list:
+        statement, pages = cached
+        statement = statement or []
+        for transaction in transactions:
+            statement = insert_statement_transaction(statement, transaction)
+        languages = set(pages or {})
+        languages.update(transaction.get('preferred_language') for transaction in transactions
+                         if transaction.get('preferred_language'))
+        return [statement, render_statement_pages(statement, sorted(languages))]
+
+    update_cached_objects([cache_data_key(identifier, MetadataPointer.STATEMENT), statement_pages_key(identifier)], update)
+
+
+def query_statement(blockchain_address: str, limit: int = statement_limit):
     """This function queries cic-eth for a set of chronologically ordered number of transactions associated with
     an account.
     :param blockchain_address: Ethereum address associated with an account.
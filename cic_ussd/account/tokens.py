@@ -2,20 +2,26 @@
 import hashlib
 import json
 import logging
-import sys
-from subprocess import check_output
 from typing import Optional, Union
 
 # external imports
-from hexathon import unpad
-from chainlib.eth.address import to_checksum_address
 from cic_eth.api import Api
 from cic_types.condiments import MetadataPointer
 
 # local imports
-from cic_ussd.account.balance import get_cached_display_balance, get_balances
+from cic_ussd.account.balance import BalancesHandler, get_balances
 from cic_ussd.account.chain import Chain
-from cic_ussd.cache import cache_data, cache_data_key, get_cached_data
+from cic_ussd.account.sink_address import SinkAddressResolver
+from cic_ussd.cache import (cache_data,
+                            cache_data_key,
+                            cache_object,
+                            cache_pipeline,
+                            CachePipeline,
+                            get_cached_data,
+                            get_cached_object,
+                            get_many,
+                            get_many_objects)
+from cic_ussd.context import forget
 from cic_ussd.error import CachedDataNotFoundError, SeppukuError
 from cic_ussd.metadata.tokens import query_token_info, query_token_metadata
 from cic_ussd.processor.poller import wait_for_cache
@@ -60,11 +66,17 @@ def create_account_tokens_list(blockchain_address: str):
     token_list_entries = []
     if token_symbols_list:
         logg.debug(f'Token symbols: {token_symbols_list} for account: {blockchain_address}')
-        for token_symbol in token_symbols_list:
+        identifiers = [[bytes.fromhex(blockchain_address), token_symbol.encode('utf-8')]
+                       for token_symbol in token_symbols_list]
+        token_data_keys = [cache_data_key(token_symbol.encode('utf-8'), MetadataPointer.TOKEN_DATA)
+                           for token_symbol in token_symbols_list]
+        balances_keys = [cache_data_key(identifier, MetadataPointer.BALANCES) for identifier in identifiers]
+        cached_values = get_many_objects(token_data_keys + balances_keys)
+        cached_token_data = cached_values[:len(token_symbols_list)]
+        cached_balances = cached_values[len(token_symbols_list):]
+        for token_symbol, identifier, token_data, balances in zip(
+                token_symbols_list, identifiers, cached_token_data, cached_balances):
             logg.debug(f'Processing token data for: {token_symbol}')
-            key = cache_data_key(token_symbol.encode('utf-8'), MetadataPointer.TOKEN_DATA)
-            token_data = get_cached_data(key)
-            token_data = json.loads(token_data)
             logg.debug(f'Retrieved token data: {token_data} for: {token_symbol}')
             token_description = token_data.get('description')
             entry = {'description': token_description, 'symbol': token_symbol}
@@ -76,14 +88,15 @@ def create_account_tokens_list(blockchain_address: str):
             token_location = token_data.get('location')
             entry['location'] = token_location
             decimals = 6  # token_data.get('decimals')
-            identifier = [bytes.fromhex(blockchain_address), token_symbol.encode('utf-8')]
-            wait_for_cache(identifier, f'Cached available balance for token: {token_symbol}', MetadataPointer.BALANCES)
-            token_balance = get_cached_display_balance(decimals=decimals, identifier=identifier)
+            if not balances:
+                balances = json.loads(wait_for_cache(
+                    identifier, f'Cached available balance for token: {token_symbol}', MetadataPointer.BALANCES))
+            token_balance = BalancesHandler(balances=balances, decimals=decimals).display_balance()
             entry['balance'] = token_balance
             token_list_entries.append(entry)
     account_tokens_list = order_account_tokens_list(token_list_entries, bytes.fromhex(blockchain_address))
     key = cache_data_key(bytes.fromhex(blockchain_address), MetadataPointer.TOKEN_DATA_LIST)
-    cache_data(key, json.dumps(account_tokens_list))
+    cache_object(key, account_tokens_list)
 
 
 def get_active_token_symbol(blockchain_address: str):
@@ -112,8 +125,7 @@ def get_cached_token_data(blockchain_address: str, token_symbol: str):
     """
     key = cache_data_key(token_symbol.encode("utf-8"), MetadataPointer.TOKEN_DATA)
     logg.debug(f'Retrieving token data for: {token_symbol} at: {key}')
-    token_data = get_cached_data(key)
-    return json.loads(token_data)
+    return get_cached_object(key)
 
 
 def get_cached_default_token(chain_str: str) -> Optional[str]:
@@ -155,10 +167,7 @@ def get_cached_token_symbol_list(blockchain_address: str) -> Optional[list]:
     :rtype:
     """
     key = cache_data_key(identifier=bytes.fromhex(blockchain_address), salt=MetadataPointer.TOKEN_SYMBOLS_LIST)
-    token_symbols_list = get_cached_data(key)
-    if token_symbols_list:
-        return json.loads(token_symbols_list)
-    return token_symbols_list
+    return get_cached_object(key)
 
 
 def get_cached_token_data_list(blockchain_address: str) -> Optional[list]:
@@ -169,32 +178,34 @@ def get_cached_token_data_list(blockchain_address: str) -> Optional[list]:
     :rtype:
     """
     key = cache_data_key(bytes.fromhex(blockchain_address), MetadataPointer.TOKEN_DATA_LIST)
-    token_data_list = get_cached_data(key)
-    if token_data_list:
-        return json.loads(token_data_list)
-    return token_data_list
+    return get_cached_object(key)
 
 
-def handle_token_symbol_list(blockchain_address: str, token_symbol: str):
+def handle_token_symbol_list(blockchain_address: str, token_symbol: str, pipeline: Optional[CachePipeline] = None):
     """
     :param blockchain_address:
     :type blockchain_address:
     :param token_symbol:
     :type token_symbol:
+    :param pipeline: A cache pipeline to queue the write in, it is written immediately if absent.
+    :type pipeline: CachePipeline
     :return:
     :rtype:
     """
     token_symbol_list = get_cached_token_symbol_list(blockchain_address)
     if token_symbol_list:
-        if token_symbol not in token_symbol_list:
-            token_symbol_list.append(token_symbol)
+        if token_symbol in token_symbol_list:
+            return
+        token_symbol_list.append(token_symbol)
     else:
         token_symbol_list = [token_symbol]
 
     identifier = bytes.fromhex(blockchain_address)
     key = cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_SYMBOLS_LIST)
-    data = json.dumps(token_symbol_list)
-    cache_data(key, data)
+    if pipeline is None:
+        cache_object(key, token_symbol_list)
+    else:
+        pipeline.cache_object(key, token_symbol_list)
 
 
 def hashed_token_proof(token_proof: Union[dict, str]) -> str:
@@ -222,13 +233,11 @@ def order_account_tokens_list(account_tokens_list: list, identifier: bytes) -> l
     :rtype:
     """
     ordered_tokens_list = []
-    # get last sent token
-    key = cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_SENT)
-    last_sent_token_symbol = get_cached_data(key)
-
-    # get last received token
-    key = cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_RECEIVED)
-    last_received_token_symbol = get_cached_data(key)
+    # get last sent and last received tokens
+    last_sent_token_symbol, last_received_token_symbol = get_many([
+        cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_SENT),
+        cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_RECEIVED)
+    ])
 
     last_sent_token_data, remaining_accounts_token_list = remove_from_account_tokens_list(account_tokens_list,
                                                                                           last_sent_token_symbol)
@@ -273,14 +282,16 @@ def process_token_data(blockchain_address: str, token_address: str, token_symbol
     token_info = query_token_info(identifier=identifier)
 
     token_data = collate_token_metadata(token_info=token_info, token_metadata=token_metadata)
-    token_data_key = cache_data_key(identifier, MetadataPointer.TOKEN_DATA)
-    cache_data(token_data_key, json.dumps(token_data))
-    handle_token_symbol_list(blockchain_address=blockchain_address, token_symbol=token_symbol)
-
     logg.debug(f"Retrieving sink address for: {token_symbol}")
-    if sink_address := retrieve_sink_address(token_address=token_address):
-        sink_address_key = cache_data_key(identifier, UssdMetadataPointer.TOKEN_SINK_ADDRESS)
-        cache_data(sink_address_key, sink_address)
+    sink_address = retrieve_sink_address(token_address=token_address)
+
+    with cache_pipeline() as pipeline:
+        token_data_key = cache_data_key(identifier, MetadataPointer.TOKEN_DATA)
+        pipeline.cache_object(token_data_key, token_data)
+        handle_token_symbol_list(blockchain_address=blockchain_address, token_symbol=token_symbol, pipeline=pipeline)
+        if sink_address:
+            sink_address_key = cache_data_key(identifier, UssdMetadataPointer.TOKEN_SINK_ADDRESS)
+            pipeline.cache_data(sink_address_key, sink_address)
 
 
 def query_default_token(chain_str: str):
@@ -336,6 +347,7 @@ def set_active_token(blockchain_address: str, token_symbol: str):
     logg.info(f'Active token set to: {token_symbol}')
     key = cache_data_key(identifier=bytes.fromhex(blockchain_address), salt=MetadataPointer.TOKEN_ACTIVE)
     cache_data(key=key, data=token_symbol)
+    forget(get_active_token_symbol, blockchain_address)
 
 
 def lock_account_token(blockchain_address: str, village: str):
@@ -353,22 +365,23 @@ def lock_account_token(blockchain_address: str, village: str):
     cache_data(key=key, data=token_symbol)
 
 def retrieve_sink_address(token_address: str, fee_limit: str = "100000"):
-    chain_str = Chain.spec.__str__()
-    rpc_provider = Chain.rpc_provider
-    token_address = to_checksum_address(token_address)
-    sink_address = check_output([
-        f'{sys.exec_prefix}/bin/eth-encode', '--signature', 'sinkAddress', '-e', token_address, '-s', '-i', chain_str, '-p', rpc_provider, '--fee-limit', fee_limit, '-u'
-    ]).decode('utf-8').strip()
-    return unpad(sink_address)
+    """This function returns the sink address of a token.
+    :param token_address: The address of the token contract.
+    :type token_address: str
+    :param fee_limit: The maximum gas the call to the token contract may use.
+    :type fee_limit: str
+    :return: The token's sink address.
+    :rtype: str
+    """
+    return SinkAddressResolver.resolve(token_address=token_address, fee_limit=int(fee_limit))
 
 
 def get_sink_address_balances(chain_str: str, queue: str, token_symbol_list: list):
     logg.debug(f"Retrieving sink address balances for all tokens: {token_symbol_list}")
-    for token_symbol in token_symbol_list:
-        cached_sink_address_key = cache_data_key(identifier=token_symbol.encode("utf-8"), salt=UssdMetadataPointer.TOKEN_SINK_ADDRESS)
-        sink_address = None
-        if cached_sink_address_key:
-            sink_address = get_cached_data(key=cached_sink_address_key)
+    sink_addresses = get_many([
+        cache_data_key(identifier=token_symbol.encode("utf-8"), salt=UssdMetadataPointer.TOKEN_SINK_ADDRESS)
+        for token_symbol in token_symbol_list])
+    for token_symbol, sink_address in zip(token_symbol_list, sink_addresses):
         if sink_address:
             logg.debug(f"Retrieving sink address: {sink_address} balance for token: {token_symbol}")
             get_balances(sink_address, chain_str, token_symbol, True, callback_param=f'{sink_address},{token_symbol}', callback_queue=queue)
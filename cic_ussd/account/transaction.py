@@ -2,7 +2,7 @@
 import logging
 import uuid
 from math import trunc
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # external import
 from cic_eth.api import Api
@@ -108,6 +108,7 @@ def transaction_actors(transaction: dict) -> Tuple[Dict, Dict]:
     source_token_value = transaction.get('source_token_value') or transaction.get('from_value')
     source_token_decimals = transaction.get('source_token_decimals')
     timestamp = transaction.get("timestamp")
+    tx_hash = transaction.get('hash') or transaction.get('tx_hash')
 
     recipient_transaction_data = {
         "token_symbol": destination_token_symbol,
@@ -115,7 +116,8 @@ def transaction_actors(transaction: dict) -> Tuple[Dict, Dict]:
         "token_decimals": destination_token_decimals,
         "blockchain_address": recipient_blockchain_address,
         "role": "recipient",
-        "timestamp": timestamp
+        "timestamp": timestamp,
+        "tx_hash": tx_hash
     }
     sender_transaction_data = {
         "blockchain_address": sender_blockchain_address,
@@ -123,7 +125,8 @@ def transaction_actors(transaction: dict) -> Tuple[Dict, Dict]:
         "token_value": source_token_value,
         "token_decimals": source_token_decimals,
         "role": "sender",
-        "timestamp": timestamp
+        "timestamp": timestamp,
+        "tx_hash": tx_hash
     }
     return recipient_transaction_data, sender_transaction_data
 
@@ -142,6 +145,21 @@ def validate_transaction_account(blockchain_address: str, role: str, session: Se
     """
     session = SessionBase.bind_session(session)
     account = session.query(Account).filter_by(blockchain_address=blockchain_address).first()
+    check_transaction_account(account, blockchain_address, role)
+    SessionBase.release_session(session)
+    return account
+
+
+def check_transaction_account(account: Optional[Account], blockchain_address: str, role: str):
+    """This function raises if a transaction's recipient has no account in the ussd system and warns if its sender has
+    none.
+    :param account: The account the blockchain address resolved to, None if it resolved to none.
+    :type account: Account
+    :param blockchain_address: The blockchain address specified in a parsed transaction object.
+    :type blockchain_address: str
+    :param role: The account's role in the transaction.
+    :type role: str
+    """
     if not account:
         if role == 'recipient':
             raise UnknownUssdRecipient(
@@ -150,8 +168,27 @@ def validate_transaction_account(blockchain_address: str, role: str, session: Se
         if role == 'sender':
             logg.warning(f'Tx from sender: {blockchain_address} has no matching account in system.')
 
+
+def resolve_transaction_accounts(address_pairs: List[Tuple[str, str]],
+                                 session: Session) -> List[Tuple[Optional[Account], Optional[Account]]]:
+    """This function resolves the accounts of the parties to several transactions in a single query.
+    :param address_pairs: The blockchain addresses of each transaction's subject account and its counterparty.
+    :type address_pairs: list
+    :param session: Database session object.
+    :type session: Session
+    :return: The subject and counterparty accounts in the order of the pairs, with None for addresses without an account.
+    :rtype: list
+    """
+    blockchain_addresses = {blockchain_address for address_pair in address_pairs for blockchain_address in address_pair
+                            if blockchain_address}
+    if not blockchain_addresses:
+        return [(None, None) for _ in address_pairs]
+    session = SessionBase.bind_session(session)
+    accounts = session.query(Account).filter(Account.blockchain_address.in_(blockchain_addresses)).all()
     SessionBase.release_session(session)
-    return account
+    accounts = {account.blockchain_address: account for account in accounts}
+    return [(accounts.get(blockchain_address), accounts.get(alt_blockchain_address))
+            for blockchain_address, alt_blockchain_address in address_pairs]
 
 
 class OutgoingTransaction:
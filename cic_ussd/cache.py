@@ -1,13 +1,21 @@
 # standard imports
 import hashlib
 import logging
-from typing import Union
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple, Union
 
 # external imports
 from cic_types.condiments import MetadataPointer
 from redis import Redis
+from redis.exceptions import WatchError
 
 # local imports
+from cic_ussd.codec import binary_client, Codec
+from cic_ussd.context import current_context
+from cic_ussd.error import InitializationError
 
 logg = logging.getLogger(__file__)
 
@@ -16,19 +24,462 @@ class Cache:
     store: Redis = None
 
 
-def cache_data(key: str, data: [bytes, float, int, str]):
+class CacheKey(str):
+    """This class describes a cache key that carries the name of the namespace it belongs to, so that the namespace's
+    retention policy is applied wherever the key is written or read.
     """
-    :param key:
-    :type key:
-    :param data:
-    :type data:
-    :return:
-    :rtype:
+    namespace: Optional[str]
+
+    def __new__(cls, key: str, namespace: Optional[str] = None):
+        cache_key = super().__new__(cls, key)
+        cache_key.namespace = namespace
+        return cache_key
+
+
+class CachePolicy:
+    """This class describes how long the data in each cache namespace is retained. A namespace is named after the
+    lowercased name of the salt its keys are built with. Data in a namespace without a ttl persists, data in a sliding
+    namespace has its ttl renewed whenever it is read.
+    :cvar namespaces: Names of the namespaces a retention policy can be configured for.
+    :type namespaces: tuple
+    :cvar sliding: Names of the namespaces whose ttl is renewed on read.
+    :type sliding: set
+    :cvar ttls: Ttls in seconds by namespace.
+    :type ttls: dict
+    """
+    namespaces = (
+        'account_creation',
+        'account_village',
+        'balance_spendable',
+        'balances',
+        'balances_adjusted',
+        'custom',
+        'locked_account_token',
+        'person',
+        'phone',
+        'preferences',
+        'statement',
+        'statement_pages',
+        'token_active',
+        'token_data',
+        'token_data_list',
+        'token_default',
+        'token_last_received',
+        'token_last_sent',
+        'token_meta_symbol',
+        'token_proof_symbol',
+        'token_sink_address',
+        'token_symbols_list'
+    )
+    sliding: set = set()
+    ttls: dict = {}
+
+    @staticmethod
+    def namespace(salt) -> Optional[str]:
+        """This function returns the name of the namespace of keys built with a salt.
+        :param salt: The salt keys are built with.
+        :type salt: MetadataPointer | UssdMetadataPointer
+        :return: The name of the namespace, None for keys built without a salt.
+        :rtype: str
+        """
+        if salt is None or salt == MetadataPointer.NONE:
+            return None
+        return salt.name.lower()
+
+    @classmethod
+    def ttl(cls, key: str) -> Optional[int]:
+        """This function returns the ttl data cached at a key is retained for.
+        :param key: The cache key.
+        :type key: str
+        :return: The ttl in seconds, None if the data persists.
+        :rtype: int
+        """
+        return cls.ttls.get(getattr(key, 'namespace', None)) or None
+
+    @classmethod
+    def sliding_ttl(cls, key: str) -> Optional[int]:
+        """This function returns the ttl that reading a key renews.
+        :param key: The cache key.
+        :type key: str
+        :return: The ttl in seconds, None if reading the key does not renew its ttl.
+        :rtype: int
+        """
+        if getattr(key, 'namespace', None) not in cls.sliding:
+            return None
+        return cls.ttl(key)
+
+
+class L1Cache:
+    """This class describes a bounded in-process cache in front of redis for data that hardly ever changes. Only keys
+    built from an eligible salt or identifier namespace are held, each for the ttl of its policy. Writes to an eligible
+    key are published so that every process drops its copy.
+    :cvar identifiers: Leading identifiers of keys built without a salt a policy can be configured for.
+    :type identifiers: tuple
+    :cvar maxsize: The maximum number of keys held, the least recently used key is evicted beyond it.
+    :type maxsize: int
+    :cvar namespaces: Ttls in seconds by the leading identifier of keys built without a salt.
+    :type namespaces: dict
+    :cvar policies: Ttls in seconds by the namespace of eligible keys.
+    :type policies: dict
+    """
+    channel = 'cache:l1:invalidate'
+    entries: OrderedDict = OrderedDict()
+    evictions: int = 0
+    hits: int = 0
+    identifiers = ('system:languages',)
+    key_ttls: dict = {}
+    maxsize: int = 1024
+    misses: int = 0
+    namespaces: dict = {}
+    policies: dict = {}
+    _listener: threading.Thread = None
+    _listener_pid: int = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def register(cls, key: str, identifier: Union[list, bytes], salt):
+        """This function marks a key as eligible if its salt or identifier namespace has a policy.
+        :param key: The cache key.
+        :type key: str
+        :param identifier: The identifier the key was built from.
+        :type identifier: bytes | list
+        :param salt: The salt the key was built with.
+        :type salt: MetadataPointer
+        """
+        ttl = cls.policies.get(CachePolicy.namespace(salt))
+        if ttl is None and salt == MetadataPointer.NONE and isinstance(identifier, list) and identifier:
+            ttl = cls.namespaces.get(identifier[0])
+        if ttl is None:
+            return
+        if len(cls.key_ttls) >= cls.maxsize * 8 and key not in cls.key_ttls:
+            cls.key_ttls.clear()
+        cls.key_ttls[key] = ttl
+
+    @classmethod
+    def get(cls, key: str) -> Tuple[bool, Optional[str]]:
+        """This function looks a key up in the in-process cache.
+        :param key: The cache key.
+        :type key: str
+        :return: Whether the key is held and its value.
+        :rtype: tuple
+        """
+        cls.listen()
+        with cls._lock:
+            entry = cls.entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                cls.entries.move_to_end(key)
+                cls.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del cls.entries[key]
+                cls.evictions += 1
+            cls.misses += 1
+            return False, None
+
+    @classmethod
+    def put(cls, key: str, value: str):
+        """This function holds a value read from redis for the ttl of the key's policy.
+        :param key: The cache key.
+        :type key: str
+        :param value: The cached value.
+        :type value: str
+        """
+        if value is None or (ttl := cls.key_ttls.get(key)) is None:
+            return
+        with cls._lock:
+            cls.entries[key] = (value, time.monotonic() + ttl)
+            cls.entries.move_to_end(key)
+            while len(cls.entries) > cls.maxsize:
+                cls.entries.popitem(last=False)
+                cls.evictions += 1
+
+    @classmethod
+    def invalidate(cls, key: str):
+        with cls._lock:
+            cls.entries.pop(key, None)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls.entries.clear()
+
+    @classmethod
+    def listen(cls):
+        """This function starts the thread that drops keys written by any process, once per process."""
+        if cls._listener_pid == os.getpid() and cls._listener is not None and cls._listener.is_alive():
+            return
+        with cls._lock:
+            if cls._listener_pid == os.getpid() and cls._listener is not None and cls._listener.is_alive():
+                return
+            # values held before the listener was running may have missed invalidations.
+            cls.entries.clear()
+            pubsub = Cache.store.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(cls.channel)
+            cls._listener = threading.Thread(target=cls._listen, args=(pubsub,), name='l1-cache', daemon=True)
+            cls._listener_pid = os.getpid()
+            cls._listener.start()
+
+    @classmethod
+    def _listen(cls, pubsub):
+        try:
+            for message in pubsub.listen():
+                if message.get('type') == 'message':
+                    cls.invalidate(message.get('data'))
+        except Exception as error:
+            logg.warning(f'L1 cache invalidation listener stopped: {error}')
+        finally:
+            cls.clear()
+
+    @classmethod
+    def stats(cls) -> dict:
+        """This function returns the in-process cache's hit, miss and eviction counts.
+        :return: A dict of counts.
+        :rtype: dict
+        """
+        return {'entries': len(cls.entries), 'evictions': cls.evictions, 'hits': cls.hits, 'misses': cls.misses}
+
+
+def configure_cache(config):
+    """This function defines the retention policies, payload format and in-process caching of cached data from the
+    redis config.
+    :param config: A config object.
+    :type config: confini.Config
+    """
+    CachePolicy.ttls = {
+        namespace: int(config.get(f'REDIS_TTL_{namespace.upper()}') or 0) for namespace in CachePolicy.namespaces}
+    CachePolicy.sliding = {namespace.strip() for namespace in (config.get('REDIS_SLIDING_TTL') or '').split(',')
+                           if namespace.strip()}
+
+    Codec.format = config.get('REDIS_CODEC') or 'json'
+    Codec.compression_threshold = int(config.get('REDIS_COMPRESSION_THRESHOLD') or 0)
+    if Codec.format not in Codec.formats:
+        raise InitializationError(f'Unknown codec format: {Codec.format}, expected one of: {Codec.formats}.')
+
+    L1Cache.maxsize = int(config.get('REDIS_L1_MAXSIZE') or L1Cache.maxsize)
+    L1Cache.policies = {}
+    for namespace in CachePolicy.namespaces:
+        ttl = int(config.get(f'REDIS_L1_TTL_{namespace.upper()}') or 0)
+        if ttl:
+            L1Cache.policies[namespace] = ttl
+    L1Cache.namespaces = {}
+    for identifier in L1Cache.identifiers:
+        ttl = int(config.get(f'REDIS_L1_TTL_{identifier.replace(":", "_").upper()}') or 0)
+        if ttl:
+            L1Cache.namespaces[identifier.encode('utf-8')] = ttl
+
+
+def cache_data(key: str, data: [bytes, float, int, str], ttl: Optional[int] = None):
+    """This function caches data at a key in a single round trip. Unless a ttl is given, the data is retained for the ttl
+    of the key's namespace and persists if the namespace has none.
+    :param key: The key to cache the data at.
+    :type key: str
+    :param data: The data to cache.
+    :type data: bytes | float | int | str
+    :param ttl: The number of seconds after which the cached data expires.
+    :type ttl: int
+    """
+    with cache_pipeline() as pipeline:
+        pipeline.cache_data(key, data, ttl)
+
+
+def cache_object(key: str, data: Any, ttl: Optional[int] = None):
+    """This function serializes data in the configured codec format and caches it at a key in a single round trip.
+    :param key: The key to cache the data at.
+    :type key: str
+    :param data: The data to serialize and cache.
+    :type data: Any
+    :param ttl: The number of seconds after which the cached data expires.
+    :type ttl: int
+    """
+    with cache_pipeline() as pipeline:
+        pipeline.cache_object(key, data, ttl)
+
+
+class CachePipeline:
+    """This class batches cache writes so that they are sent to the cache in a single round trip when the pipeline is
+    executed. Notifications for the written keys are published in the same round trip.
+    """
+
+    def __init__(self, pipeline=None):
+        self.keys = []
+        self.pipeline = pipeline if pipeline is not None else Cache.store.pipeline(transaction=False)
+
+    def cache_data(self, key: str, data: [bytes, float, int, str], ttl: Optional[int] = None):
+        """This function queues caching data at a key.
+        :param key: The key to cache the data at.
+        :type key: str
+        :param data: The data to cache.
+        :type data: bytes | float | int | str
+        :param ttl: The number of seconds after which the cached data expires, defaults to the ttl of the key's namespace.
+        :type ttl: int
+        """
+        if ttl is None:
+            ttl = CachePolicy.ttl(key)
+        self.pipeline.set(name=key, value=data, ex=ttl)
+        self.pipeline.publish(cache_notification_channel(key), 1)
+        if key in L1Cache.key_ttls:
+            self.pipeline.publish(L1Cache.channel, key)
+        self.keys.append(key)
+        logg.debug(f'caching: {data} with key: {key}.')
+
+    def cache_object(self, key: str, data: Any, ttl: Optional[int] = None):
+        """This function queues caching data serialized in the configured codec format at a key.
+        :param key: The key to cache the data at.
+        :type key: str
+        :param data: The data to serialize and cache.
+        :type data: Any
+        :param ttl: The number of seconds after which the cached data expires.
+        :type ttl: int
+        """
+        self.cache_data(key, Codec.encode(data), ttl)
+
+    def execute(self):
+        """This function sends the queued writes to the cache."""
+        if not self.keys:
+            return
+        self.pipeline.execute()
+        for key in self.keys:
+            L1Cache.invalidate(key)
+        if (context := current_context()) is not None:
+            for key in self.keys:
+                context.cached_data.pop(key, None)
+        self.keys = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+        else:
+            self.pipeline.reset()
+
+
+def cache_pipeline() -> CachePipeline:
+    """This function returns a pipeline that sends the writes queued in it to the cache in one round trip on exit.
+    :return: A cache pipeline.
+    :rtype: CachePipeline
+    """
+    return CachePipeline()
+
+
+def update_cached_objects(keys: list, update: Callable[[list], list]) -> list:
+    """This function replaces the data cached at several keys with data derived from it, atomically. The keys are
+    watched while the data is read and updated, and the update is retried if any of them is written meanwhile.
+    :param keys: The keys to update.
+    :type keys: list
+    :param update: A function returning the new data in the order of the keys given the cached data, with None for keys
+    that are not cached. Keys it returns None for are left as they are.
+    :type update: Callable
+    :return: The new data.
+    :rtype: list
+    """
+    store = binary_client(Cache.store)
+    while True:
+        with store.pipeline() as watched:
+            try:
+                watched.watch(*keys)
+                updated = update([Codec.decode(value) for value in watched.mget(keys)])
+                watched.multi()
+                pipeline = CachePipeline(watched)
+                for key, data in zip(keys, updated):
+                    if data is not None:
+                        pipeline.cache_object(key, data)
+                pipeline.execute()
+                return updated
+            except WatchError:
+                logg.debug(f'Retrying update of keys: {keys} written concurrently.')
+
+
+def set_many(mapping: dict, ttl: Optional[int] = None):
+    """This function caches data at several keys in a single round trip.
+    :param mapping: The data to cache by key.
+    :type mapping: dict
+    :param ttl: The number of seconds after which the cached data expires.
+    :type ttl: int
+    """
+    with cache_pipeline() as pipeline:
+        for key, data in mapping.items():
+            pipeline.cache_data(key, data, ttl)
+
+
+def get_many(keys: list) -> list:
+    """This function reads several keys in a single round trip, keys held in the active request context are served
+    from memory.
+    :param keys: The keys to read.
+    :type keys: list
+    :return: The cached values as text in the order of the keys, with None for keys that are not cached.
+    :rtype: list
+    """
+    return [Codec.text(value) for value in read_many(keys)]
+
+
+def get_many_objects(keys: list) -> list:
+    """This function reads and deserializes several keys in a single round trip, keys held in the active request
+    context are served from memory.
+    :param keys: The keys to read.
+    :type keys: list
+    :return: The cached data in the order of the keys, with None for keys that are not cached.
+    :rtype: list
     """
-    cache = Cache.store
-    cache.set(name=key, value=data)
-    cache.persist(name=key)
-    logg.debug(f'caching: {data} with key: {key}.')
+    return [Codec.decode(value) for value in read_many(keys)]
+
+
+def read_many(keys: list) -> list:
+    """This function reads the serialized values of several keys from the active request context, the in-process cache
+    and the cache in that order, the keys left are read in a single round trip.
+    :param keys: The keys to read.
+    :type keys: list
+    :return: The serialized values in the order of the keys, with None for keys that are not cached.
+    :rtype: list
+    """
+    context = current_context()
+    cached_data = context.cached_data if context is not None else {}
+    values = {key: cached_data[key] for key in keys if key in cached_data}
+    missing = [key for key in dict.fromkeys(keys) if key not in values]
+    if context is not None:
+        context.avoided_reads += len(values)
+    for key in [key for key in missing if key in L1Cache.key_ttls]:
+        found, value = L1Cache.get(key)
+        if found:
+            values[key] = value
+            missing.remove(key)
+    if missing:
+        cached_values = read_cached_data(missing)
+        for key, value in zip(missing, cached_values):
+            L1Cache.put(key, value)
+        values.update(zip(missing, cached_values))
+        if context is not None:
+            context.reads += 1
+    return [values.get(key) for key in keys]
+
+
+def read_cached_data(keys: list) -> list:
+    """This function reads keys from the cache in a single round trip, renewing the ttl of keys in sliding namespaces.
+    :param keys: The keys to read.
+    :type keys: list
+    :return: The serialized values in the order of the keys.
+    :rtype: list
+    """
+    store = binary_client(Cache.store)
+    sliding = [(key, ttl) for key in keys if (ttl := CachePolicy.sliding_ttl(key))]
+    if not sliding:
+        return store.mget(keys)
+    pipeline = store.pipeline(transaction=False)
+    pipeline.mget(keys)
+    for key, ttl in sliding:
+        pipeline.expire(key, ttl)
+    return pipeline.execute()[0]
+
+
+def cache_notification_channel(key: str) -> str:
+    """This function returns the channel a notification is published to whenever data is cached at a key.
+    :param key: The key data is cached at.
+    :type key: str
+    :return: The name of the notification channel.
+    :rtype: str
+    """
+    return f'cached:{key}'
 
 
 def get_cached_data(key: str):
@@ -38,8 +489,52 @@ def get_cached_data(key: str):
     :return:
     :rtype:
     """
-    cache = Cache.store
-    return cache.get(name=key)
+    return Codec.text(read_one(key))
+
+
+def get_cached_object(key: str) -> Any:
+    """This function reads and deserializes the data cached at a key.
+    :param key: The key the data is cached at.
+    :type key: str
+    :return: The cached data, None if no data is cached at the key.
+    :rtype: Any
+    """
+    return Codec.decode(read_one(key))
+
+
+def read_one(key: str) -> Optional[Union[bytes, str]]:
+    """This function reads the serialized value of a key from the active request context, the in-process cache or the
+    cache in that order.
+    :param key: The key to read.
+    :type key: str
+    :return: The serialized value, None if no data is cached at the key.
+    :rtype: bytes | str
+    """
+    if (context := current_context()) is not None and key in context.cached_data:
+        context.avoided_reads += 1
+        return context.cached_data[key]
+    if key in L1Cache.key_ttls:
+        found, value = L1Cache.get(key)
+        if found:
+            return value
+        value = read_cached_data([key])[0]
+        L1Cache.put(key, value)
+        return value
+    return read_cached_data([key])[0]
+
+
+def prefetch_cached_data(keys: list):
+    """This function reads a set of keys in a single round trip and holds their values in the active request context, so
+    that subsequent reads of those keys in the request are served from memory.
+    :param keys: The keys to prefetch.
+    :type keys: list
+    """
+    context = current_context()
+    if context is None:
+        return
+    keys = [key for key in dict.fromkeys(keys) if key not in context.cached_data]
+    if keys:
+        context.cached_data.update(zip(keys, read_many(keys)))
 
 
 def cache_data_key(identifier: Union[list, bytes], salt):
@@ -59,4 +554,7 @@ def cache_data_key(identifier: Union[list, bytes], salt):
         hash_object.update(identifier)
     if salt != MetadataPointer.NONE:
         hash_object.update(salt.value.encode(encoding="utf-8"))
-    return hash_object.digest().hex()
+    key = CacheKey(hash_object.digest().hex(), CachePolicy.namespace(salt))
+    if L1Cache.policies or L1Cache.namespaces:
+        L1Cache.register(key, identifier, salt)
+    return key
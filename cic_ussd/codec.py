@@ -0,0 +1,103 @@
+"""
+This module is responsible for serializing the payloads held in the cache. Payloads are written as JSON text or as a
+msgpack payload prefixed with a single tag byte that names its format, large msgpack payloads are compressed with zlib.
+Since JSON text never starts with a tag byte both formats can be read side by side while writers are switched over.
+"""
+# standard imports
+import json
+import zlib
+from typing import Any, Optional, Union
+
+# external imports
+import msgpack
+from redis import ConnectionPool, Redis
+
+# local imports
+
+MSGPACK_TAG = 0x01
+MSGPACK_ZLIB_TAG = 0x02
+
+
+class Codec:
+    """This class describes the format cached payloads are written in.
+    :cvar compression_threshold: The size in bytes beyond which msgpack payloads are compressed, 0 to never compress.
+    :type compression_threshold: int
+    :cvar format: The name of the format payloads are written in.
+    :type format: str
+    """
+    compression_threshold: int = 0
+    format: str = 'json'
+    formats = ('json', 'msgpack')
+
+    @classmethod
+    def encode(cls, data: Any, compress: bool = True) -> Union[bytes, str]:
+        """This function serializes a payload in the configured format.
+        :param data: The payload to serialize.
+        :type data: Any
+        :param compress: Whether the payload may be compressed, payloads inspected by lua scripts must not be.
+        :type compress: bool
+        :return: The serialized payload.
+        :rtype: bytes | str
+        """
+        if cls.format == 'json':
+            return json.dumps(data)
+        if cls.format != 'msgpack':
+            raise ValueError(f'Unknown codec format: {cls.format}.')
+        packed = msgpack.packb(data, use_bin_type=True)
+        if compress and 0 < cls.compression_threshold < len(packed):
+            return bytes([MSGPACK_ZLIB_TAG]) + zlib.compress(packed)
+        return bytes([MSGPACK_TAG]) + packed
+
+    @staticmethod
+    def decode(value: Optional[Union[bytes, str]]) -> Any:
+        """This function deserializes a payload written in any format.
+        :param value: The serialized payload.
+        :type value: bytes | str
+        :return: The payload, None if there is none.
+        :rtype: Any
+        """
+        if not value:
+            return None
+        if isinstance(value, bytes) and value[0] == MSGPACK_TAG:
+            return msgpack.unpackb(value[1:], raw=False)
+        if isinstance(value, bytes) and value[0] == MSGPACK_ZLIB_TAG:
+            return msgpack.unpackb(zlib.decompress(value[1:]), raw=False)
+        return json.loads(value)
+
+    @classmethod
+    def text(cls, value: Optional[Union[bytes, str]]) -> Optional[str]:
+        """This function returns a cached value as text, payloads in a binary format are converted to JSON text.
+        :param value: The cached value.
+        :type value: bytes | str
+        :return: The cached value as text.
+        :rtype: str
+        """
+        if not isinstance(value, bytes):
+            return value
+        if value and value[0] in (MSGPACK_TAG, MSGPACK_ZLIB_TAG):
+            return json.dumps(cls.decode(value))
+        return value.decode('utf-8')
+
+
+_binary_clients = {}
+
+
+def binary_client(store: Redis) -> Redis:
+    """This function returns a client of the same redis database as a store that returns values as bytes, so that binary
+    payloads can be read from stores that decode responses.
+    :param store: A redis client.
+    :type store: Redis
+    :return: A redis client that does not decode responses.
+    :rtype: Redis
+    """
+    connection_pool = store.connection_pool
+    if not connection_pool.connection_kwargs.get('decode_responses'):
+        return store
+    source, client = _binary_clients.get(id(store), (None, None))
+    if source is not store:
+        connection_kwargs = {**connection_pool.connection_kwargs, 'decode_responses': False}
+        client = Redis(connection_pool=ConnectionPool(connection_class=connection_pool.connection_class,
+                                                      max_connections=connection_pool.max_connections,
+                                                      **connection_kwargs))
+        _binary_clients[id(store)] = (store, client)
+    return client
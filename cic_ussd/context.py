@@ -0,0 +1,106 @@
+# standard imports
+import logging
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+# external imports
+
+# local imports
+
+logg = logging.getLogger(__name__)
+
+_request_context: ContextVar = ContextVar('request_context', default=None)
+
+
+def _memo_key(loader: Callable, args: tuple) -> tuple:
+    return (loader, *(tuple(arg) if isinstance(arg, list) else arg for arg in args))
+
+
+class RequestContext:
+    """This class describes the context of a single ussd request. It memoizes the account values that are read from
+    the redis cache repeatedly while a request is processed, such as the preferred language and the active token symbol,
+    and holds raw cache values prefetched for the menu being rendered.
+    :cvar total_avoided_reads: The number of cache reads avoided across all requests handled by this process.
+    :type total_avoided_reads: int
+    :cvar total_flushes: The number of database writes flushed across all requests handled by this process.
+    :type total_flushes: int
+    """
+    total_avoided_reads: int = 0
+    total_flushes: int = 0
+
+    def __init__(self):
+        self.avoided_reads = 0
+        self.cached_data = {}
+        self.flushes = 0
+        self.memo = {}
+        self.reads = 0
+        self._token = None
+
+    def __enter__(self):
+        self._token = _request_context.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _request_context.reset(self._token)
+        RequestContext.total_avoided_reads += self.avoided_reads
+        RequestContext.total_flushes += self.flushes
+        logg.debug(f'Request context read cache: {self.reads} times, avoided reads: {self.avoided_reads}, '
+                   f'flushed: {self.flushes} times.')
+
+    def memoize(self, loader: Callable, *args):
+        """This function returns the value a loader produces for the arguments, calling the loader only the first time
+        the value is requested in this context.
+        :param loader: A function that reads a value from the cache.
+        :type loader: Callable
+        :return: The loaded value.
+        """
+        key = _memo_key(loader, args)
+        if key in self.memo:
+            self.avoided_reads += 1
+            return self.memo[key]
+        value = loader(*args)
+        self.reads += 1
+        self.memo[key] = value
+        return value
+
+    def forget(self, loader: Callable, *args):
+        """This function drops a memoized value so that the next read goes to the cache.
+        :param loader: The function whose memoized value should be dropped.
+        :type loader: Callable
+        """
+        self.memo.pop(_memo_key(loader, args), None)
+
+
+def current_context() -> Optional[RequestContext]:
+    """This function returns the request context of the request being processed, if any.
+    :return: The active request context.
+    :rtype: RequestContext
+    """
+    return _request_context.get()
+
+
+def memoized(loader: Callable, *args):
+    """This function reads a value through the active request context, it calls the loader directly when no request is
+    being processed e.g. in celery tasks.
+    :param loader: A function that reads a value from the cache.
+    :type loader: Callable
+    :return: The loaded value.
+    """
+    if (context := current_context()) is None:
+        return loader(*args)
+    return context.memoize(loader, *args)
+
+
+def forget(loader: Callable, *args):
+    """This function drops a value memoized in the active request context after it has been changed.
+    :param loader: The function whose memoized value should be dropped.
+    :type loader: Callable
+    """
+    if (context := current_context()) is not None:
+        context.forget(loader, *args)
+
+
+def record_flush():
+    """This function counts a write flushed to the database while the active request is processed."""
+    if (context := current_context()) is not None:
+        context.flushes += 1
@@ -0,0 +1,49 @@
+"""Adds normalized phone number column
+
+Revision ID: 9d4c6a1e2b7f
+Revises: 68aed55dbe88
+Create Date: 2022-09-05 10:12:44.801136
+
+"""
+import os
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from cic_ussd.phone_number import normalize_phone_number
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4c6a1e2b7f'
+down_revision = '68aed55dbe88'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('account', sa.Column('normalized_phone_number', sa.String(), nullable=True))
+
+    # the region national format numbers are parsed with: alembic -x region=KE upgrade head
+    region = context.get_x_argument(as_dictionary=True).get('region', os.environ.get('E164_REGION'))
+    account = sa.table('account',
+                       sa.column('id', sa.Integer),
+                       sa.column('phone_number', sa.String),
+                       sa.column('normalized_phone_number', sa.String))
+    connection = op.get_bind()
+    normalized_phone_numbers = {}
+    for account_id, phone_number in connection.execute(sa.select([account.c.id, account.c.phone_number])):
+        normalized_phone_number = normalize_phone_number(phone_number, region)
+        if normalized_phone_number in normalized_phone_numbers:
+            raise ValueError(f'Accounts: {normalized_phone_numbers[normalized_phone_number]} and {account_id} share '
+                             f'phone number: {normalized_phone_number}.')
+        normalized_phone_numbers[normalized_phone_number] = account_id
+        connection.execute(account.update()
+                           .where(account.c.id == account_id)
+                           .values(normalized_phone_number=normalized_phone_number))
+
+    op.create_index(op.f('ix_account_normalized_phone_number'), 'account', ['normalized_phone_number'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_account_normalized_phone_number'), table_name='account')
+    op.drop_column('account', 'normalized_phone_number')
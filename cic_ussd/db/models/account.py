@@ -9,13 +9,13 @@ from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm.session import Session
 
 # local imports
-from cic_ussd.account.metadata import get_cached_preferred_language, parse_account_metadata
-from cic_ussd.cache import Cache, cache_data_key, get_cached_data
+from cic_ussd.account.metadata import DisplayNames, get_cached_preferred_language
+from cic_ussd.cache import cache_data, cache_data_key, CacheKey, get_cached_data
 from cic_ussd.db.enum import AccountStatus
 from cic_ussd.db.models.base import SessionBase
 from cic_ussd.db.models.task_tracker import TaskTracker
-from cic_ussd.encoder import check_password_hash, create_password_hash
-from cic_ussd.phone_number import E164Format, process_phone_number, Support
+from cic_ussd.encoder import check_password_hash, create_password_hash, needs_rehash
+from cic_ussd.phone_number import E164Format, normalize_phone_number, Support
 from cic_ussd.worker import Worker
 
 logg = logging.getLogger(__file__)
@@ -31,6 +31,7 @@ class Account(SessionBase):
 
     blockchain_address = Column(String)
     phone_number = Column(String)
+    normalized_phone_number = Column(String, unique=True, index=True)
     password_hash = Column(String)
     failed_pin_attempts = Column(Integer)
     status = Column(Integer)
@@ -42,6 +43,7 @@ class Account(SessionBase):
     def __init__(self, blockchain_address, phone_number):
         self.blockchain_address = blockchain_address
         self.phone_number = phone_number
+        self.normalized_phone_number = normalize_phone_number(phone_number, E164Format.region)
         self.password_hash = None
         self.failed_pin_attempts = 0
         # self.guardians = f'{support_phone}' if support_phone else None
@@ -86,7 +88,7 @@ class Account(SessionBase):
     @staticmethod
     def get_by_phone_number(phone_number: str, session: Session):
         """Retrieves an account from a phone number.
-        :param phone_number: The E164 format of a phone number.
+        :param phone_number: A phone number in any format the region's numbers can be parsed from.
         :type phone_number:str
         :param session:
         :type session:
@@ -94,19 +96,33 @@ class Account(SessionBase):
         :rtype: Account
         """
         session = SessionBase.bind_session(session=session)
-        logg.debug(f"Initial query for account with phone number: {phone_number}")
-        account = session.query(Account).filter_by(phone_number=phone_number).first()
-        e164_phone_number = process_phone_number(phone_number=phone_number, region=E164Format.region)
-        e164_phone_number_no_plus = e164_phone_number.strip("+")
-        if not account:
-            logg.debug(f"Attempting query with e164 format without +: {e164_phone_number_no_plus}")
-            account = session.query(Account).filter_by(phone_number=e164_phone_number_no_plus).first()
-        if not account:
-            logg.debug(f"Attempting query with e164 format: {e164_phone_number_no_plus}")
-            account = session.query(Account).filter_by(phone_number=e164_phone_number).first()
+        normalized_phone_number = normalize_phone_number(phone_number, E164Format.region)
+        logg.debug(f"Querying for account with phone number: {normalized_phone_number}")
+        account = session.query(Account).filter_by(normalized_phone_number=normalized_phone_number).first()
         SessionBase.release_session(session=session)
         return account
 
+    @staticmethod
+    def get_by_phone_numbers(phone_numbers: list, session: Session) -> list:
+        """Retrieves the accounts for a list of phone numbers in a single query.
+        :param phone_numbers: A list of phone numbers in any format the region's numbers can be parsed from.
+        :type phone_numbers: list
+        :param session:
+        :type session:
+        :return: A list of account objects in the order of the phone numbers, with None for numbers without an account.
+        :rtype: list
+        """
+        normalized_phone_numbers = [
+            normalize_phone_number(phone_number, E164Format.region) for phone_number in phone_numbers]
+        if not normalized_phone_numbers:
+            return []
+        session = SessionBase.bind_session(session=session)
+        accounts = session.query(Account).filter(
+            Account.normalized_phone_number.in_(set(normalized_phone_numbers))).all()
+        SessionBase.release_session(session=session)
+        accounts = {account.normalized_phone_number: account for account in accounts}
+        return [accounts.get(phone_number) for phone_number in normalized_phone_numbers]
+
     def has_preferred_language(self) -> bool:
         return get_cached_preferred_language(self.blockchain_address) is not None
 
@@ -156,32 +172,36 @@ class Account(SessionBase):
         account_metadata = get_cached_data(key)
         if not account_metadata:
             return self.phone_number
-        account_metadata = json.loads(account_metadata)
-        return parse_account_metadata(account_metadata)
+        return DisplayNames.get(account_metadata)
 
     def get_status(self, session: Session):
         """This function handles account status queries, it checks whether an account's failed pin attempts exceed 2 and
-        updates the account status locked, it then returns the account status
+        updates the account status locked, it then returns the account status. The status is only written when the
+        account is newly locked, so that status queries don't issue writes.
         :return: The account status for a user object
         :rtype: str
         """
-        session = SessionBase.bind_session(session=session)
-        if self.failed_pin_attempts > 2:
+        if self.failed_pin_attempts > 2 and self.status != AccountStatus.LOCKED.value:
+            session = SessionBase.bind_session(session=session)
             self.status = AccountStatus.LOCKED.value
-        session.add(self)
-        session.flush()
-        SessionBase.release_session(session=session)
+            session.add(self)
+            session.flush()
+            SessionBase.release_session(session=session)
         return AccountStatus(self.status).name
 
     def verify_password(self, password):
         """This method takes a password value and compares it to the user's corresponding `hashed_password` value to
-        establish password validity.
+        establish password validity. A valid password hashed with a work factor other than the configured one is hashed
+        again, the new hash is persisted with the session the account is attached to.
         :param password: A password value
         :type password: str
         :return: Pin validity
         :rtype: boolean
         """
-        return check_password_hash(password, self.password_hash)
+        is_valid = check_password_hash(password, self.password_hash)
+        if is_valid and needs_rehash(self.password_hash):
+            self.create_password(password)
+        return is_valid
 
 
 def create(chain_str: str, phone_number: str, session: Session, preferred_language: str, metadata: dict):
@@ -218,7 +238,6 @@ def cache_creation_task_uuid(metadata: dict, phone_number: str, task_uuid: str):
     :param task_uuid: A celery task id
     :type task_uuid: str
     """
-    cache = Cache.store
     account_creation_request_data = {
         'phone_number': phone_number,
         'sms_notification_sent': False,
@@ -226,5 +245,4 @@ def cache_creation_task_uuid(metadata: dict, phone_number: str, task_uuid: str):
         'task_uuid': task_uuid,
         'metadata': metadata
     }
-    cache.set(task_uuid, json.dumps(account_creation_request_data))
-    cache.persist(name=task_uuid)
+    cache_data(CacheKey(task_uuid, 'account_creation'), json.dumps(account_creation_request_data))
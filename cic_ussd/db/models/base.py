@@ -5,7 +5,7 @@ import datetime
 # external imports
 from sqlalchemy import Column, Integer, DateTime
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import (
     StaticPool,
@@ -14,6 +14,9 @@ from sqlalchemy.pool import (
     NullPool,
 )
 
+# local imports
+from cic_ussd.context import record_flush
+
 logg = logging.getLogger().getChild(__name__)
 
 Model = declarative_base(name='Model')
@@ -54,6 +57,13 @@ class SessionBase(Model):
         """
         SessionBase.engine = engine
         SessionBase.sessionmaker = sessionmaker(bind=SessionBase.engine)
+        event.listen(SessionBase.sessionmaker, 'after_flush', SessionBase._after_flush)
+
+    @staticmethod
+    def _after_flush(session, flush_context):
+        """Counts every flush that writes to the database against the request being processed.
+        """
+        record_flush()
 
     @staticmethod
     def connect(dsn, pool_size=16, debug=False):
@@ -1,11 +1,105 @@
+# standard imports
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
 # third party imports
 import bcrypt
 
+# local imports
+from cic_ussd.error import InitializationError
+
+
+class PinHasher:
+    """This class describes the bounded pool of threads pins are hashed and checked in. bcrypt releases the GIL while it
+    hashes, so the pool both spreads hashing over the available cores and caps the cores it may occupy at once.
+    :cvar max_workers: The maximum number of pins hashed at a time.
+    :type max_workers: int
+    :cvar rounds: The bcrypt work factor new hashes are created with.
+    :type rounds: int
+    """
+    max_workers: int = 4
+    rounds: int = 8
+    _executor: ThreadPoolExecutor = None
+    _executor_pid: int = None
+    _lock = threading.Lock()
+    _metrics = {'hashes': 0, 'hash_seconds': 0.0, 'max_hash_seconds': 0.0, 'queue_seconds': 0.0, 'max_queue_seconds': 0.0}
+
+    @classmethod
+    def configure(cls, config):
+        """This function defines the cost of hashing pins and the number of pins hashed at a time from the pin config.
+        :param config: A config object.
+        :type config: confini.Config
+        :raises InitializationError: If the work factor is outside the range bcrypt accepts.
+        """
+        cls.rounds = int(config.get('PIN_ROUNDS') or cls.rounds)
+        cls.max_workers = int(config.get('PIN_MAX_WORKERS') or cls.max_workers)
+        if not 4 <= cls.rounds <= 31:
+            raise InitializationError(f'Invalid pin hashing rounds: {cls.rounds}, expected a value from 4 to 31.')
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """This function returns the pool of the current process, a process forked from another starts its own."""
+        if cls._executor is None or cls._executor_pid != os.getpid():
+            with cls._lock:
+                if cls._executor is None or cls._executor_pid != os.getpid():
+                    cls._executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix='pin-hasher')
+                    cls._executor_pid = os.getpid()
+        return cls._executor
+
+    @classmethod
+    def submit(cls, function, *args) -> Future:
+        """This function queues a bcrypt call in the pool and records how long it waited and how long it ran.
+        :param function: The bcrypt function to call.
+        :type function: Callable
+        :return: A future of the call's result, async callers can await it with asyncio.wrap_future.
+        :rtype: Future
+        """
+        queued = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                cls.record(started - queued, time.perf_counter() - started)
+
+        return cls.executor().submit(timed)
+
+    @classmethod
+    def record(cls, queue_seconds: float, hash_seconds: float):
+        with cls._lock:
+            cls._metrics['hashes'] += 1
+            cls._metrics['hash_seconds'] += hash_seconds
+            cls._metrics['max_hash_seconds'] = max(cls._metrics['max_hash_seconds'], hash_seconds)
+            cls._metrics['queue_seconds'] += queue_seconds
+            cls._metrics['max_queue_seconds'] = max(cls._metrics['max_queue_seconds'], queue_seconds)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """This function returns the number of hashes computed in this process with their mean and maximum latency and
+        the mean and maximum time they waited for a thread.
+        :return: A dict of counts and durations in seconds.
+        :rtype: dict
+        """
+        with cls._lock:
+            metrics = dict(cls._metrics)
+        hashes = metrics['hashes'] or 1
+        return {
+            'hashes': metrics['hashes'],
+            'mean_hash_seconds': metrics['hash_seconds'] / hashes,
+            'max_hash_seconds': metrics['max_hash_seconds'],
+            'mean_queue_seconds': metrics['queue_seconds'] / hashes,
+            'max_queue_seconds': metrics['max_queue_seconds']
+        }
+
 
 def create_password_hash(password):
     """This method encrypts a password value using a pre-set pepper and an appended salt.
     """
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(8)).decode("utf-8")
+    salt = bcrypt.gensalt(PinHasher.rounds)
+    return PinHasher.submit(bcrypt.hashpw, password.encode("utf-8"), salt).result().decode("utf-8")
 
 
 def check_password_hash(password, hashed_password):
@@ -22,4 +116,24 @@ def check_password_hash(password, hashed_password):
     :return: Password validity
     :rtype: boolean
     """
-    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return PinHasher.submit(bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8")).result()
+
+
+def password_hash_rounds(hashed_password: str) -> int:
+    """This function returns the work factor a bcrypt hash was created with.
+    :param hashed_password: A hash for a user's password value
+    :type hashed_password: str
+    :return: The bcrypt work factor.
+    :rtype: int
+    """
+    return int(hashed_password.split('$')[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """This function checks whether a hash was created with a work factor other than the configured one.
+    :param hashed_password: A hash for a user's password value
+    :type hashed_password: str
+    :return: Whether the password should be hashed again.
+    :rtype: bool
+    """
+    return password_hash_rounds(hashed_password) != PinHasher.rounds
@@ -54,3 +54,11 @@ class UnknownUssdRecipient(Exception):
 
 class MaxRetryReached(Exception):
     """Raised when the maximum number of retries defined for polling for the availability of a resource."""
+
+
+class SessionVersionConflictError(Exception):
+    """Raised when a cached ussd session keeps changing underneath a write and cannot be merged within the retry limit."""
+
+
+class JsonRpcError(Exception):
+    """Raised when a JSON-RPC node responds to a call with an error."""
@@ -1,11 +1,15 @@
 # standard imports
 import logging
+import os
+import threading
 from typing import Optional, Union
 from urllib.parse import urlparse, parse_qs
 
 # external imports
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.util.retry import Retry
 
 # local imports
 from cic_ussd.error import UnsupportedMethodError
@@ -13,6 +17,71 @@ from cic_ussd.error import UnsupportedMethodError
 logg = logging.getLogger(__file__)
 
 
+class HttpClient:
+    """This class describes the keep-alive http session shared by all outgoing http calls in a process. Connections are
+    pooled per host, calls time out and idempotent calls are retried with exponential backoff on connection errors and
+    unavailable upstreams.
+    :cvar backoff_factor: The factor in seconds the delay between retries grows exponentially by.
+    :type backoff_factor: float
+    :cvar pool_size: The maximum number of connections open to a single host, calls beyond it wait for a connection.
+    :type pool_size: int
+    :cvar retries: The maximum number of times a call is retried.
+    :type retries: int
+    :cvar timeout: The number of seconds to wait to connect to a host and for it to respond.
+    :type timeout: float
+    """
+    backoff_factor: float = 0.2
+    pool_size: int = 10
+    retries: int = 3
+    timeout: float = 10
+    _lock = threading.Lock()
+    _session: requests.Session = None
+    _session_pid: int = None
+
+    @classmethod
+    def configure(cls, config):
+        """This function defines the pool, retries and timeouts of the session from the http config.
+        :param config: A config object.
+        :type config: confini.Config
+        """
+        cls.pool_size = int(config.get('HTTP_POOL_SIZE') or cls.pool_size)
+        cls.retries = int(config.get('HTTP_RETRIES') or cls.retries)
+        cls.backoff_factor = float(config.get('HTTP_BACKOFF_FACTOR') or cls.backoff_factor)
+        cls.timeout = float(config.get('HTTP_TIMEOUT') or cls.timeout)
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """This function returns the session of the current process, a process forked from another opens its own."""
+        if cls._session is None or cls._session_pid != os.getpid():
+            with cls._lock:
+                if cls._session is None or cls._session_pid != os.getpid():
+                    retry = Retry(total=cls.retries,
+                                  backoff_factor=cls.backoff_factor,
+                                  status_forcelist=(502, 503, 504),
+                                  allowed_methods=frozenset({'GET', 'PUT'}),
+                                  raise_on_status=False)
+                    adapter = HTTPAdapter(pool_maxsize=cls.pool_size, pool_block=True, max_retries=retry)
+                    session = requests.Session()
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    cls._session = session
+                    cls._session_pid = os.getpid()
+        return cls._session
+
+    @classmethod
+    def request(cls, method: str, url: str, **kwargs) -> requests.Response:
+        """This function makes an http call over the shared session.
+        :param method: The http method.
+        :type method: str
+        :param url: The url to call.
+        :type url: str
+        :return: The response.
+        :rtype: requests.Response
+        """
+        kwargs.setdefault('timeout', cls.timeout)
+        return cls.session().request(method, url, **kwargs)
+
+
 def error_handler(result: requests.Response):
     """"""
     status_code = result.status_code
@@ -51,13 +120,13 @@ def make_request(method: str, url: str, data: any = None, headers: dict = None):
     """"""
     if method == 'GET':
         logg.debug(f'Retrieving data from: {url}')
-        result = requests.get(url=url)
+        result = HttpClient.request('GET', url)
     elif method == 'POST':
         logg.debug(f'Posting to: {url} with: {data}')
-        result = requests.post(url=url, data=data, headers=headers)
+        result = HttpClient.request('POST', url, data=data, headers=headers)
     elif method == 'PUT':
         logg.debug(f'Putting to: {url} with: {data}')
-        result = requests.put(url=url, data=data, headers=headers)
+        result = HttpClient.request('PUT', url, data=data, headers=headers)
     else:
         raise UnsupportedMethodError(f'Unsupported method: {method}')
     return result
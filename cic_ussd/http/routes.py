@@ -60,7 +60,7 @@ def locked_accounts(env: dict, session: Session) -> tuple:
 
 def pin_reset(env: dict, phone_number: str, session: Session):
     """"""
-    account = session.query(Account).filter_by(phone_number=phone_number).first()
+    account = Account.get_by_phone_number(phone_number, session)
     if not account:
         return '', '404 Not found'
 
@@ -1,10 +1,14 @@
 # standard imports
 import logging
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 # third party imports
 from tinydb import Query
-from tinydb.table import Document, Table
+from tinydb.table import Table
+
+# local imports
+from cic_ussd.error import InitializationError
 
 # define logger.
 logg = logging.getLogger()
@@ -15,9 +19,16 @@ class UssdMenu:
     This class defines the USSD menu object that is called whenever a user makes transitions in the menu.
     :cvar ussd_menu_db: The tinydb database object.
     :type ussd_menu_db: Table
+    :cvar registry: Read-only menus indexed by name, built from the tinydb database object.
+    :type registry: Mapping
+    :cvar parents: Read-only parent menus indexed by the name of the child menu.
+    :type parents: Mapping
     """
     ussd_menu_db = None
     Menu = Query()
+    registry: Mapping = None
+    parents: Mapping = None
+    registry_source: Table = None
 
     def __init__(self,
                  name: str,
@@ -53,22 +64,69 @@ class UssdMenu:
             'parent': self.parent,
             'display_key': self.display_key
         })
+        UssdMenu.registry = None
+
+    @classmethod
+    def load_registry(cls, states: Optional[list] = None):
+        """
+        This function indexes the menus in the JSON DB by name and resolves each menu's parent. It validates that every
+        parent menu and every state in the state machine has a menu.
+        :param states: Names of the states in the state machine.
+        :type states: list
+        :raises InitializationError: If a parent menu or a state has no corresponding menu.
+        """
+        menus = {}
+        for document in cls.ussd_menu_db.all():
+            name = document.get('name')
+            if name in menus:
+                logg.warning(f'Duplicate USSD Menu with name {name} ignored.')
+                continue
+            menus[name] = MappingProxyType({
+                'name': name,
+                'description': document.get('description'),
+                'parent': document.get('parent'),
+                'display_key': document.get('display_key') or f'ussd.{name}'
+            })
+
+        missing_menus = {menu['parent'] for menu in menus.values() if menu['parent'] and menu['parent'] not in menus}
+        missing_menus |= {state for state in states or [] if state not in menus}
+        if states is not None and 'exit_invalid_request' not in menus:
+            missing_menus.add('exit_invalid_request')
+        if missing_menus:
+            raise InitializationError(f'No USSD Menu with names: {", ".join(sorted(missing_menus))}')
+
+        invalid_request = menus.get('exit_invalid_request')
+        cls.parents = MappingProxyType(
+            {name: menus[menu['parent']] if menu['parent'] else invalid_request for name, menu in menus.items()})
+        cls.registry = MappingProxyType(menus)
+        cls.registry_source = cls.ussd_menu_db
+
+    @classmethod
+    def menus(cls) -> Mapping:
+        """
+        This function returns the menu registry, indexing the JSON DB afresh if it has changed since it was last indexed.
+        :return: Read-only menus indexed by name.
+        :rtype: Mapping
+        """
+        if cls.registry is None or cls.registry_source is not cls.ussd_menu_db:
+            cls.load_registry()
+        return cls.registry
 
     @staticmethod
-    def find_by_name(name: str) -> Document:
+    def find_by_name(name: str) -> Mapping:
         """
-        This function attempts to fetch a menu from the JSON DB using the unique name.
+        This function attempts to fetch a menu from the menu registry using the unique name.
         :param name: The name of the menu that is being searched for.
         :type name: str.
         :return: The function returns the queried menu in JSON format if found,
         else it returns the menu item for invalid requests.
-        :rtype: Document.
+        :rtype: Mapping.
         """
-        menu = UssdMenu.ussd_menu_db.get(UssdMenu.Menu.name == name)
-        if menu:
+        menus = UssdMenu.menus()
+        if menu := menus.get(name):
             return menu
         logg.error("No USSD Menu with name {}".format(name))
-        return UssdMenu.ussd_menu_db.get(UssdMenu.Menu.name == 'exit_invalid_request')
+        return menus.get('exit_invalid_request')
 
     @staticmethod
     def set_description(name: str, description: str):
@@ -81,18 +139,22 @@ class UssdMenu:
         """
         menu = UssdMenu.find_by_name(name=name)
         UssdMenu.ussd_menu_db.update({'description': description}, UssdMenu.Menu.name == menu['name'])
+        UssdMenu.registry = None
 
     @staticmethod
-    def parent_menu(menu_name: str) -> Document:
+    def parent_menu(menu_name: str) -> Mapping:
         """
         This function fetches the parent menu of the menu instance it has been called on.
         :param menu_name: The name of the menu whose parent is to be returned.
         :type menu_name: str
         :return: This function returns the menu's parent menu in JSON format.
-        :rtype: Document.
+        :rtype: Mapping.
         """
-        ussd_menu = UssdMenu.find_by_name(name=menu_name)
-        return UssdMenu.find_by_name(ussd_menu.get('parent'))
+        menus = UssdMenu.menus()
+        if menu_name not in menus:
+            logg.error("No USSD Menu with name {}".format(menu_name))
+            menu_name = 'exit_invalid_request'
+        return UssdMenu.parents.get(menu_name)
 
     def __repr__(self) -> str:
         """
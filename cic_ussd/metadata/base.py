@@ -1,5 +1,9 @@
 # standard imports
+import hashlib
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
 
 # external imports
 from cic_types.condiments import MetadataPointer
@@ -7,15 +11,117 @@ from cic_types.ext.metadata import MetadataRequestsHandler
 from cic_types.processor import generate_metadata_pointer
 
 # local imports
-from cic_ussd.cache import cache_data, get_cached_data
+from cic_ussd.cache import cache_pipeline, Cache, CacheKey, CachePolicy, get_cached_data
+from cic_ussd.http.requests import error_handler, HttpClient
 
 logg = logging.getLogger(__file__)
 
 
+class MetadataRefresh:
+    """This class describes the record of metadata refreshes across all processes. A refresh is unchanged when the
+    metadata retrieved has the digest of the metadata already cached, in which case nothing is cached again.
+    :cvar stats_key: The redis hash holding the number of changed and unchanged refreshes by metadata type.
+    :type stats_key: str
+    """
+    stats_key = 'metadata:refresh:stats'
+
+    @classmethod
+    def record(cls, cic_type: MetadataPointer, changed: bool):
+        """This function counts a refresh of a metadata type as changed or unchanged.
+        :param cic_type: The type of the refreshed metadata.
+        :type cic_type: MetadataPointer
+        :param changed: Whether the refreshed metadata differed from the cached metadata.
+        :type changed: bool
+        """
+        Cache.store.hincrby(cls.stats_key, f'{cic_type.name.lower()}:{"changed" if changed else "unchanged"}', 1)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """This function returns the number of changed and unchanged refreshes by metadata type and the fraction of
+        refreshes that were unchanged.
+        :return: A dict of counts and the unchanged fraction keyed by metadata type.
+        :rtype: dict
+        """
+        counts = Cache.store.hgetall(cls.stats_key)
+        stats = {}
+        for field, count in counts.items():
+            name, outcome = field.rsplit(':', 1)
+            stats.setdefault(name, {'changed': 0, 'unchanged': 0})[outcome] = int(count)
+        for entry in stats.values():
+            entry['unchanged_fraction'] = entry['unchanged'] / ((entry['changed'] + entry['unchanged']) or 1)
+        return stats
+
+
 class UssdMetadataHandler(MetadataRequestsHandler):
     def __init__(self, identifier: bytes, cic_type: MetadataPointer = None):
         super().__init__(cic_type, identifier)
 
+    def create(self, data: Any):
+        """This function submits metadata to the metadata server over the shared http session and signs the merged
+        result.
+        :param data: The metadata to submit.
+        :type data: Any
+        :return: The response to the signed submission.
+        :rtype: requests.Response
+        """
+        result = HttpClient.request('POST', self.url, data=json.dumps(data).encode('utf-8'), headers=self.headers)
+        error_handler(result)
+        return self.edit(data=result.json())
+
+    def query(self):
+        """This function retrieves metadata from the metadata server over the shared http session.
+        :return: The response.
+        :rtype: requests.Response
+        """
+        result = HttpClient.request('GET', self.url)
+        error_handler(result)
+        return result
+
+    def refresh(self, transform: Optional[Callable[[Any], str]] = None) -> bool:
+        """This function retrieves metadata from the metadata server and caches it unless it is unchanged. The request
+        is conditional on the digest of the cached metadata, and when the metadata server does not honor it the digest
+        of the retrieved metadata is compared instead. Unchanged metadata is neither transformed nor cached again, its
+        retention is renewed.
+        :param transform: A function returning the metadata to cache given the retrieved metadata, defaults to caching
+        the retrieved metadata as json.
+        :type transform: Callable
+        :return: Whether the cached metadata changed.
+        :rtype: bool
+        """
+        key = CacheKey(self.metadata_pointer, CachePolicy.namespace(self.cic_type))
+        digest_key = CacheKey(f'{self.metadata_pointer}:digest', key.namespace)
+        pipeline = Cache.store.pipeline(transaction=False)
+        pipeline.exists(key)
+        pipeline.get(digest_key)
+        cached, cached_digest = pipeline.execute()
+        cached_digest = cached_digest if cached else None
+
+        headers = {'If-None-Match': cached_digest} if cached_digest else {}
+        result = HttpClient.request('GET', self.url, headers=headers)
+        if result.status_code == 304:
+            digest = cached_digest
+        else:
+            error_handler(result)
+            digest = result.headers.get('ETag') or hashlib.sha256(result.content).hexdigest()
+
+        if digest == cached_digest:
+            if ttl := CachePolicy.ttl(key):
+                pipeline = Cache.store.pipeline(transaction=False)
+                pipeline.expire(key, ttl)
+                pipeline.expire(digest_key, ttl)
+                pipeline.execute()
+            MetadataRefresh.record(self.cic_type, False)
+            logg.debug(f'metadata at: {self.metadata_pointer} is unchanged.')
+            return False
+
+        data = result.json()
+        data = transform(data) if transform else json.dumps(data)
+        with cache_pipeline() as pipeline:
+            pipeline.cache_data(key, data)
+            pipeline.cache_data(digest_key, digest)
+        MetadataRefresh.record(self.cic_type, True)
+        return True
+
     def cache_metadata(self, data: str):
         """
         :param data: The metadata to be cached
@@ -23,12 +129,33 @@ class UssdMetadataHandler(MetadataRequestsHandler):
         :return: None
         :rtype: None
         """
-        cache_data(self.metadata_pointer, data)
+        with cache_pipeline() as pipeline:
+            pipeline.cache_data(CacheKey(self.metadata_pointer, CachePolicy.namespace(self.cic_type)), data)
+            # metadata cached without a digest is retrieved in full on its next refresh.
+            pipeline.pipeline.delete(f'{self.metadata_pointer}:digest')
         logg.debug(f'caching: {data} with key: {self.metadata_pointer}')
 
     def get_cached_metadata(self):
         """
         :return: The cached metadata
         """
-        key = generate_metadata_pointer(self.identifier, self.cic_type)
+        key = CacheKey(generate_metadata_pointer(self.identifier, self.cic_type), CachePolicy.namespace(self.cic_type))
         return get_cached_data(key)
+
+
+def create_many(submissions: List[Tuple[UssdMetadataHandler, Any]], return_exceptions: bool = False) -> list:
+    """This function submits several pieces of metadata concurrently over the shared http session, no more at a time
+    than the session holds connections to the metadata server.
+    :param submissions: Metadata handlers each with the metadata it submits.
+    :type submissions: list
+    :param return_exceptions: Whether the error raised by a submission is returned in place of its response.
+    :type return_exceptions: bool
+    :raises Exception: The first error raised by a submission, once all submissions are done.
+    :return: The responses in the order of the submissions.
+    :rtype: list
+    """
+    with ThreadPoolExecutor(max_workers=min(len(submissions), HttpClient.pool_size) or 1) as executor:
+        futures = [executor.submit(handler.create, data) for handler, data in submissions]
+    if return_exceptions:
+        return [future.exception() or future.result() for future in futures]
+    return [future.result() for future in futures]
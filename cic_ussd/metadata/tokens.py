@@ -8,7 +8,7 @@ from cic_types.condiments import MetadataPointer
 
 # local imports
 from .base import UssdMetadataHandler
-from cic_ussd.cache import cache_data
+from cic_ussd.cache import cache_data, CacheKey, CachePolicy
 from cic_ussd.error import MetadataNotFoundError
 
 
@@ -29,7 +29,8 @@ def token_metadata_handler(metadata_client: TokenMetadata) -> Optional[Dict]:
     token_metadata = result.json()
     if not token_metadata:
         raise MetadataNotFoundError(f'No metadata found at: {metadata_client.metadata_pointer} for: {metadata_client.identifier.decode("utf-8")}')
-    cache_data(metadata_client.metadata_pointer, json.dumps(token_metadata))
+    key = CacheKey(metadata_client.metadata_pointer, CachePolicy.namespace(metadata_client.cic_type))
+    cache_data(key, json.dumps(token_metadata))
     return token_metadata
 
 
@@ -1,4 +1,5 @@
 # standard imports
+from functools import lru_cache
 
 # third-party imports
 import contextlib
@@ -29,6 +30,27 @@ def process_phone_number(phone_number: str, region: str, add_plus: bool = True)
     return formatted_phone_number if add_plus else formatted_phone_number.strip("+")
 
 
+@lru_cache(maxsize=4096)
+def normalize_phone_number(phone_number: str, region: str = None) -> str:
+    """This function maps a phone number as received from a dialer, user input or the database to the canonical E164
+    format with a + symbol that account lookups are keyed on. The most recently used numbers are kept in memory so the
+    parsing is done once per distinct input per process.
+    :param phone_number: A string with a phone number.
+    :type phone_number: str
+    :param region: Caller defined region
+    :type region: str
+    :return: The E164 formatted phone number or the input unchanged if it cannot be parsed as a phone number.
+    :rtype: str
+    """
+    phone_number = str(phone_number)
+    with contextlib.suppress(phonenumbers.NumberParseException):
+        return process_phone_number(phone_number=phone_number, region=region)
+    if phone_number.isdigit():
+        with contextlib.suppress(phonenumbers.NumberParseException):
+            return process_phone_number(phone_number=f'+{phone_number}', region=None)
+    return phone_number
+
+
 class Support:
     phone_number = None
 
@@ -14,18 +14,26 @@ from cic_ussd.account.balance import (BalancesHandler,
 from cic_ussd.account.chain import Chain
 from cic_ussd.account.metadata import get_cached_preferred_language, UssdMetadataPointer
 from cic_ussd.account.statement import (
-    get_cached_statement,
-    parse_statement_transactions,
-    query_statement)
+    query_statement,
+    render_statement_pages,
+    statement_pages_key)
 from cic_ussd.account.tokens import (get_active_token_symbol,
-                                     get_cached_token_symbol_list,
                                      get_cached_token_data_list,
                                      parse_token_list)
-from cic_ussd.cache import cache_data_key, cache_data, get_cached_data
+from cic_ussd.cache import (cache_data_key,
+                            cache_data,
+                            get_cached_data,
+                            get_cached_object,
+                            get_many_objects,
+                            prefetch_cached_data,
+                            update_cached_objects)
+from cic_ussd.context import memoized
 from cic_ussd.db.models.account import Account
+from cic_ussd.error import CachedDataNotFoundError
 from cic_ussd.metadata import PersonMetadata
 from cic_ussd.phone_number import Support, E164Format
 from cic_ussd.processor.util import parse_person_metadata, ussd_menu_list
+from cic_ussd.refresh import RefreshScheduler
 from cic_ussd.session.ussd_session import save_session_data
 from cic_ussd.state_machine.logic.language import preferred_langauge_from_selection
 from cic_ussd.translation import translation_for
@@ -34,6 +42,17 @@ from cic_ussd.worker import Worker
 logg = logging.getLogger(__file__)
 
 
+def requires(*data: str):
+    """This function declares the cached account data a menu processor method reads to render a menu.
+    :param data: Names of cached data as defined in MenuRenderer.data_keys.
+    :type data: str
+    """
+    def wrapper(method):
+        method.data = frozenset(data)
+        return method
+    return wrapper
+
+
 # It's a class that processes the menu for the account
 class MenuProcessor:
     def __init__(self, account: Account, display_key: str, menu_name: str, session: Session, ussd_session: dict):
@@ -45,38 +64,40 @@ class MenuProcessor:
         self.session = session
         self.ussd_session = ussd_session
 
+    @requires('preferred_language', 'balances')
     def account_balances(self) -> str:
         """
         It returns a string with the available balance of the account.
         :return: The account balances of the user.
         """
-        token_symbol = get_active_token_symbol(self.account.blockchain_address)
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        token_symbol = memoized(get_active_token_symbol, self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         with_available_balance = f'{self.display_key}.available_balance'
         decimals = 6
-        available_balance = get_cached_display_balance(decimals, [self.identifier, token_symbol.encode('utf-8')])
+        available_balance = memoized(
+            get_cached_display_balance, decimals, [self.identifier, token_symbol.encode('utf-8')])
         return translation_for(key=with_available_balance,
                                preferred_language=preferred_language,
                                available_balance=available_balance,
                                token_symbol=token_symbol)
 
+    @requires('preferred_language', 'statement')
     def account_statement(self) -> str:
         """
         It takes a list of transactions, splits it into 3 sets, and returns the first, middle, or last set depending on the
         display_key
         :return: The return value is a string.
         """
-        cached_statement = get_cached_statement(self.account.blockchain_address)
-
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
 
-        statement_list = []
-        if cached_statement:
-            statement_list = parse_statement_transactions(statement=json.loads(cached_statement))
+        statement_pages = get_cached_object(statement_pages_key(self.identifier)) or {}
+        statement_list = statement_pages.get(preferred_language)
+        if statement_list is None:
+            statement_list = self.render_statement(preferred_language)
 
         fallback = translation_for('helpers.no_transaction_history', preferred_language)
         transaction_sets = ussd_menu_list(fallback=fallback, menu_list=statement_list, split=3)
@@ -94,30 +115,53 @@ class MenuProcessor:
                 self.display_key, preferred_language, last_transaction_set=transaction_sets[2]
             )
 
+    def render_statement(self, preferred_language: str) -> list:
+        """This function renders the account's cached statement in a language it has not been rendered in yet and caches
+        the lines alongside the languages it has been rendered in. The statement and its lines are read and written
+        atomically, so that lines rendered concurrently from a newer statement are not overwritten.
+        :param preferred_language: The language to render the statement in.
+        :type preferred_language: str
+        :return: The statement lines ordered from the latest transaction.
+        :rtype: list
+        """
+        def update(cached: list) -> list:
+            statement, pages = cached
+            if not statement:
+                return [None, None]
+            statement.sort(key=lambda d: d.get('timestamp') or 0, reverse=True)
+            # the statement itself is only watched, its lines are the only data written.
+            return [None, {**(pages or {}), **render_statement_pages(statement, [preferred_language])}]
+
+        keys = [cache_data_key(self.identifier, MetadataPointer.STATEMENT), statement_pages_key(self.identifier)]
+        _, pages = update_cached_objects(keys, update)
+        return pages[preferred_language] if pages else []
+
+    @requires('preferred_language')
     def guardian_pin_authorization(self):
         guardian_information = self.guardian_metadata()
         return self.pin_authorization(guardian_information=guardian_information)
 
+    @requires('preferred_language')
     def guardian_list(self):
         """
         It returns a string that contains a list of the guardians of the account that is passed to it
         :return: The return value is a string.
         """
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         if set_guardians := self.account.get_guardians()[:3]:
             guardians_list = ''
             guardians_list_header = translation_for('helpers.guardians_list_header', preferred_language)
-            for phone_number in set_guardians:
-                guardian = Account.get_by_phone_number(phone_number, self.session)
-                guardian_information = guardian.standard_metadata_id()
+            for guardian in Account.get_by_phone_numbers(set_guardians, self.session):
+                guardian_information = memoized(guardian.standard_metadata_id)
                 guardians_list += f'{guardian_information}\n'
             guardians_list = guardians_list_header + '\n' + guardians_list
         else:
             guardians_list = translation_for('helpers.no_guardians_list', preferred_language)
         return translation_for(self.display_key, preferred_language, guardians_list=guardians_list)
 
+    @requires('preferred_language', 'token_list')
     def account_tokens(self) -> str:
         """
         It takes a list of tokens, splits it into 3 sets, and returns the first, middle, or last set depending on the
@@ -127,7 +171,7 @@ class MenuProcessor:
         cached_token_data_list = get_cached_token_data_list(self.account.blockchain_address)
         token_data_list = parse_token_list(cached_token_data_list)
 
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
 
@@ -152,12 +196,14 @@ class MenuProcessor:
                 self.display_key, preferred_language, last_account_tokens_set=token_list_sets[2]
             )
 
+    @requires('preferred_language')
     def help(self) -> str:
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key, preferred_language, support_phone=Support.phone_number)
 
+    @requires('preferred_language', 'person_metadata')
     def person_metadata(self) -> str:
         """
         It takes a person's blockchain address, and returns a string of their metadata
@@ -165,7 +211,7 @@ class MenuProcessor:
         """
         person_metadata = PersonMetadata(self.identifier)
         cached_person_metadata = person_metadata.get_cached_metadata()
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         if cached_person_metadata:
@@ -181,13 +227,14 @@ class MenuProcessor:
             products=absent
         )
 
+    @requires('preferred_language')
     def pin_authorization(self, **kwargs) -> str:
         """
         The function returns a string that is a translation of the key `ussd.retry_pin_entry` in the language
         `preferred_language` with the value of the variable `remaining_attempts` substituted in the string
         :return: The translation for the first pin entry or the retry pin entry.
         """
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         if self.account.failed_pin_attempts == 0:
@@ -205,13 +252,14 @@ class MenuProcessor:
     def guarded_account_metadata(self):
         guarded_account_phone_number = self.ussd_session.get('data').get('guarded_account_phone_number')
         guarded_account = Account.get_by_phone_number(guarded_account_phone_number, self.session)
-        return guarded_account.standard_metadata_id()
+        return memoized(guarded_account.standard_metadata_id)
 
     def guardian_metadata(self):
         guardian_phone_number = self.ussd_session.get('data').get('guardian_phone_number')
         guardian = Account.get_by_phone_number(guardian_phone_number, self.session)
-        return guardian.standard_metadata_id()
+        return memoized(guardian.standard_metadata_id)
 
+    @requires('preferred_language')
     def language(self):
         region = E164Format.region
         key = cache_data_key(['system:languages'.encode('utf-8'), region.encode('utf-8')], MetadataPointer.NONE)
@@ -219,7 +267,7 @@ class MenuProcessor:
         language_list: list = json.loads(cached_system_languages)
 
         if self.account:
-            preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+            preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         else:
             preferred_language = i18n.config.get('fallback')
 
@@ -241,6 +289,7 @@ class MenuProcessor:
                 self.display_key, preferred_language, last_language_set=language_list_sets[2]
             )
 
+    @requires()
     def initial_language_preference(self):
         if language_selection := self.ussd_session.get('data').get('preferred_language'):
             preferred_language = preferred_langauge_from_selection(language_selection)
@@ -248,14 +297,17 @@ class MenuProcessor:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key, preferred_language)
 
+    @requires('preferred_language')
     def reset_guarded_pin_authorization(self):
         guarded_account_information = self.guarded_account_metadata()
         return self.pin_authorization(guarded_account_information=guarded_account_information)
 
+    @requires('preferred_language', 'balances', 'token_list')
     def start_menu(self):
-        active_token_symbol = get_active_token_symbol(self.account.blockchain_address)
+        active_token_symbol = memoized(get_active_token_symbol, self.account.blockchain_address)
         key = cache_data_key([self.identifier, active_token_symbol.encode('utf-8')], MetadataPointer.BALANCES)
-        balances = json.loads(get_cached_data(key))
+        token_symbols_key = cache_data_key(self.identifier, MetadataPointer.TOKEN_SYMBOLS_LIST)
+        balances, token_symbol_list = get_many_objects([key, token_symbols_key])
         balance_handler = BalancesHandler(balances=balances, decimals=6)
         display_balance = balance_handler.display_balance()
 
@@ -268,33 +320,34 @@ class MenuProcessor:
         cache_data(s_key, spendable_balance)
 
         # query statement asynchronously
-        logg.debug(f"Querying statement for {self.account.blockchain_address}")
-        query_statement(self.account.blockchain_address)
-
-        token_symbol_list = get_cached_token_symbol_list(self.account.blockchain_address)
+        if RefreshScheduler.claim('statement', self.account.blockchain_address):
+            logg.debug(f"Querying statement for {self.account.blockchain_address}")
+            query_statement(self.account.blockchain_address)
 
         # asynchronous update of balances in my vouchers list
-        logg.debug(
-            f"Asynchronously updating balances for all tokens: {token_symbol_list}. Account: {self.account.blockchain_address}")
-        s_update_token_balances = celery.signature(
-            'cic_ussd.tasks.tokens.update_account_token_balances',
-            [self.account.blockchain_address, Chain.spec.__str__(), token_symbol_list],
-            queue=Worker.queue_name)
-
-        s_update_my_vouchers_list = celery.signature(
-            'cic_ussd.tasks.tokens.update_my_vouchers_list',
-            queue=Worker.queue_name)
-        celery.chain(s_update_token_balances, s_update_my_vouchers_list).apply_async()
+        if RefreshScheduler.claim('token_balances', self.account.blockchain_address):
+            logg.debug(
+                f"Asynchronously updating balances for all tokens: {token_symbol_list}. Account: {self.account.blockchain_address}")
+            s_update_token_balances = celery.signature(
+                'cic_ussd.tasks.tokens.update_account_token_balances',
+                [self.account.blockchain_address, Chain.spec.__str__(), token_symbol_list],
+                queue=Worker.queue_name)
+
+            s_update_my_vouchers_list = celery.signature(
+                'cic_ussd.tasks.tokens.update_my_vouchers_list',
+                queue=Worker.queue_name)
+            celery.chain(s_update_token_balances, s_update_my_vouchers_list).apply_async()
 
         # asynchronously update sink address balances
-        logg.debug(f"Asynchronously updating sink address balances for all tokens: {token_symbol_list}.")
-        s_update_sink_address_balances = celery.signature(
-            'cic_ussd.tasks.tokens.update_sink_address_balances',
-            [Chain.spec.__str__(), token_symbol_list],
-            queue=Worker.queue_name)
-        s_update_sink_address_balances.apply_async()
-
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        if RefreshScheduler.claim('sink_address_balances', ','.join(sorted(token_symbol_list or []))):
+            logg.debug(f"Asynchronously updating sink address balances for all tokens: {token_symbol_list}.")
+            s_update_sink_address_balances = celery.signature(
+                'cic_ussd.tasks.tokens.update_sink_address_balances',
+                [Chain.spec.__str__(), token_symbol_list],
+                queue=Worker.queue_name)
+            s_update_sink_address_balances.apply_async()
+
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(
@@ -302,6 +355,7 @@ class MenuProcessor:
             account_token_name=active_token_symbol
         )
 
+    @requires('preferred_language')
     def token_selection_pin_authorization(self) -> str:
         selected_token = self.ussd_session.get('data').get('selected_token')
         token_symbol = selected_token.get('symbol')
@@ -315,23 +369,25 @@ class MenuProcessor:
         token_data = f'{token_symbol}\n{token_issuer}\n{token_contact}\n{token_location}\n{token_description}'
         return self.pin_authorization(token_data=token_data)
 
+    @requires('preferred_language', 'balances')
     def enter_transaction_amount(self):
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
-        token_symbol = get_active_token_symbol(self.account.blockchain_address)
+        token_symbol = memoized(get_active_token_symbol, self.account.blockchain_address)
         key = cache_data_key([self.identifier, token_symbol.encode('utf-8')],
                              UssdMetadataPointer.BALANCE_SPENDABLE)
         spendable_amount = get_cached_data(key)
         return translation_for(self.display_key, preferred_language,
                                spendable_amount=f"{spendable_amount} {token_symbol}")
 
+    @requires('preferred_language', 'person_metadata')
     def transaction_pin_authorization(self) -> str:
         recipient_phone_number = self.ussd_session.get('data').get('recipient_phone_number')
         recipient = Account.get_by_phone_number(recipient_phone_number, self.session)
-        tx_recipient_information = recipient.standard_metadata_id()
-        tx_sender_information = self.account.standard_metadata_id()
-        token_symbol = get_active_token_symbol(self.account.blockchain_address)
+        tx_recipient_information = memoized(recipient.standard_metadata_id)
+        tx_sender_information = memoized(self.account.standard_metadata_id)
+        token_symbol = memoized(get_active_token_symbol, self.account.blockchain_address)
         user_input = self.ussd_session.get('data').get('transaction_amount')
         return self.pin_authorization(
             recipient_information=tx_recipient_information,
@@ -340,59 +396,66 @@ class MenuProcessor:
             sender_information=tx_sender_information
         )
 
+    @requires('preferred_language')
     def exit_guardian_addition_success(self) -> str:
         guardian_information = self.guardian_metadata()
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key,
                                preferred_language,
                                guardian_information=guardian_information)
 
+    @requires('preferred_language')
     def exit_guardian_removal_success(self):
         guardian_information = self.guardian_metadata()
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key,
                                preferred_language,
                                guardian_information=guardian_information)
 
+    @requires('preferred_language')
     def exit_invalid_guardian_addition(self):
         failure_reason = self.ussd_session.get('data').get('failure_reason')
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key, preferred_language, error_exit=failure_reason)
 
+    @requires('preferred_language')
     def exit_invalid_guardian_removal(self):
         failure_reason = self.ussd_session.get('data').get('failure_reason')
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key, preferred_language, error_exit=failure_reason)
 
+    @requires('preferred_language')
     def exit_pin_reset_initiated_success(self):
         guarded_account_information = self.guarded_account_metadata()
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key,
                                preferred_language,
                                guarded_account_information=guarded_account_information)
 
+    @requires('preferred_language', 'balances')
     def exit_insufficient_balance(self):
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         session_data = self.ussd_session.get('data')
-        token_symbol = get_active_token_symbol(self.account.blockchain_address)
+        token_symbol = memoized(get_active_token_symbol, self.account.blockchain_address)
         decimals = 6
-        available_balance = get_cached_display_balance(decimals, [self.identifier, token_symbol.encode('utf-8')])
+        available_balance = memoized(
+            get_cached_display_balance, decimals, [self.identifier, token_symbol.encode('utf-8')])
         transaction_amount = session_data.get('transaction_amount')
         recipient_phone_number = self.ussd_session.get('data').get('recipient_phone_number')
         recipient = Account.get_by_phone_number(recipient_phone_number, self.session)
-        tx_recipient_information = recipient.standard_metadata_id()
+        tx_recipient_information = memoized(recipient.standard_metadata_id)
         return translation_for(
             self.display_key,
             preferred_language,
@@ -402,52 +465,58 @@ class MenuProcessor:
             token_balance=available_balance
         )
 
+    @requires('preferred_language')
     def exit_invalid_menu_option(self):
         if self.account:
-            preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+            preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         else:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key, preferred_language, support_phone=Support.phone_number)
 
+    @requires('preferred_language')
     def exit_pin_blocked(self):
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for('ussd.exit_pin_blocked', preferred_language, support_phone=Support.phone_number)
 
+    @requires('preferred_language')
     def exit_successful_token_selection(self) -> str:
         selected_token = self.ussd_session.get('data').get('selected_token')
         token_symbol = selected_token.get('symbol')
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         return translation_for(self.display_key, preferred_language, token_symbol=token_symbol)
 
+    @requires('preferred_language')
     def exit_invalid_recipient(self):
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         invalid_recipient = self.ussd_session.get('user_input')
         return translation_for(self.display_key, preferred_language, invalid_number=invalid_recipient)
 
+    @requires('preferred_language')
     def exit_successfully_invited_new_user(self):
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
 
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         invited_number = self.ussd_session.get('data').get('recipient_phone_number')
         return translation_for(self.display_key, preferred_language, invited_user=invited_number)
 
+    @requires('preferred_language', 'person_metadata')
     def exit_successful_transaction(self):
         amount = self.ussd_session.get('data').get('transaction_amount')
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
-        token_symbol = get_active_token_symbol(self.account.blockchain_address)
+        token_symbol = memoized(get_active_token_symbol, self.account.blockchain_address)
         recipient_phone_number = self.ussd_session.get('data').get('recipient_phone_number')
         recipient = Account.get_by_phone_number(phone_number=recipient_phone_number, session=self.session)
-        tx_recipient_information = recipient.standard_metadata_id()
-        tx_sender_information = self.account.standard_metadata_id()
+        tx_recipient_information = memoized(recipient.standard_metadata_id)
+        tx_sender_information = memoized(self.account.standard_metadata_id)
         return translation_for(
             self.display_key,
             preferred_language,
@@ -457,13 +526,15 @@ class MenuProcessor:
             sender_information=tx_sender_information
         )
 
+    @requires('preferred_language')
     def community_fund_balances(self):
-        token_symbol = get_active_token_symbol(self.account.blockchain_address)
+        token_symbol = memoized(get_active_token_symbol, self.account.blockchain_address)
         key = cache_data_key(token_symbol.encode("utf-8"), salt=UssdMetadataPointer.TOKEN_SINK_ADDRESS)
         balances = None
         if blockchain_address := get_cached_data(key):
-            balances = get_cached_display_balance(6, [bytes.fromhex(blockchain_address), token_symbol.encode('utf-8')])
-        preferred_language = get_cached_preferred_language(self.account.blockchain_address)
+            balances = memoized(
+                get_cached_display_balance, 6, [bytes.fromhex(blockchain_address), token_symbol.encode('utf-8')])
+        preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
         community_fund_balance = f"{balances} {token_symbol}"
@@ -471,6 +542,126 @@ class MenuProcessor:
                                preferred_language,
                                community_fund_balance=community_fund_balance)
 
+    @requires('preferred_language')
+    def default(self) -> str:
+        preferred_language = i18n.config.get('fallback')
+        if self.account:
+            preferred_language = memoized(get_cached_preferred_language, self.account.blockchain_address)
+        return translation_for(self.display_key, preferred_language)
+
+
+class MenuRenderer:
+    """This class maps menu names to the menu processor method that renders them and the cached data the method reads.
+    :cvar render_rules: Ordered rules, a rule applies to menus whose name is in its names or contains its substring.
+    :type render_rules: list
+    :cvar renderers: Menu processor methods indexed by menu name.
+    :type renderers: dict
+    """
+    render_rules = [
+        ({'enter_village_selection_first_set',
+          'enter_full_name',
+          'economic_activity_selection',
+          'monthly_expenditure_query',
+          'enter_gender',
+          'twenty_thousand_band',
+          'thirty_five_thousand_band',
+          'above_thirty_five_thousand_band',
+          'account_creation_prompt'}, None, 'initial_language_preference'),
+        ({'start'}, None, 'start_menu'),
+        ({'help'}, None, 'help'),
+        ({'transaction_pin_authorization'}, None, 'transaction_pin_authorization'),
+        ({'token_selection_pin_authorization'}, None, 'token_selection_pin_authorization'),
+        ({'exit_invalid_recipient'}, None, 'exit_invalid_recipient'),
+        ({'exit_successfully_invited_new_user'}, None, 'exit_successfully_invited_new_user'),
+        ({'exit_insufficient_balance'}, None, 'exit_insufficient_balance'),
+        ({'exit_invalid_guardian_addition'}, None, 'exit_invalid_guardian_addition'),
+        ({'exit_invalid_guardian_removal'}, None, 'exit_invalid_guardian_removal'),
+        ({'exit_successful_transaction'}, None, 'exit_successful_transaction'),
+        ({'exit_guardian_addition_success'}, None, 'exit_guardian_addition_success'),
+        ({'exit_guardian_removal_success'}, None, 'exit_guardian_removal_success'),
+        ({'exit_pin_reset_initiated_success'}, None, 'exit_pin_reset_initiated_success'),
+        ({'community_fund_balances'}, None, 'community_fund_balances'),
+        ({'account_balances'}, None, 'account_balances'),
+        ({'guardian_list'}, None, 'guardian_list'),
+        (None, 'guardian_pin_authorization', 'guardian_pin_authorization'),
+        ({'reset_guarded_pin_authorization'}, None, 'reset_guarded_pin_authorization'),
+        (None, 'pin_authorization', 'pin_authorization'),
+        (None, 'enter_current_pin', 'pin_authorization'),
+        (None, 'transaction_set', 'account_statement'),
+        (None, 'account_tokens_set', 'account_tokens'),
+        (None, 'language', 'language'),
+        ({'display_user_metadata'}, None, 'person_metadata'),
+        ({'exit_invalid_menu_option', 'exit_invalid_new_pin'}, None, 'exit_invalid_menu_option'),
+        ({'exit_pin_blocked'}, None, 'exit_pin_blocked'),
+        ({'exit_successful_token_selection'}, None, 'exit_successful_token_selection'),
+        ({'enter_transaction_amount'}, None, 'enter_transaction_amount'),
+    ]
+    renderers: dict = {}
+
+    @classmethod
+    def load(cls, menu_names):
+        """This function resolves the renderer of each menu once so that rendering a menu is a single lookup.
+        :param menu_names: Names of all menus.
+        :type menu_names: Iterable
+        """
+        cls.renderers = {menu_name: cls.resolve(menu_name) for menu_name in menu_names}
+
+    @classmethod
+    def resolve(cls, menu_name: str):
+        """This function applies the render rules to a menu name.
+        :param menu_name: The name of the menu.
+        :type menu_name: str
+        :return: The menu processor method that renders the menu.
+        :rtype: Callable
+        """
+        for names, substring, method in cls.render_rules:
+            if (names and menu_name in names) or (substring and substring in menu_name):
+                return getattr(MenuProcessor, method)
+        return MenuProcessor.default
+
+    @classmethod
+    def find(cls, menu_name: str):
+        """This function returns the renderer of a menu, resolving it if the menu was not known at boot.
+        :param menu_name: The name of the menu.
+        :type menu_name: str
+        :return: The menu processor method that renders the menu.
+        :rtype: Callable
+        """
+        if (renderer := cls.renderers.get(menu_name)) is None:
+            renderer = cls.renderers[menu_name] = cls.resolve(menu_name)
+        return renderer
+
+    @staticmethod
+    def data_keys(account: Account, data: frozenset) -> list:
+        """This function lists the cache keys holding the account data a renderer requires.
+        :param account: The account in a running USSD session.
+        :type account: Account
+        :param data: Names of the cached data required.
+        :type data: frozenset
+        :return: Cache keys.
+        :rtype: list
+        """
+        identifier = bytes.fromhex(account.blockchain_address)
+        keys = []
+        if 'preferred_language' in data:
+            keys.append(cache_data_key(identifier, MetadataPointer.PREFERENCES))
+        if 'person_metadata' in data:
+            keys.append(cache_data_key(identifier, MetadataPointer.PERSON))
+        if 'statement' in data:
+            keys.append(statement_pages_key(identifier))
+        if 'token_list' in data:
+            keys.append(cache_data_key(identifier, MetadataPointer.TOKEN_DATA_LIST))
+            keys.append(cache_data_key(identifier, MetadataPointer.TOKEN_SYMBOLS_LIST))
+        if 'balances' in data:
+            try:
+                token_symbol = memoized(get_active_token_symbol, account.blockchain_address)
+            except CachedDataNotFoundError:
+                return keys
+            balances_identifier = [identifier, token_symbol.encode('utf-8')]
+            keys.append(cache_data_key(balances_identifier, MetadataPointer.BALANCES))
+            keys.append(cache_data_key(balances_identifier, UssdMetadataPointer.BALANCE_SPENDABLE))
+        return keys
+
 
 def response(account: Account, display_key: str, menu_name: str, session: Session, ussd_session: dict) -> str:
     """This function extracts the appropriate session data based on the current menu name. It then inserts them as
@@ -488,105 +679,8 @@ def response(account: Account, display_key: str, menu_name: str, session: Sessio
     :return: A string value corresponding the ussd menu's text value.
     :rtype: str
     """
-    menu_processor = MenuProcessor(account, display_key, menu_name, session, ussd_session)
-
-    if menu_name in {'enter_village_selection_first_set',
-                     'enter_full_name',
-                     'economic_activity_selection',
-                     'monthly_expenditure_query',
-                     'enter_gender',
-                     'twenty_thousand_band',
-                     'thirty_five_thousand_band',
-                     'above_thirty_five_thousand_band',
-                     'account_creation_prompt'}:
-        return menu_processor.initial_language_preference()
-
-    if menu_name == 'start':
-        return menu_processor.start_menu()
-
-    if menu_name == 'help':
-        return menu_processor.help()
-
-    if menu_name == 'transaction_pin_authorization':
-        return menu_processor.transaction_pin_authorization()
-
-    if menu_name == 'token_selection_pin_authorization':
-        return menu_processor.token_selection_pin_authorization()
-
-    if menu_name == 'exit_invalid_recipient':
-        return menu_processor.exit_invalid_recipient()
-
-    if menu_name == 'exit_successfully_invited_new_user':
-        return menu_processor.exit_successfully_invited_new_user()
-
-    if menu_name == 'exit_insufficient_balance':
-        return menu_processor.exit_insufficient_balance()
-
-    if menu_name == 'exit_invalid_guardian_addition':
-        return menu_processor.exit_invalid_guardian_addition()
-
-    if menu_name == 'exit_invalid_guardian_removal':
-        return menu_processor.exit_invalid_guardian_removal()
-
-    if menu_name == 'exit_successful_transaction':
-        return menu_processor.exit_successful_transaction()
-
-    if menu_name == 'exit_guardian_addition_success':
-        return menu_processor.exit_guardian_addition_success()
-
-    if menu_name == 'exit_guardian_removal_success':
-        return menu_processor.exit_guardian_removal_success()
-
-    if menu_name == 'exit_pin_reset_initiated_success':
-        return menu_processor.exit_pin_reset_initiated_success()
-
-    if menu_name == "community_fund_balances":
-        return menu_processor.community_fund_balances()
-
-    if menu_name == 'account_balances':
-        return menu_processor.account_balances()
-
-    if menu_name == 'guardian_list':
-        return menu_processor.guardian_list()
-
-    if 'guardian_pin_authorization' in menu_name:
-        return menu_processor.guardian_pin_authorization()
-
-    if menu_name == 'reset_guarded_pin_authorization':
-        return menu_processor.reset_guarded_pin_authorization()
-
-    if 'pin_authorization' in menu_name:
-        return menu_processor.pin_authorization()
-
-    if 'enter_current_pin' in menu_name:
-        return menu_processor.pin_authorization()
-
-    if 'transaction_set' in menu_name:
-        return menu_processor.account_statement()
-
-    if 'account_tokens_set' in menu_name:
-        return menu_processor.account_tokens()
-
-    if 'language' in menu_name:
-        return menu_processor.language()
-
-    if menu_name == 'display_user_metadata':
-        return menu_processor.person_metadata()
-
-    if menu_name == 'exit_invalid_menu_option':
-        return menu_processor.exit_invalid_menu_option()
-
-    if menu_name == 'exit_pin_blocked':
-        return menu_processor.exit_pin_blocked()
-
-    if menu_name == 'exit_successful_token_selection':
-        return menu_processor.exit_successful_token_selection()
-
-    if menu_name == "enter_transaction_amount":
-        return menu_processor.enter_transaction_amount()
-
-    preferred_language = i18n.config.get('fallback')
+    renderer = MenuRenderer.find(menu_name)
     if account:
-        preferred_language = get_cached_preferred_language(account.blockchain_address)
-
-    return translation_for(display_key, preferred_language)
+        prefetch_cached_data(MenuRenderer.data_keys(account, renderer.data))
+    menu_processor = MenuProcessor(account, display_key, menu_name, session, ussd_session)
+    return renderer(menu_processor)
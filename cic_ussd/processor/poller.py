@@ -6,10 +6,14 @@ from typing import Callable, Dict, Optional, Tuple, Union
 
 # external imports
 from cic_types.condiments import MetadataPointer
+from redis import Redis
 
 # local imports
-from cic_ussd.cache import cache_data_key, get_cached_data
+from cic_ussd.cache import Cache, cache_data_key, cache_notification_channel, get_cached_data
+from cic_ussd.codec import binary_client, Codec
+from cic_ussd.context import current_context
 from cic_ussd.error import MaxRetryReached
+from cic_ussd.session.ussd_session import session_notification_channel, UssdSession
 
 
 logg = logging.getLogger()
@@ -50,13 +54,57 @@ def poller(args: Optional[Tuple],
         time.sleep(interval)
 
 
+def notified_poller(channel: str,
+                    interval: int,
+                    max_retry: int,
+                    store: Redis,
+                    target: Callable[[], Union[Dict, str]]):
+    """This function waits for a resource the way the poller does, with the same number of checks and time between
+    them, but it sleeps on a notification channel instead so that it checks for the resource again as soon as a
+    notification is published.
+    :param channel: The channel notifications about the resource are published to.
+    :type channel: str
+    :param interval: The maximum number of seconds to wait between checks.
+    :type interval: int
+    :param max_retry: The number of times to check for the resource.
+    :type max_retry: int
+    :param store: The redis cache the channel is published on.
+    :type store: Redis
+    :param target: A function that returns the resource when it is available.
+    :type target: Callable
+    :raises MaxRetryReached: If the resource is not available at the last check.
+    :return: The resource.
+    """
+    collected_values: list = []
+    tries = 0
+    pubsub = store.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(channel)
+    try:
+        while True:
+            value = target()
+            if bool(value) or value == {}:
+                logg.debug(f'Resource: {value} now available.')
+                return value
+            collected_values.append(value)
+            logg.debug(f'Collected values are: {collected_values}')
+            tries += 1
+            if tries >= max_retry:
+                raise MaxRetryReached(collected_values, value)
+            deadline = time.monotonic() + interval
+            while (remaining := deadline - time.monotonic()) > 0:
+                if pubsub.get_message(timeout=remaining):
+                    break
+    finally:
+        pubsub.close()
+
+
 def wait_for_cache(identifier: Union[list, bytes],
                    resource_name: str,
                    salt: MetadataPointer,
                    interval: int = 3,
                    max_retry: int = 15):
     """
-    > Poll the cache for a resource, and return the resource when it's found
+    > Wait for a resource to be cached, and return the resource when it's found
 
     :param identifier: The identifier of the resource you're waiting for
     :type identifier: Union[list, bytes]
@@ -64,20 +112,44 @@ def wait_for_cache(identifier: Union[list, bytes],
     :type resource_name: str
     :param salt: MetadataPointer
     :type salt: MetadataPointer
-    :param interval: The number of seconds to wait between each poll, defaults to 3
+    :param interval: The maximum number of seconds to wait between each check, defaults to 3
     :type interval: int (optional)
-    :param max_retry: The number of times to poll the cache, defaults to 15
+    :param max_retry: The number of times to check for the resource, defaults to 15
     :type max_retry: int (optional)
     """
     key: str = cache_data_key(identifier=identifier, salt=salt)
     logg.debug(f'Polling for resource: {resource_name} at: {key} every: {interval} second(s) for {max_retry} seconds.')
-    poller(args=(key,), interval=interval, kwargs=None, max_retry=max_retry, target=get_cached_data)
+
+    def get_fresh_cached_data():
+        # a value prefetched into the request context may predate the resource being cached.
+        if (context := current_context()) is not None:
+            context.cached_data.pop(key, None)
+        return get_cached_data(key)
+
+    return notified_poller(channel=cache_notification_channel(key),
+                           interval=interval,
+                           max_retry=max_retry,
+                           store=Cache.store,
+                           target=get_fresh_cached_data)
+
+
+def refresh_session_data(ussd_session: dict):
+    """This function updates a ussd session's data and version from its cached copy.
+    :param ussd_session: A ussd session passed to the state machine.
+    :type ussd_session: dict
+    """
+    external_session_id = ussd_session.get('external_session_id')
+    cached_ussd_session = binary_client(UssdSession.store).get(external_session_id) if external_session_id else None
+    if cached_ussd_session:
+        cached_ussd_session = Codec.decode(cached_ussd_session)
+        ussd_session['data'] = cached_ussd_session.get('data')
+        ussd_session['version'] = cached_ussd_session.get('version')
 
 
 def wait_for_session_data(resource_name: str, session_data_key: str, ussd_session: dict, interval: int = 1, max_retry: int = 15):
     """
-    It polls for the data element in the session dictionary and then polls for the session data element in the data
-    dictionary
+    It waits for the data element in the session dictionary and then for the session data element in the data
+    dictionary, re-reading the cached session whenever it is written
 
     :param resource_name: The name of the resource you're waiting for
     :type resource_name: str
@@ -85,17 +157,28 @@ def wait_for_session_data(resource_name: str, session_data_key: str, ussd_sessio
     :type session_data_key: str
     :param ussd_session: The session object returned by the `ussd_session` function
     :type ussd_session: dict
-    :param interval: The time in seconds to wait before checking for the data element, defaults to 1
+    :param interval: The maximum time in seconds to wait before checking for the data element, defaults to 1
     :type interval: int (optional)
     :param max_retry: The maximum number of times to retry the function, defaults to 15
     :type max_retry: int (optional)
     """
-    # poll for data element first
+    channel = session_notification_channel(ussd_session.get('external_session_id'))
+
+    def session_data(key: Optional[str] = None):
+        def get_session_data():
+            data = ussd_session.get('data')
+            if data is None or (key is not None and key not in data):
+                refresh_session_data(ussd_session)
+                data = ussd_session.get('data')
+            return data if key is None else (data or {}).get(key)
+        return get_session_data
+
+    # wait for data element first
     logg.debug(f'Data poller with max retry at: {max_retry}. Checking for every: {interval} seconds.')
-    poller(args=('data',), interval=interval, kwargs=None, max_retry=max_retry, target=ussd_session.get)
+    notified_poller(channel=channel, interval=interval, max_retry=max_retry, store=UssdSession.store,
+                    target=session_data())
 
-    # poll for session data element
-    get_session_data = ussd_session.get('data').get
+    # wait for session data element
     logg.debug(f'Session data poller for: {resource_name} with max retry at: {max_retry}. Checking for every: {interval} seconds.')
-    poller(args=(session_data_key,), interval=interval, kwargs=None, max_retry=max_retry, target=get_session_data)
-
+    notified_poller(channel=channel, interval=interval, max_retry=max_retry, store=UssdSession.store,
+                    target=session_data(session_data_key))
@@ -1,24 +1,25 @@
 # standard imports
 import json
-from typing import Optional
+from typing import Mapping, Optional
 
 # external imports
 import celery
 from sqlalchemy.orm.session import Session
-from tinydb.table import Document
 
 # local imports
 from cic_ussd.account.balance import get_balances
 from cic_ussd.account.chain import Chain
-from cic_ussd.cache import get_cached_data
+from cic_ussd.cache import get_cached_object
+from cic_ussd.context import memoized, RequestContext
 from cic_ussd.db.models.account import Account
 from cic_ussd.db.models.base import SessionBase
 from cic_ussd.db.models.ussd_session import UssdSession
 from cic_ussd.menu.ussd_menu import UssdMenu
 from cic_ussd.processor.menu import response
 from cic_ussd.processor.util import latest_input, resume_last_ussd_session
+from cic_ussd.refresh import RefreshScheduler
 from cic_ussd.session.ussd_session import create_or_update_session, persist_ussd_session
-from cic_ussd.state_machine import UssdStateMachine
+from cic_ussd.state_machine import UssdStateGraph
 from cic_ussd.state_machine.logic.manager import States
 from cic_ussd.validator import is_valid_response
 from cic_ussd.processor.enums import ProviderUssdCodes
@@ -31,15 +32,17 @@ def account_metadata_queries(blockchain_address: str):
     :param blockchain_address: hex value of an account's blockchain address.
     :type blockchain_address: str
     """
-    s_query_person_metadata = celery.signature(
-        'cic_ussd.tasks.metadata.query_person_metadata', [blockchain_address], queue=Worker.queue_name)
-    s_query_person_metadata.apply_async()
-    s_query_preferences_metadata = celery.signature(
-        'cic_ussd.tasks.metadata.query_preferences_metadata', [blockchain_address], queue=Worker.queue_name)
-    s_query_preferences_metadata.apply_async()
+    if RefreshScheduler.claim('person_metadata', blockchain_address):
+        s_query_person_metadata = celery.signature(
+            'cic_ussd.tasks.metadata.query_person_metadata', [blockchain_address], queue=Worker.queue_name)
+        s_query_person_metadata.apply_async()
+    if RefreshScheduler.claim('preferences_metadata', blockchain_address):
+        s_query_preferences_metadata = celery.signature(
+            'cic_ussd.tasks.metadata.query_preferences_metadata', [blockchain_address], queue=Worker.queue_name)
+        s_query_preferences_metadata.apply_async()
 
 
-def handle_menu(account: Account, session: Session) -> Document:
+def handle_menu(account: Account, session: Session) -> Mapping:
     """
     If the account's pin is blocked, show the user the exit_pin_blocked menu, otherwise if the account's pin is not valid,
     show the user the initial_pin_entry menu, otherwise show the user the start menu
@@ -50,7 +53,7 @@ def handle_menu(account: Account, session: Session) -> Document:
     id, the user's phone number, the user's current menu, the user's current menu's name, the user's current menu's text,
     the user's current menu's options, the
     :type session: Session
-    :return: A Document object
+    :return: A menu mapping
     """
     if account.pin_is_blocked(session):
         return UssdMenu.find_by_name('exit_pin_blocked')
@@ -61,7 +64,7 @@ def handle_menu(account: Account, session: Session) -> Document:
     return UssdMenu.find_by_name('start')
 
 
-def get_menu(account: Account, session: Session, user_input: str, ussd_session: Optional[dict]) -> Document:
+def get_menu(account: Account, session: Session, user_input: str, ussd_session: Optional[dict]) -> Mapping:
     """
     It takes in the account, session, user input and the ussd session and returns a document
 
@@ -109,18 +112,18 @@ def handle_menu_operations(external_session_id: str, phone_number: str, queue: s
     """
     session = SessionBase.bind_session(session=session)
     account: Account = Account.get_by_phone_number(phone_number, session)
-    if not account:
-        return handle_no_account_menu_operations(
-            account, external_session_id, phone_number, queue, session, service_code, user_input)
-    account_metadata_queries(account.blockchain_address)
-    return handle_account_menu_operations(account, external_session_id, queue, session, service_code, user_input)
+    with RequestContext():
+        if not account:
+            return handle_no_account_menu_operations(
+                account, external_session_id, phone_number, queue, session, service_code, user_input)
+        account_metadata_queries(account.blockchain_address)
+        return handle_account_menu_operations(account, external_session_id, queue, session, service_code, user_input)
 
 
 def handle_no_account_menu_operations(account: Optional[Account], external_session_id: str, phone_number: str, queue: str, session: Session, service_code: str, user_input: str):
     initial_language_selection = 'initial_language_selection'
     menu = UssdMenu.find_by_name(initial_language_selection)
-    if last_ussd_session := get_cached_data(external_session_id):
-        retrieved_ussd_session = json.loads(last_ussd_session)
+    if retrieved_ussd_session := get_cached_object(external_session_id):
         menu_name = retrieved_ussd_session.get('state')
         if user_input:
             last_input = latest_input(user_input)
@@ -128,8 +131,7 @@ def handle_no_account_menu_operations(account: Optional[Account], external_sessi
             menu = UssdMenu.find_by_name(state)
         elif menu_name not in States.non_resumable_states and menu_name != initial_language_selection:
             menu = resume_last_ussd_session(retrieved_ussd_session.get("state"))
-    if last_ussd_session:
-        retrieved_ussd_session = json.loads(last_ussd_session)
+    if retrieved_ussd_session:
         ussd_session = create_or_update_session(
             external_session_id=external_session_id,
             msisdn=phone_number,
@@ -137,7 +139,8 @@ def handle_no_account_menu_operations(account: Optional[Account], external_sessi
             state=menu.get('name'),
             session=session,
             user_input=user_input,
-            data=retrieved_ussd_session.get('data') or {})
+            data=retrieved_ussd_session.get('data') or {},
+            ussd_session=retrieved_ussd_session)
     else:
         ussd_session = create_or_update_session(
             external_session_id=external_session_id,
@@ -192,14 +195,14 @@ def handle_account_menu_operations(account: Account,
     """
     chain_str = Chain.spec.__str__()
     phone_number = account.phone_number
-    token_symbol = get_active_token_symbol(account.blockchain_address)
-    get_balances(address=account.blockchain_address,
-                 chain_str=chain_str,
-                 token_symbol=token_symbol,
-                 asynchronous=True,
-                 callback_param=f'{account.blockchain_address},{token_symbol}')
-    if existing_ussd_session := get_cached_data(external_session_id):
-        ussd_session_in_cache = json.loads(existing_ussd_session)
+    token_symbol = memoized(get_active_token_symbol, account.blockchain_address)
+    if RefreshScheduler.claim('balances', f'{account.blockchain_address},{token_symbol}'):
+        get_balances(address=account.blockchain_address,
+                     chain_str=chain_str,
+                     token_symbol=token_symbol,
+                     asynchronous=True,
+                     callback_param=f'{account.blockchain_address},{token_symbol}')
+    if ussd_session_in_cache := get_cached_object(external_session_id):
         menu = get_menu(account, session, user_input, ussd_session_in_cache)
         session_data = ussd_session_in_cache.get("data")
     else:
@@ -211,7 +214,8 @@ def handle_account_menu_operations(account: Account,
                 session_data = last_ussd_session.data
 
     ussd_session = create_or_update_session(
-        external_session_id, phone_number, service_code, user_input, menu.get('name'), session, session_data)
+        external_session_id, phone_number, service_code, user_input, menu.get('name'), session, session_data,
+        ussd_session_in_cache)
     menu_response = response(
         account, menu.get('display_key'), menu.get('name'), session, ussd_session.to_json())
 
@@ -245,6 +249,4 @@ def next_state(account: Account, session, user_input: str, ussd_session: dict) -
     :return:
     :rtype:
     """
-    state_machine = UssdStateMachine(ussd_session=ussd_session)
-    state_machine.scan_data((user_input, ussd_session, account, session))
-    return state_machine.state
+    return UssdStateGraph.next_state(ussd_session.get('state'), (user_input, ussd_session, account, session))
@@ -2,11 +2,10 @@
 import datetime
 import json
 import logging
-from typing import List
+from typing import List, Mapping
 
 # external imports
 from cic_types.models.person import get_contact_data_from_vcard
-from tinydb.table import Document
 
 # local imports
 from cic_ussd.menu.ussd_menu import UssdMenu
@@ -67,7 +66,7 @@ def parse_person_metadata(cached_metadata: str, display_key: str, preferred_lang
     )
 
 
-def resume_last_ussd_session(last_state: str) -> Document:
+def resume_last_ussd_session(last_state: str) -> Mapping:
     """
     :param last_state:
     :type last_state:
@@ -0,0 +1,79 @@
+"""
+This module is responsible for debouncing the background refreshes of account data that are requested as a user
+navigates the ussd menu.
+"""
+# standard imports
+import logging
+
+# external imports
+
+# local imports
+from cic_ussd.cache import Cache
+
+logg = logging.getLogger(__name__)
+
+# claims a refresh for the length of its window and counts claimed refreshes as enqueued, the rest as suppressed.
+CLAIM_REFRESH = """
+local claimed = redis.call('SET', KEYS[1], 1, 'EX', ARGV[1], 'NX')
+if claimed then
+    redis.call('HINCRBY', KEYS[2], ARGV[2] .. ':enqueued', 1)
+    return 1
+end
+redis.call('HINCRBY', KEYS[2], ARGV[2] .. ':suppressed', 1)
+return 0
+"""
+
+
+class RefreshScheduler:
+    """This class describes the debounce windows for refreshes of each resource. A refresh of a resource for an
+    identifier is only enqueued if no refresh of it was enqueued within the resource's window by any process.
+    :cvar resources: Names of the resources whose refreshes are debounced.
+    :type resources: tuple
+    :cvar windows: Debounce windows in seconds by resource, a resource without a window is always refreshed.
+    :type windows: dict
+    """
+    resources = (
+        'balances',
+        'person_metadata',
+        'preferences_metadata',
+        'sink_address_balances',
+        'statement',
+        'token_balances'
+    )
+    stats_key = 'refresh:stats'
+    windows: dict = {}
+    _claim = None
+
+    @classmethod
+    def claim(cls, resource: str, identifier: str) -> bool:
+        """This function checks whether a refresh of a resource should be enqueued and records the outcome.
+        :param resource: The name of the resource to refresh.
+        :type resource: str
+        :param identifier: The identifier of the instance of the resource to refresh e.g. a blockchain address.
+        :type identifier: str
+        :return: Whether the refresh should be enqueued.
+        :rtype: bool
+        """
+        window = cls.windows.get(resource)
+        if not window:
+            return True
+        if cls._claim is None or cls._claim.registered_client is not Cache.store:
+            cls._claim = Cache.store.register_script(CLAIM_REFRESH)
+        claimed = bool(cls._claim(keys=[f'refresh:{resource}:{identifier}', cls.stats_key], args=[window, resource]))
+        if not claimed:
+            logg.debug(f'Suppressed refresh of: {resource} for: {identifier}, refreshed within the last {window}s.')
+        return claimed
+
+    @classmethod
+    def stats(cls) -> dict:
+        """This function returns the number of refreshes enqueued and suppressed by resource across all processes.
+        :return: A dict of enqueued and suppressed counts keyed by resource.
+        :rtype: dict
+        """
+        counts = Cache.store.hgetall(cls.stats_key)
+        return {
+            resource: {
+                'enqueued': int(counts.get(f'{resource}:enqueued', 0)),
+                'suppressed': int(counts.get(f'{resource}:suppressed', 0))
+            } for resource in cls.resources
+        }
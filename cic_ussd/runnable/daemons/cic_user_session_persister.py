@@ -0,0 +1,76 @@
+"""This module writes cached ussd sessions marked dirty by the ussd server behind to the database in batches."""
+
+# standard imports
+import argparse
+import logging
+import os
+import signal
+import threading
+
+# third party imports
+import redis
+from confini import Config
+
+# local imports
+from cic_ussd.cache import Cache
+from cic_ussd.db import dsn_from_config
+from cic_ussd.db.models.base import SessionBase
+from cic_ussd.session.persister import SessionPersister
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+config_directory = '/usr/local/etc/cic-ussd/'
+
+# define arguments
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument('-c', type=str, default=config_directory, help='config directory.')
+arg_parser.add_argument('-v', action='store_true', help='be verbose')
+arg_parser.add_argument('-vv', action='store_true', help='be more verbose')
+arg_parser.add_argument('--env-prefix', default=os.environ.get('CONFINI_ENV_PREFIX'), dest='env_prefix', type=str,
+                        help='environment prefix for variables to overwrite configuration')
+args = arg_parser.parse_args()
+
+# define log levels
+if args.vv:
+    logging.getLogger().setLevel(logging.DEBUG)
+elif args.v:
+    logging.getLogger().setLevel(logging.INFO)
+
+# parse config
+config = Config(args.c, args.env_prefix)
+config.process()
+config.censor('PASSWORD', 'DATABASE')
+logg.debug(f'config loaded from {args.c}:\n{config}')
+
+# connect to database
+data_source_name = dsn_from_config(config)
+SessionBase.connect(data_source_name, pool_size=int(config.get('DATABASE_POOL_SIZE')),
+                    debug=config.true('DATABASE_DEBUG'))
+
+# define universal redis cache access
+Cache.store = redis.StrictRedis(host=config.get('REDIS_HOST'),
+                                port=config.get('REDIS_PORT'),
+                                password=config.get('REDIS_PASSWORD'),
+                                db=config.get('REDIS_DATABASE'),
+                                decode_responses=True)
+
+# define write-behind batches
+SessionPersister.batch_size = int(config.get('SESSION_BATCH_SIZE'))
+SessionPersister.expiry = int(config.get('SESSION_EXPIRY'))
+SessionPersister.interval = float(config.get('SESSION_FLUSH_INTERVAL'))
+
+
+def main():
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    logg.info(f'Persisting up to: {SessionPersister.batch_size} sessions every: {SessionPersister.interval} second(s).')
+    SessionPersister.run(stop)
+    # sessions marked dirty while stopping are persisted before exiting.
+    while SessionPersister.flush():
+        pass
+
+
+if __name__ == '__main__':
+    main()
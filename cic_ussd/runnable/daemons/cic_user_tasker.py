@@ -15,13 +15,14 @@ from cic_types.ext.metadata.signer import Signer
 
 # local imports
 from cic_ussd.account.chain import Chain
-from cic_ussd.cache import Cache
+from cic_ussd.cache import Cache, configure_cache
 from cic_ussd.db import dsn_from_config
 from cic_ussd.db.models.base import SessionBase
+from cic_ussd.http.requests import HttpClient
 from cic_ussd.phone_number import E164Format, Support, OfficeSender
 from cic_ussd.session.ussd_session import UssdSession as InMemoryUssdSession
 from cic_ussd.state_machine.logic.manager import States
-from cic_ussd.translation import generate_locale_files
+from cic_ussd.translation import Translations
 from cic_ussd.time import TimezoneHandler
 from cic_ussd.validator import validate_presence
 from cic_ussd.worker import Worker
@@ -74,6 +75,12 @@ Cache.store = redis.StrictRedis(host=config.get('REDIS_HOST'),
                                 decode_responses=True)
 InMemoryUssdSession.store = Cache.store
 
+# define retention policies, payload format and in-process caching of cached data
+configure_cache(config)
+
+# define the pooled http connections to cic-meta and other services
+HttpClient.configure(config)
+
 # define metadata URL
 Metadata.base_url = config.get('CIC_META_URL')
 
@@ -88,13 +95,12 @@ if key_file_path:
     validate_presence(path=key_file_path)
 Signer.key_file_path = key_file_path
 
-generate_locale_files(locale_dir=config.get('LOCALE_PATH'),
-                      schema_file_path=config.get('SCHEMA_FILE_PATH'),
-                      translation_builder_path=config.get('LOCALE_FILE_BUILDERS'))
-
 # set up translations
 i18n.load_path.append(config.get('LOCALE_PATH'))
 i18n.set('fallback', config.get('LOCALE_FALLBACK'))
+Translations.build(locale_dir=config.get('LOCALE_PATH'),
+                   schema_file_path=config.get('SCHEMA_FILE_PATH'),
+                   translation_builder_path=config.get('LOCALE_FILE_BUILDERS'))
 
 chain_spec = ChainSpec.from_chain_str(config.get('CHAIN_SPEC'))
 Chain.spec = chain_spec
@@ -0,0 +1,81 @@
+"""This module handles requests originating from the ussd service provider over asgi. Requests are read and responded
+to on the event loop while the menu is processed in a bounded pool of threads, so that a worker keeps accepting
+requests while others wait on redis, the database, celery or pin hashing.
+"""
+
+# standard imports
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+# external imports
+import uvicorn
+
+# local imports
+from cic_ussd.runnable.server_base import exportable_parser
+
+exportable_parser.add_argument('--host', type=str, default='0.0.0.0', help='address to listen on')
+exportable_parser.add_argument('--port', type=int, default=9000, help='port to listen on')
+exportable_parser.add_argument('--max-threads',
+                               dest='max_threads',
+                               type=int,
+                               default=32,
+                               help='maximum number of requests processed concurrently')
+
+# the wsgi server module parses the arguments and sets up the application on import.
+from cic_ussd.runnable.daemons.cic_user_ussd_server import args, handle_request, logg
+
+executor = ThreadPoolExecutor(max_workers=args.max_threads, thread_name_prefix='ussd')
+
+
+async def read_body(receive) -> bytes:
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+async def application(scope, receive, send):
+    """Handles asgi http requests to the same effect and with the same responses as the wsgi application.
+    :param scope: Object containing server and request information
+    :type scope: dict
+    :param receive: Awaitable returning request body messages.
+    :type receive: Callable
+    :param send: Awaitable sending response messages.
+    :type send: Callable
+    """
+    if scope.get('type') == 'lifespan':
+        while (message := await receive()).get('type') != 'lifespan.shutdown':
+            await send({'type': 'lifespan.startup.complete'})
+        executor.shutdown(wait=True)
+        await send({'type': 'lifespan.shutdown.complete'})
+        return
+
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+    body = await read_body(receive)
+    status, response_headers, response_body = await asyncio.get_running_loop().run_in_executor(
+        executor,
+        handle_request,
+        scope.get('method').upper(),
+        scope.get('path'),
+        headers.get('content-type'),
+        io.BytesIO(body))
+
+    await send({
+        'type': 'http.response.start',
+        'status': int(status.split(' ', 1)[0]),
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response_headers]
+    })
+    await send({'type': 'http.response.body', 'body': b''.join(response_body)})
+
+
+def main():
+    logg.info(f'Serving on: {args.host}:{args.port} processing up to: {args.max_threads} requests at a time.')
+    uvicorn.run(application, host=args.host, port=args.port, lifespan='on', log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
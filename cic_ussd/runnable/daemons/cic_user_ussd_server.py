@@ -4,6 +4,7 @@
 # standard imports
 import json
 import logging
+from typing import Tuple
 
 # external imports
 import celery
@@ -19,22 +20,26 @@ from confini import Config
 from cic_ussd.account.chain import Chain
 from cic_ussd.account.guardianship import Guardianship
 from cic_ussd.account.tokens import query_default_token
-from cic_ussd.cache import cache_data, cache_data_key, Cache
+from cic_ussd.cache import cache_data, cache_data_key, configure_cache, Cache
 from cic_ussd.db import dsn_from_config
 from cic_ussd.db.models.base import SessionBase
+from cic_ussd.encoder import PinHasher
 from cic_ussd.error import InitializationError
 from cic_ussd.files.local_files import create_local_file_data_stores, json_file_parser
-from cic_ussd.http.requests import get_request_endpoint, get_request_method
+from cic_ussd.http.requests import get_request_endpoint, get_request_method, HttpClient
 from cic_ussd.http.responses import with_content_headers
 from cic_ussd.menu.ussd_menu import UssdMenu
 from cic_ussd.phone_number import Support, E164Format, OfficeSender
+from cic_ussd.processor.menu import MenuRenderer
 from cic_ussd.processor.ussd import handle_menu_operations
+from cic_ussd.refresh import RefreshScheduler
 from cic_ussd.runnable.server_base import exportable_parser, logg
+from cic_ussd.session.persister import SessionPersister
 from cic_ussd.session.ussd_session import UssdSession as InMemoryUssdSession
-from cic_ussd.state_machine import UssdStateMachine
+from cic_ussd.state_machine import UssdStateGraph, UssdStateMachine
 from cic_ussd.state_machine.logic.manager import States
 from cic_ussd.time import TimezoneHandler
-from cic_ussd.translation import generate_locale_files, Languages, translation_for
+from cic_ussd.translation import Languages, translation_for, Translations
 from cic_ussd.validator import validate_presence
 from cic_ussd.worker import Worker
 
@@ -71,6 +76,22 @@ Cache.store = redis.StrictRedis(host=config.get('REDIS_HOST'),
                                 decode_responses=True)
 InMemoryUssdSession.store = Cache.store
 
+# mark sessions dirty for the session persister instead of queueing a task to persist each
+SessionPersister.enabled = config.true('SESSION_WRITE_BEHIND')
+
+# define retention policies, payload format and in-process caching of cached data
+configure_cache(config)
+
+# define the pooled http connections to cic-meta and other services
+HttpClient.configure(config)
+
+# define the cost of hashing pins and the number of pins hashed at a time
+PinHasher.configure(config)
+
+# define debounce windows for background refreshes
+RefreshScheduler.windows = {
+    resource: int(config.get(f'REFRESH_{resource.upper()}') or 0) for resource in RefreshScheduler.resources}
+
 # define metadata URL
 Metadata.base_url = config.get('CIC_META_URL')
 
@@ -102,6 +123,13 @@ Chain.rpc_provider = config.get('RPC_PROVIDER')
 UssdStateMachine.states = states
 UssdStateMachine.transitions = transitions
 
+# compile the state graph once so requests only evaluate transitions out of their current state
+UssdStateGraph.compile(states, transitions)
+
+# index ussd menus by name and check that every state has a menu
+UssdMenu.load_registry(states)
+MenuRenderer.load(UssdMenu.registry)
+
 # retrieve default token data
 chain_str = Chain.spec.__str__()
 if not (default_token_data := query_default_token(chain_str)):
@@ -117,13 +145,12 @@ Support.phone_number = config.get('OFFICE_SUPPORT_PHONE')
 validate_presence(config.get('SYSTEM_GUARDIANS_FILE'))
 Guardianship.load_system_guardians(config.get('SYSTEM_GUARDIANS_FILE'))
 
-generate_locale_files(locale_dir=config.get('LOCALE_PATH'),
-                      schema_file_path=config.get('SCHEMA_FILE_PATH'),
-                      translation_builder_path=config.get('LOCALE_FILE_BUILDERS'))
-
 # set up translations
 i18n.load_path.append(config.get('LOCALE_PATH'))
 i18n.set('fallback', config.get('LOCALE_FALLBACK'))
+Translations.build(locale_dir=config.get('LOCALE_PATH'),
+                   schema_file_path=config.get('SCHEMA_FILE_PATH'),
+                   translation_builder_path=config.get('LOCALE_FILE_BUILDERS'))
 
 validate_presence(config.get('LANGUAGES_FILE'))
 Languages.load_languages_dict(config.get('LANGUAGES_FILE'))
@@ -136,14 +163,18 @@ Worker.queue_name = config.get('CELERY_QUEUE_NAME')
 logg.debug(f"Celery queue name is: {Worker.queue_name}")
 
 
-def application(env, start_response):
-    """Loads python code for application to be accessible over web server
-    :param env: Object containing server and request information
-    :type env: dict
-    :param start_response: Callable to define responses.
-    :type start_response: any
-    :return: a list containing a bytes representation of the response object
-    :rtype: list
+def handle_request(request_method: str, request_endpoint: str, content_type: str, request_body) -> Tuple[str, list, list]:
+    """This function handles a request independently of the server interface it was received through.
+    :param request_method: The http method of the request.
+    :type request_method: str
+    :param request_endpoint: The path the request was sent to.
+    :type request_endpoint: str
+    :param content_type: The content type of the request body.
+    :type content_type: str
+    :param request_body: A file-like object to read the request body from.
+    :type request_body: any
+    :return: A tuple containing the response status, a list of tuples defining headers and the response body chunks
+    :rtype: tuple
     """
     # define headers
     errors_headers = [('Content-Type', 'text/plain'), ('Content-Length', '0')]
@@ -152,17 +183,16 @@ def application(env, start_response):
     # create session for the life-time of http request
     session = SessionBase.create_session()
 
-    if get_request_endpoint(env) == '/health-check':
+    if request_endpoint == '/health-check':
         session.close()
-        start_response('200 OK', headers)
-        return [b'healthy']
+        return '200 OK', headers, [b'healthy']
 
-    elif get_request_method(env=env) == 'POST' and get_request_endpoint(env=env) == '/':
+    elif request_method == 'POST' and request_endpoint == '/':
 
-        if env.get("CONTENT_TYPE") != 'application/json':
-            return system_error(session, start_response, '400 Malformed', errors_headers)
+        if content_type != 'application/json':
+            return system_error(session, '400 Malformed', errors_headers)
 
-        post_data = json.load(env.get('wsgi.input'))
+        post_data = json.load(request_body)
         logg.debug(f"Received request with data of the form: {post_data}")
         service_code = post_data.get("ussd_code")
         phone_number = post_data.get("msisdn")
@@ -176,10 +206,9 @@ def application(env, start_response):
                 valid_service_code=valid_service_codes[0]
             )
             response_bytes, headers = with_content_headers(headers, response)
-            start_response('200 OK', headers)
-            return [response_bytes]
+            return '200 OK', headers, [response_bytes]
 
-        logg.debug('session {} started for {}'.format(external_session_id, phone_number))
+        logg.debug('session {} started for {}'.format(external_session_id, phone_number))
         logg.debug(f"Attempting to handle request for {phone_number}")
 
         try:
@@ -190,23 +219,36 @@ def application(env, start_response):
                                               session,
                                               user_input)
             response_bytes, headers = with_content_headers(headers, response)
-            start_response('200 OK,', headers)
             session.commit()
             session.close()
-            return [response_bytes]
+            return '200 OK,', headers, [response_bytes]
         except Exception as e:
             logg.error(f"Error occurred while handling request: {e}")
             session.rollback()
-            return system_error(session, start_response, '500 Internal Server Error', errors_headers)
+            return system_error(session, '500 Internal Server Error', errors_headers)
 
     else:
-        logg.error(f'invalid query {env}')
-        for r in env:
-            logg.debug(f'{r}: {env}')
-        return system_error(session, start_response, '405 Play by the rules', errors_headers)
+        logg.error(f'invalid query {request_method} {request_endpoint}')
+        return system_error(session, '405 Play by the rules', errors_headers)
+
+
+def application(env, start_response):
+    """Loads python code for application to be accessible over web server
+    :param env: Object containing server and request information
+    :type env: dict
+    :param start_response: Callable to define responses.
+    :type start_response: any
+    :return: a list containing a bytes representation of the response object
+    :rtype: list
+    """
+    status, headers, body = handle_request(get_request_method(env=env),
+                                           get_request_endpoint(env=env),
+                                           env.get('CONTENT_TYPE'),
+                                           env.get('wsgi.input'))
+    start_response(status, headers)
+    return body
 
 
-def system_error(session, start_response, arg2, errors_headers):
+def system_error(session, arg2, errors_headers):
     session.close()
-    start_response(arg2, errors_headers)
-    return []
+    return arg2, errors_headers, []
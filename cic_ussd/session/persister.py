@@ -0,0 +1,147 @@
+"""
+This module is responsible for writing cached ussd sessions behind to the database. Sessions written to the cache are
+marked dirty in a redis set, the persister drains the set in batches and upserts each batch in a single statement.
+"""
+# standard imports
+import datetime
+import logging
+import threading
+from typing import Optional
+
+# external imports
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.orm.session import Session
+
+# local imports
+from cic_ussd.cache import Cache
+from cic_ussd.codec import binary_client, Codec
+from cic_ussd.db.models.base import SessionBase
+
+logg = logging.getLogger(__name__)
+
+# only replaces a persisted session with a newer version of it.
+UPSERT_SESSIONS = text("""
+INSERT INTO ussd_session (created, updated, data, external_session_id, msisdn, service_code, state, user_input, version)
+VALUES (:created, :updated, :data, :external_session_id, :msisdn, :service_code, :state, :user_input, :version)
+ON CONFLICT (external_session_id) DO UPDATE SET
+    updated = excluded.updated,
+    data = excluded.data,
+    state = excluded.state,
+    user_input = excluded.user_input,
+    version = excluded.version
+WHERE ussd_session.version < excluded.version
+""").bindparams(bindparam('data', type_=JSON))
+
+# clears the dirty mark of each persisted session and starts its expiry, unless the session was written to the cache again
+# after it was read for persisting, in which case it stays dirty for the next batch. sessions that expired before they
+# were read are passed as an empty payload and only have their dirty mark cleared.
+CLEAR_PERSISTED_SESSIONS = """
+for index, key in ipairs(KEYS) do
+    local persisted_session = ARGV[index + 2]
+    if (redis.call('GET', key) or '') == persisted_session then
+        redis.call('SREM', ARGV[1], key)
+        if persisted_session ~= '' then
+            redis.call('EXPIRE', key, ARGV[2])
+        end
+    end
+end
+return 1
+"""
+
+
+class SessionPersister:
+    """This class describes the write-behind persistence of cached ussd sessions to the database.
+    :cvar batch_size: The maximum number of sessions upserted in a single statement.
+    :type batch_size: int
+    :cvar dirty_key: The redis set holding the ids of sessions written to the cache since they were last persisted.
+    :type dirty_key: str
+    :cvar enabled: Whether sessions are written behind, otherwise a task is queued to persist each session.
+    :type enabled: bool
+    :cvar expiry: The number of seconds a persisted session is kept in the cache.
+    :type expiry: int
+    :cvar interval: The number of seconds between flushes.
+    :type interval: float
+    """
+    batch_size: int = 500
+    dirty_key: str = 'ussd:session:dirty'
+    enabled: bool = False
+    expiry: int = 60
+    interval: float = 1.0
+    _clear_persisted = None
+
+    @classmethod
+    def mark_dirty(cls, external_session_id: str):
+        """This function marks a cached session as needing to be persisted.
+        :param external_session_id: The Africa's Talking session ID.
+        :type external_session_id: str
+        """
+        Cache.store.sadd(cls.dirty_key, external_session_id)
+
+    @classmethod
+    def clear_persisted(cls):
+        store = binary_client(Cache.store)
+        if cls._clear_persisted is None or cls._clear_persisted.registered_client is not store:
+            SessionPersister._clear_persisted = store.register_script(CLEAR_PERSISTED_SESSIONS)
+        return cls._clear_persisted
+
+    @classmethod
+    def flush(cls, session: Optional[Session] = None) -> int:
+        """This function persists a batch of dirty sessions. The batch stays marked dirty until it has been written, so
+        that a batch that cannot be written, or is interrupted before it is, is persisted again.
+        :param session: Database session object.
+        :type session: Session
+        :return: The number of sessions read from the dirty set.
+        :rtype: int
+        """
+        external_session_ids = Cache.store.srandmember(cls.dirty_key, cls.batch_size)
+        if not external_session_ids:
+            return 0
+        cached_ussd_sessions = binary_client(Cache.store).mget(external_session_ids)
+        now = datetime.datetime.utcnow()
+        rows = []
+        for external_session_id, cached_ussd_session in zip(external_session_ids, cached_ussd_sessions):
+            if not (cached_ussd_session := Codec.decode(cached_ussd_session)):
+                logg.warning(f'Dirty session: {external_session_id} expired before it was persisted.')
+                continue
+            rows.append({
+                'created': now,
+                'updated': now,
+                'data': cached_ussd_session.get('data'),
+                'external_session_id': external_session_id,
+                'msisdn': cached_ussd_session.get('msisdn'),
+                'service_code': cached_ussd_session.get('service_code'),
+                'state': cached_ussd_session.get('state'),
+                'user_input': cached_ussd_session.get('user_input'),
+                'version': cached_ussd_session.get('version')
+            })
+
+        session = SessionBase.bind_session(session=session)
+        try:
+            if rows:
+                session.execute(UPSERT_SESSIONS, rows)
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            SessionBase.release_session(session=session)
+
+        cls.clear_persisted()(keys=external_session_ids,
+                              args=[cls.dirty_key, cls.expiry, *(payload or b'' for payload in cached_ussd_sessions)])
+        logg.debug(f'Persisted: {len(rows)} of: {len(external_session_ids)} dirty sessions.')
+        return len(external_session_ids)
+
+    @classmethod
+    def run(cls, stop: threading.Event):
+        """This function flushes dirty sessions until stopped, a backlog is drained without waiting between batches.
+        :param stop: An event that ends the loop once set.
+        :type stop: threading.Event
+        """
+        while not stop.is_set():
+            try:
+                if cls.flush() >= cls.batch_size:
+                    continue
+            except Exception as error:
+                logg.error(f'Failed to persist dirty sessions: {error}')
+            stop.wait(cls.interval)
@@ -1,5 +1,4 @@
 # standard imports
-import json
 import logging
 from typing import Optional
 
@@ -9,10 +8,42 @@ from redis import Redis
 from sqlalchemy.orm.session import Session
 
 # local imports
-from cic_ussd.cache import get_cached_data
+from cic_ussd.codec import binary_client, Codec, MSGPACK_TAG
+from cic_ussd.error import SessionVersionConflictError
+from cic_ussd.session.persister import SessionPersister
 
 logg = logging.getLogger(__file__)
 
+# replaces the cached session only if its version still matches the one the write is based on, otherwise returns the
+# newer cached session so that the writer can merge onto it. sessions serialized as msgpack are never compressed so that
+# they can be unpacked here. successful writes are published to the session's notification channel.
+COMPARE_AND_SET_SESSION = """
+local cached_session = redis.call('GET', KEYS[1])
+local version = 0
+if cached_session and string.byte(cached_session, 1) == tonumber(ARGV[4]) then
+    version = tonumber(cmsgpack.unpack(string.sub(cached_session, 2))['version']) or 0
+elseif cached_session then
+    version = tonumber(cjson.decode(cached_session)['version']) or 0
+end
+if version ~= tonumber(ARGV[1]) then
+    return {0, cached_session or ''}
+end
+redis.call('SET', KEYS[1], ARGV[2])
+redis.call('PUBLISH', ARGV[3], version + 1)
+return {1}
+"""
+
+
+def session_notification_channel(external_session_id: str) -> str:
+    """This function returns the channel a notification is published to whenever a cached ussd session is written.
+    :param external_session_id: The Africa's Talking session ID.
+    :type external_session_id: str
+    :return: The name of the notification channel.
+    :rtype: str
+    """
+    return f'session:{external_session_id}'
+
+
 
 class UssdSession:
     """
@@ -21,6 +52,8 @@ class UssdSession:
     :type store: Redis
     """
     store: Redis = None
+    max_conflict_retries: int = 3
+    _compare_and_set = None
 
     def __init__(self,
                  external_session_id: str,
@@ -28,7 +61,8 @@ class UssdSession:
                  service_code: str,
                  state: str,
                  user_input: str,
-                 data: Optional[dict] = None):
+                 data: Optional[dict] = None,
+                 base: Optional[dict] = None):
         """
         This function is called whenever a USSD session object is created and saves the instance to a JSON DB.
         :param external_session_id: The Africa's Talking session ID.
@@ -43,6 +77,8 @@ class UssdSession:
         :type state: str.
         :param data: Any additional data that was persisted during the user's interaction with the system.
         :type data: dict.
+        :param base: The cached session this write is based on, a new session is assumed if absent.
+        :type base: dict.
         """
         self.data = data
         self.external_session_id = external_session_id
@@ -50,24 +86,46 @@ class UssdSession:
         self.service_code = service_code
         self.state = state
         self.user_input = user_input
+        base = base or {}
+        self.save(base_version=base.get('version') or 0, base_data=base.get('data') or {})
 
-        if session := self.store.get(external_session_id):
-            session = json.loads(session)
-            self.version = session.get('version') + 1
-        else:
-            self.version = 1
-
-        self.session = {
-            'data': self.data,
-            'external_session_id': self.external_session_id,
-            'msisdn': self.msisdn,
-            'service_code': self.service_code,
-            'state': self.state,
-            'user_input': self.user_input,
-            'version': self.version
-        }
-        self.store.set(self.external_session_id, json.dumps(self.session))
-        self.store.persist(self.external_session_id)
+    def save(self, base_version: int, base_data: dict):
+        """This function writes the session to the cache in a single round trip provided no other write has happened
+        since the base version. On conflict the changes made relative to the base data are merged onto the newer cached
+        session and the write is retried.
+        :param base_version: The version of the cached session this write is based on, 0 for a new session.
+        :type base_version: int
+        :param base_data: The session data of the cached session this write is based on.
+        :type base_data: dict
+        :raises SessionVersionConflictError: If the session could not be written within the retry limit.
+        """
+        for _ in range(self.max_conflict_retries + 1):
+            self.version = base_version + 1
+            self.session = self.to_json()
+            result = self.compare_and_set(keys=[self.external_session_id],
+                                         args=[base_version,
+                                               Codec.encode(self.session, compress=False),
+                                               session_notification_channel(self.external_session_id),
+                                               MSGPACK_TAG])
+            if result[0]:
+                return
+            cached_session = Codec.decode(result[1]) or {}
+            cached_data = cached_session.get('data')
+            changes = {key: value for key, value in (self.data or {}).items() if base_data.get(key) != value}
+            logg.debug(f'Session: {self.external_session_id} changed from version: {base_version}, merging: {changes}.')
+            if cached_data is not None or self.data is not None:
+                self.data = {**(cached_data or {}), **changes}
+            base_version = cached_session.get('version') or 0
+            base_data = cached_data or {}
+        raise SessionVersionConflictError(
+            f'Session: {self.external_session_id} could not be saved after {self.max_conflict_retries} retries.')
+
+    @property
+    def compare_and_set(self):
+        store = binary_client(self.store)
+        if self._compare_and_set is None or self._compare_and_set.registered_client is not store:
+            UssdSession._compare_and_set = store.register_script(COMPARE_AND_SET_SESSION)
+        return self._compare_and_set
 
     def set_data(self, key: str, value: str) -> None:
         """
@@ -77,10 +135,11 @@ class UssdSession:
         :param value: The actual data to be stored in the session data.
         :type value: str.
         """
+        base_data = dict(self.data or {})
         if self.data is None:
             self.data = {}
         self.data[key] = value
-        self.store.set(self.external_session_id, json.dumps(self.session))
+        self.save(base_version=self.version, base_data=base_data)
 
     def get_data(self, key: str) -> Optional[str]:
         """
@@ -155,7 +214,8 @@ def update_ussd_session(ussd_session: dict,
         user_input=user_input,
         state=state,
         service_code=ussd_session.get("service_code"),
-        data=updated_data
+        data=updated_data,
+        base=ussd_session
     )
 
 
@@ -165,7 +225,8 @@ def create_or_update_session(external_session_id: str,
                              user_input: str,
                              state: str,
                              session,
-                             data: Optional[dict] = None) -> UssdSession:
+                             data: Optional[dict] = None,
+                             ussd_session: Optional[dict] = None) -> UssdSession:
     """
     :param external_session_id:
     :type external_session_id:
@@ -181,10 +242,12 @@ def create_or_update_session(external_session_id: str,
     :type session:
     :param data:
     :type data:
+    :param ussd_session: The cached ussd session already read by the caller, if any.
+    :type ussd_session: dict
     :return:
     :rtype:
     """
-    if not (existing_ussd_session := get_cached_data(external_session_id)):
+    if not ussd_session:
         return create_ussd_session(external_session_id=external_session_id,
                                    msisdn=msisdn,
                                    service_code=service_code,
@@ -192,8 +255,7 @@ def create_or_update_session(external_session_id: str,
                                    state=state,
                                    data=data
                                    )
-    existing_ussd_session = json.loads(existing_ussd_session)
-    return update_ussd_session(ussd_session=existing_ussd_session,
+    return update_ussd_session(ussd_session=ussd_session,
                                state=state,
                                user_input=user_input,
                                data=data)
@@ -201,12 +263,15 @@ def create_or_update_session(external_session_id: str,
 
 def persist_ussd_session(external_session_id: str, queue: Optional[str]):
     """This function asynchronously retrieves a cached ussd session object matching an external ussd session id and adds
-    it to persistent storage.
+    it to persistent storage. With write-behind persistence the session is only marked dirty for the session persister.
     :param external_session_id: Session id value provided by ussd service provided.
     :type external_session_id: str
     :param queue:  Name of worker queue to submit tasks to.
     :type queue: str
     """
+    if SessionPersister.enabled:
+        SessionPersister.mark_dirty(external_session_id)
+        return
     s_persist_ussd_session = celery.signature(
         'cic_ussd.tasks.ussd_session.persist_session_to_db',
         [external_session_id],
@@ -228,21 +293,10 @@ def save_session_data(queue: Optional[str], session: Session, data: dict, ussd_s
     :type ussd_session: UssdSession
     """
     logg.debug(f'Saving: {data} session data to: {ussd_session}')
-    external_session_id = ussd_session.get('external_session_id')
-    if existing_session_data := ussd_session.get('data'):
-        # replace session data entry
-        keys = data.keys()
-        for key in keys:
-            existing_session_data[key] = data[key]
-        data = existing_session_data
-    in_redis_ussd_session = get_cached_data(external_session_id)
-    in_redis_ussd_session = json.loads(in_redis_ussd_session)
-    create_or_update_session(
-        external_session_id=external_session_id,
-        msisdn=in_redis_ussd_session.get('msisdn'),
-        service_code=in_redis_ussd_session.get('service_code'),
-        user_input=in_redis_ussd_session.get('user_input'),
-        state=in_redis_ussd_session.get('state'),
-        session=session,
-        data=data
-    )
+    in_redis_ussd_session = update_ussd_session(ussd_session=ussd_session,
+                                                user_input=ussd_session.get('user_input'),
+                                                state=ussd_session.get('state'),
+                                                data=data)
+    # keep the caller's copy current so later writes in the same request build on this version.
+    ussd_session['data'] = in_redis_ussd_session.data
+    ussd_session['version'] = in_redis_ussd_session.version
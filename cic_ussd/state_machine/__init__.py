@@ -1 +1,2 @@
+from .graph import UssdStateGraph
 from .state_machine import UssdStateMachine
@@ -0,0 +1,136 @@
+# standard imports
+import logging
+from importlib import import_module
+from typing import Callable, List, Optional, Tuple
+
+# external imports
+from transitions import MachineError
+
+# local imports
+
+logg = logging.getLogger(__name__)
+
+
+def resolve_callable(path: str) -> Callable:
+    """This function resolves a dotted path as defined in the transitions files into the callable it names.
+    :param path: Dotted path to a callable e.g. cic_ussd.state_machine.logic.menu.menu_one_selected
+    :type path: str
+    :raises AttributeError: If the path does not resolve to an importable callable.
+    :return: The callable the path points to.
+    :rtype: Callable
+    """
+    try:
+        module_path, name = path.rsplit('.', 1)
+        return getattr(import_module(module_path), name)
+    except (ImportError, AttributeError, ValueError):
+        raise AttributeError(f'Callable with name: {path} could not be imported from a module.')
+
+
+def _callables(paths) -> List[Callable]:
+    if paths is None:
+        return []
+    if not isinstance(paths, (list, tuple)):
+        paths = [paths]
+    return [resolve_callable(path) for path in paths]
+
+
+class CompiledTransition:
+    """This class describes a single transition out of a source state with all of its callbacks already resolved.
+    :ivar conditions: Ordered pairs of condition callables and the value each must return for the transition to pass.
+    :type conditions: list
+    """
+
+    def __init__(self, source: str, dest: Optional[str], transition: dict):
+        self.source = source
+        self.dest = dest
+        self.prepare = _callables(transition.get('prepare'))
+        self.conditions: List[Tuple[Callable, bool]] = [
+            (condition, True) for condition in _callables(transition.get('conditions'))]
+        self.conditions += [(condition, False) for condition in _callables(transition.get('unless'))]
+        self.before = _callables(transition.get('before'))
+        self.after = _callables(transition.get('after'))
+
+    def passes(self, state_machine_data: tuple) -> bool:
+        for prepare in self.prepare:
+            prepare(state_machine_data)
+        for condition, target in self.conditions:
+            if condition(state_machine_data) != target:
+                logg.debug(f'Transition condition failed: {condition.__name__}() does not return {target}.')
+                return False
+        return True
+
+    def __repr__(self):
+        return f'<CompiledTransition: {self.source} -> {self.dest}>'
+
+
+class UssdStateGraph:
+    """This class describes the ussd menu's state graph compiled once from the states and transitions files. It maps
+    each source state to its ordered list of candidate transitions so that navigating from a state only evaluates the
+    transitions leaving it, with the same semantics the transitions library's Machine applies.
+    :cvar states: Names of all registered states.
+    :type states: set
+    :cvar transition_table: Ordered candidate transitions keyed by source state.
+    :type transition_table: dict
+    """
+    states: set = None
+    transition_table: dict = None
+    trigger = 'scan_data'
+
+    @classmethod
+    def compile(cls, states: list, transitions: list):
+        """This function builds the transition table from the parsed states and transitions files.
+        :param states: A list of state names.
+        :type states: list
+        :param transitions: A list of transitions as defined in the transitions files.
+        :type transitions: list
+        """
+        compiled_states = set(states)
+        transition_table = {}
+        for transition in transitions:
+            if transition.get('trigger') != cls.trigger:
+                continue
+            sources = transition.get('source')
+            if sources == '*':
+                sources = list(compiled_states)
+            elif not isinstance(sources, list):
+                sources = [sources]
+            for source in sources:
+                dest = transition.get('dest')
+                if dest == '=':
+                    dest = source
+                compiled_transition = CompiledTransition(source, dest, transition)
+                transition_table.setdefault(source, []).append(compiled_transition)
+        cls.states = compiled_states
+        cls.transition_table = transition_table
+        logg.debug(f'Compiled {len(transitions)} transitions across {len(transition_table)} source states.')
+
+    @classmethod
+    def next_state(cls, state: str, state_machine_data: tuple) -> str:
+        """This function evaluates the transitions leaving a state in order and fires the first one whose conditions
+        pass.
+        :param state: The name of the current state.
+        :type state: str
+        :param state_machine_data: A tuple containing user input, a ussd session, user object and db session.
+        :type state_machine_data: tuple
+        :raises MachineError: If no transitions leave the current state.
+        :raises ValueError: If the transition fired leads to a state that is not registered.
+        :return: The name of the resulting state.
+        :rtype: str
+        """
+        candidates = cls.transition_table.get(state)
+        if not candidates:
+            raise MachineError(f"Can't trigger event {cls.trigger} from state {state}!")
+
+        for transition in candidates:
+            if not transition.passes(state_machine_data):
+                continue
+            for before in transition.before:
+                before(state_machine_data)
+            if transition.dest is not None:
+                if transition.dest not in cls.states and transition.dest != state:
+                    raise ValueError(f"State '{transition.dest}' is not a registered state.")
+                state = transition.dest
+            for after in transition.after:
+                after(state_machine_data)
+            return state
+        return state
@@ -14,6 +14,7 @@ from cic_ussd.account.chain import Chain
 from cic_ussd.account.maps import gender, twenty_thousand_band, thirty_five_thousand_band, above_thirty_five_thousand_band
 from cic_ussd.account.metadata import get_cached_preferred_language, UssdMetadataPointer
 from cic_ussd.cache import cache_data_key, get_cached_data
+from cic_ussd.context import memoized
 from cic_ussd.db.models.account import Account, create
 from cic_ussd.db.models.survey_response import SurveyResponse
 from cic_ussd.db.models.base import SessionBase
@@ -56,7 +57,7 @@ def parse_gender(account: Account, user_input: str):
     :return:
     :rtype:
     """
-    preferred_language = get_cached_preferred_language(account.blockchain_address)
+    preferred_language = memoized(get_cached_preferred_language, account.blockchain_address)
     if not preferred_language:
         preferred_language = i18n.config.get('fallback')
     r_user_input = gender().get(user_input)
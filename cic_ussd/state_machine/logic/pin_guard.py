@@ -10,6 +10,7 @@ from sqlalchemy.orm.session import Session
 # local imports
 from cic_ussd.account.guardianship import Guardianship
 from cic_ussd.account.metadata import get_cached_preferred_language
+from cic_ussd.context import memoized
 from cic_ussd.db.models.account import Account
 from cic_ussd.db.models.base import SessionBase
 from cic_ussd.notifications import Notifier
@@ -72,7 +73,7 @@ def is_valid_guardian_addition(state_machine_data: Tuple[str, dict, Account, Ses
     """
     user_input, ussd_session, account, session = state_machine_data
     user_input = user_input.replace(" ", "")
-    preferred_language = get_cached_preferred_language(account.blockchain_address)
+    preferred_language = memoized(get_cached_preferred_language, account.blockchain_address)
     if not preferred_language:
         preferred_language = i18n.config.get('fallback')
 
@@ -163,7 +164,7 @@ def is_set_pin_guardian(account: Account, checked_number: str,
 
 def is_dialers_pin_guardian(state_machine_data: Tuple[str, dict, Account, Session]):
     user_input, ussd_session, account, session = state_machine_data
-    preferred_language = get_cached_preferred_language(account.blockchain_address)
+    preferred_language = memoized(get_cached_preferred_language, account.blockchain_address)
     if not preferred_language:
         preferred_language = i18n.config.get('fallback')
     return is_set_pin_guardian(account, user_input, preferred_language, session, ussd_session)
@@ -171,7 +172,7 @@ def is_dialers_pin_guardian(state_machine_data: Tuple[str, dict, Account, Sessio
 
 def is_others_pin_guardian(state_machine_data: Tuple[str, dict, Account, Session]):
     user_input, ussd_session, account, session = state_machine_data
-    preferred_language = get_cached_preferred_language(account.blockchain_address)
+    preferred_language = memoized(get_cached_preferred_language, account.blockchain_address)
     guarded_account = Account.get_by_phone_number(user_input, session)
     if not preferred_language:
         preferred_language = i18n.config.get('fallback')
@@ -215,7 +216,7 @@ def initiate_pin_reset(state_machine_data: Tuple[str, dict, Account, Session]):
         session_data['quorum_count'] = 0
         save_session_data('cic-ussd', session, session_data, ussd_session)
 
-        preferred_language = get_cached_preferred_language(guarded_account.blockchain_address)
+        preferred_language = memoized(get_cached_preferred_language, guarded_account.blockchain_address)
         if not preferred_language:
             preferred_language = i18n.config.get('fallback')
 
@@ -224,4 +225,4 @@ def initiate_pin_reset(state_machine_data: Tuple[str, dict, Account, Session]):
             key='sms.pin_reset_initiated',
             phone_number=guarded_account.phone_number,
             preferred_language=preferred_language,
-            pin_initiator=account.standard_metadata_id())
+            pin_initiator=memoized(account.standard_metadata_id))
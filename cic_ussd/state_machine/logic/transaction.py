@@ -13,6 +13,7 @@ from cic_ussd.account.chain import Chain
 from cic_ussd.account.metadata import UssdMetadataPointer, get_cached_preferred_language
 from cic_ussd.account.tokens import get_active_token_symbol, get_cached_token_data, get_cached_locked_account_token
 from cic_ussd.account.transaction import OutgoingTransaction
+from cic_ussd.context import memoized
 from cic_ussd.db.models.account import Account
 from cic_ussd.db.models.tx_meta import TxMeta
 from cic_ussd.session.ussd_session import save_session_data
@@ -75,7 +76,7 @@ def has_sufficient_balance(state_machine_data: Tuple[str, dict, Account, Session
     """
     user_input, ussd_session, account, session = state_machine_data
     identifier = bytes.fromhex(account.blockchain_address)
-    token_symbol = get_active_token_symbol(account.blockchain_address)
+    token_symbol = memoized(get_active_token_symbol, account.blockchain_address)
     key = cache_data_key([identifier, token_symbol.encode('utf-8')],
                          UssdMetadataPointer.BALANCE_SPENDABLE)
     spendable_balance = get_cached_data(key)
@@ -137,7 +138,7 @@ def process_transaction_request(state_machine_data: Tuple[str, dict, Account, Se
     from_address = account.blockchain_address
     amount = ussd_session.get('data').get('transaction_amount')
     reason = ussd_session.get('data').get('transaction_product')
-    token_symbol = get_active_token_symbol(account.blockchain_address)
+    token_symbol = memoized(get_active_token_symbol, account.blockchain_address)
     token_data = get_cached_token_data(account.blockchain_address, token_symbol)
     decimals = 6 #token_data.get('decimals')
     outgoing_tx_processor = OutgoingTransaction(chain_str=chain_str,
@@ -163,7 +164,7 @@ def save_transaction_product_to_session_data(state_machine_data: Tuple[str, dict
         4: "artisanal_product",
         5: "service"
     }
-    preferred_language = get_cached_preferred_language(account.blockchain_address)
+    preferred_language = memoized(get_cached_preferred_language, account.blockchain_address)
     if not preferred_language:
         preferred_language = i18n.config.get('fallback')
     selected_product = translation_for(f'helpers.{products[int(user_input)]}', preferred_language)
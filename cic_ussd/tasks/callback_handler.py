@@ -9,8 +9,8 @@ from cic_types.condiments import MetadataPointer
 
 # local imports
 from cic_ussd.account.balance import get_balances, BalancesHandler
-from cic_ussd.account.statement import generate
-from cic_ussd.cache import Cache, cache_data, cache_data_key, get_cached_data
+from cic_ussd.account.statement import process
+from cic_ussd.cache import Cache, cache_data, cache_data_key, cache_object, CacheKey, get_cached_data
 from cic_ussd.account.chain import Chain
 from cic_ussd.db.models.base import SessionBase
 from cic_ussd.db.models.account import Account
@@ -24,7 +24,6 @@ from cic_ussd.account.tokens import (collate_token_metadata,
                                      set_active_token)
 from cic_ussd.error import AccountCreationDataNotFound
 from cic_ussd.tasks.base import CriticalSQLAlchemyTask
-from cic_ussd.worker import Worker
 from cic_ussd.state_machine.logic.account import parse_person_metadata
 
 logg = logging.getLogger(__file__)
@@ -44,7 +43,7 @@ def account_creation_callback(self, result: str, param: str, status_code: int):
 
     account_creation_data = json.loads(cached_account_creation_data)
     account_creation_data['status'] = 'CREATED'
-    cache_data(task_uuid, json.dumps(account_creation_data))
+    cache_data(CacheKey(task_uuid, 'account_creation'), json.dumps(account_creation_data))
 
     phone_number = account_creation_data.get('phone_number')
     metadata = account_creation_data.get('metadata')
@@ -71,32 +70,17 @@ def account_creation_callback(self, result: str, param: str, status_code: int):
     key = cache_data_key(bytes.fromhex(result), MetadataPointer.PREFERENCES)
     cache_data(key, json.dumps(preferences_data))
 
-    logg.debug("storing account preferences metadata")
-    s_preferences_metadata = celery.signature(
-        'cic_ussd.tasks.metadata.add_preferences_metadata', [result, preferences_data], queue=queue
-    )
-    s_preferences_metadata.apply_async()
-
-    logg.debug("storing account phone to blockchain address pointer metadata")
-    s_phone_pointer = celery.signature(
-        'cic_ussd.tasks.metadata.add_phone_pointer', [result, phone_number], queue=queue
-    )
-    s_phone_pointer.apply_async()
-
-    logg.debug("storing account custom tag metadata")
+    logg.debug("storing account preferences, phone pointer, custom tag and person metadata")
     custom_metadata = {"tags": ["ussd", "individual"]}
-    s_custom_metadata = celery.signature(
-        'cic_ussd.tasks.metadata.add_custom_metadata', [result, custom_metadata], queue=queue
-    )
-    s_custom_metadata.apply_async()
-
-    logg.debug("storing account person metadata")
+    person_metadata = None
     if account := session.query(Account).filter(Account.blockchain_address == result).first():
         person_metadata = parse_person_metadata(account, metadata)
-        s_create_person_metadata = celery.signature(
-            'cic_ussd.tasks.metadata.create_person_metadata', [result, person_metadata], queue=Worker.queue_name
-        )
-        s_create_person_metadata.apply_async()
+    s_account_metadata = celery.signature(
+        'cic_ussd.tasks.metadata.create_account_metadata',
+        [result, phone_number, preferences_data, custom_metadata, person_metadata],
+        queue=queue
+    )
+    s_account_metadata.apply_async()
 
     Cache.store.expire(task_uuid, timedelta(seconds=180))
     logg.info(f"expired cache for task id: {task_uuid}")
@@ -120,7 +104,7 @@ def balances_callback(result: list, param: str, status_code: int):
             i = identity.encode('utf-8')
             identifier.append(i)
     key = cache_data_key(identifier=identifier, salt=MetadataPointer.BALANCES)
-    cache_data(key, json.dumps(balances))
+    cache_object(key, balances)
 
 
 @celery_app.task(bind=True)
@@ -130,14 +114,17 @@ def statement_callback(self, result, param: str, status_code: int):
 
     queue = self.request.delivery_info.get('routing_key')
     statement_transactions = filter_statement_transactions(result)
+    transactions = []
     for transaction in statement_transactions:
         recipient_transaction, sender_transaction = transaction_actors(transaction)
         if recipient_transaction.get('blockchain_address') == param:
             recipient_transaction['alt_blockchain_address'] = sender_transaction.get('blockchain_address')
-            generate(param, queue, recipient_transaction)
+            transactions.append(recipient_transaction)
         if sender_transaction.get('blockchain_address') == param:
             sender_transaction['alt_blockchain_address'] = recipient_transaction.get('blockchain_address')
-            generate(param, queue, sender_transaction)
+            transactions.append(sender_transaction)
+    if transactions:
+        process(param, queue, transactions)
 
 
 @celery_app.task
@@ -157,7 +144,7 @@ def token_data_callback(result: dict, param: str, status_code: int):
     token_data = collate_token_metadata(token_info=token_info, token_metadata=token_meta)
     token_data = {**token_data, **token}
     token_data_key = cache_data_key(identifier, MetadataPointer.TOKEN_DATA)
-    cache_data(token_data_key, json.dumps(token_data))
+    cache_object(token_data_key, token_data)
     handle_token_symbol_list(blockchain_address=param, token_symbol=token_symbol)
 
 
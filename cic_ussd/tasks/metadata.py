@@ -8,24 +8,33 @@ from cic_types.models.person import Person
 
 # local imports
 from cic_ussd.metadata import CustomMetadata, PersonMetadata, PhonePointerMetadata, PreferencesMetadata
+from cic_ussd.metadata.base import create_many
 from cic_ussd.tasks.base import CriticalMetadataTask
 from cic_ussd.phone_number import E164Format
+from cic_ussd.worker import Worker
 
 celery_app = celery.current_app
 logg = logging.getLogger(__file__)
 
 
+def normalize_person_metadata(data: dict) -> str:
+    """This function round trips person metadata through the person model to normalize it for caching.
+    :param data: Person metadata as retrieved from the metadata server.
+    :type data: dict
+    :return: The normalized person metadata as json.
+    :rtype: str
+    """
+    person = Person()
+    person_data = person.deserialize(person_data=data)
+    serialized_person_data = person_data.serialize(region=E164Format.region)
+    return json.dumps(serialized_person_data)
+
+
 @celery_app.task
 def query_person_metadata(blockchain_address: str):
     identifier = bytes.fromhex(blockchain_address)
     person_metadata_client = PersonMetadata(identifier=identifier)
-    response = person_metadata_client.query()
-    data = response.json()
-    person = Person()
-    person_data = person.deserialize(person_data=data)
-    serialized_person_data = person_data.serialize(region=E164Format.region)
-    data = json.dumps(serialized_person_data)
-    person_metadata_client.cache_metadata(data=data)
+    person_metadata_client.refresh(transform=normalize_person_metadata)
 
 
 @celery_app.task
@@ -64,12 +73,61 @@ def add_preferences_metadata(blockchain_address: str, data: dict):
     preferences_metadata_client.create(data=data)
 
 
+@celery_app.task(bind=True)
+def create_account_metadata(self,
+                            blockchain_address: str,
+                            phone_number: str,
+                            preferences_data: dict,
+                            custom_metadata: dict,
+                            person_metadata: dict = None):
+    """This function submits the metadata of a newly created account concurrently. A submission that fails is queued
+    again on its own task, so that the submissions that succeeded are neither posted nor signed again.
+    :param blockchain_address: The account's blockchain address.
+    :type blockchain_address: str
+    :param phone_number: The account's phone number, pointed to the blockchain address.
+    :type phone_number: str
+    :param preferences_data: The account's preferences metadata.
+    :type preferences_data: dict
+    :param custom_metadata: The account's custom tag metadata.
+    :type custom_metadata: dict
+    :param person_metadata: The account's person metadata, if any.
+    :type person_metadata: dict
+    """
+    queue = self.request.delivery_info.get('routing_key')
+    identifier = bytes.fromhex(blockchain_address)
+    submissions = [
+        (PreferencesMetadata(identifier=identifier),
+         preferences_data,
+         celery.signature('cic_ussd.tasks.metadata.add_preferences_metadata',
+                          [blockchain_address, preferences_data],
+                          queue=queue)),
+        (PhonePointerMetadata(identifier=phone_number.encode('utf-8')),
+         blockchain_address,
+         celery.signature('cic_ussd.tasks.metadata.add_phone_pointer', [blockchain_address, phone_number], queue=queue)),
+        (CustomMetadata(identifier=identifier),
+         custom_metadata,
+         celery.signature('cic_ussd.tasks.metadata.add_custom_metadata',
+                          [blockchain_address, custom_metadata],
+                          queue=queue))
+    ]
+    if person_metadata:
+        submissions.append(
+            (PersonMetadata(identifier=identifier),
+             person_metadata,
+             celery.signature('cic_ussd.tasks.metadata.create_person_metadata',
+                              [blockchain_address, person_metadata],
+                              queue=Worker.queue_name)))
+    results = create_many([(handler, data) for handler, data, _ in submissions], return_exceptions=True)
+    for (handler, _, s_retry), result in zip(submissions, results):
+        if isinstance(result, Exception):
+            logg.warning(f'{handler.cic_type} metadata submission failed: {result}, queueing it on its own task.')
+            s_retry.apply_async()
+
+
 @celery_app.task()
 def query_preferences_metadata(blockchain_address: str):
     identifier = bytes.fromhex(blockchain_address)
     logg.debug(f'retrieving preferences metadata for address: {blockchain_address}.')
     preferences_metadata_client = PreferencesMetadata(identifier=identifier)
-    response = preferences_metadata_client.query()
-    data = json.dumps(response.json())
-    preferences_metadata_client.cache_metadata(data)
-    return data
+    preferences_metadata_client.refresh()
+    return preferences_metadata_client.get_cached_metadata()
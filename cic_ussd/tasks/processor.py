@@ -1,5 +1,4 @@
 # standard imports
-import json
 import logging
 
 # external imports
@@ -8,11 +7,12 @@ import i18n
 from cic_types.condiments import MetadataPointer
 
 # local imports
-from cic_ussd.account.metadata import get_cached_preferred_language
-from cic_ussd.account.statement import get_cached_statement
-from cic_ussd.account.transaction import aux_transaction_data, validate_transaction_account
-from cic_ussd.cache import cache_data, cache_data_key
-from cic_ussd.db.models.account import Account
+from cic_ussd.account.metadata import get_cached_preferred_language, standard_metadata_ids
+from cic_ussd.account.statement import cache_statement_transactions
+from cic_ussd.account.transaction import (aux_transaction_data,
+                                          check_transaction_account,
+                                          resolve_transaction_accounts)
+from cic_ussd.cache import cache_data_key, cache_pipeline
 from cic_ussd.db.models.base import SessionBase
 from cic_ussd.phone_number import OfficeSender
 
@@ -35,16 +35,8 @@ def generate_statement(self, querying_party: str, transaction: dict):
 
 @celery_app.task
 def cache_statement(parsed_transaction: dict, querying_party: str):
-    if cached_statement := get_cached_statement(querying_party):
-        statement_transactions = json.loads(cached_statement)
-    else:
-        statement_transactions = []
-    if parsed_transaction not in statement_transactions:
-        statement_transactions.append(parsed_transaction)
-    data = json.dumps(statement_transactions)
     identifier = bytes.fromhex(querying_party)
-    key = cache_data_key(identifier, MetadataPointer.STATEMENT)
-    cache_data(key, data)
+    cache_statement_transactions(identifier, [parsed_transaction])
 
 
 @celery_app.task
@@ -58,29 +50,69 @@ def parse_transaction(transaction: dict) -> dict:
     :return: Transaction object with contextual data for use in the system.
     :rtype: dict
     """
-    preferred_language = get_cached_preferred_language(transaction.get('blockchain_address'))
-    if not preferred_language:
-        preferred_language = i18n.config.get('fallback')
-    transaction['preferred_language'] = preferred_language
-    transaction = aux_transaction_data(preferred_language, transaction)
+    return collate_transactions([transaction])[0]
+
+
+@celery_app.task
+def process_statement(querying_party: str, transactions: list):
+    """This function parses a batch of an account's transactions in a single database session, resolving the accounts
+    of all counterparties in one query, and caches them in the account's statement.
+    :param querying_party: The blockchain address of the account the statement belongs to.
+    :type querying_party: str
+    :param transactions: The account's transaction objects as produced by transaction_actors.
+    :type transactions: list
+    """
+    if not transactions:
+        return
+    transactions = sorted(transactions, key=lambda d: d.get('timestamp') or 0)
+    cache_statement_transactions(bytes.fromhex(querying_party), collate_transactions(transactions))
+
+
+def collate_transactions(transactions: list) -> list:
+    """This function adds the contextual data of the accounts involved in several transactions to the transaction
+    objects. The accounts of all parties are resolved in a single query and their person metadata read in a single
+    round trip, the symbols of the tokens last received and sent are cached in another.
+    :param transactions: Transaction objects.
+    :type transactions: list
+    :return: Transaction objects with contextual data for use in the system.
+    :rtype: list
+    """
     session = SessionBase.create_session()
-    role = transaction.get('role')
-    alt_blockchain_address = transaction.get('alt_blockchain_address')
-    blockchain_address = transaction.get('blockchain_address')
-    identifier = bytes.fromhex(blockchain_address)
-    token_symbol = transaction.get('token_symbol')
-    if role == 'recipient':
-        key = cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_RECEIVED)
-        cache_data(key, token_symbol)
-    if role == 'sender':
-        key = cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_SENT)
-        cache_data(key, token_symbol)
-    account = validate_transaction_account(blockchain_address, role, session)
-    if alt_account := session.query(Account).filter_by(blockchain_address=alt_blockchain_address).first():
-        transaction['alt_metadata_id'] = alt_account.standard_metadata_id()
-    else:
-        transaction['alt_metadata_id'] = OfficeSender.tag
-    transaction['metadata_id'] = account.standard_metadata_id()
-    transaction['phone_number'] = account.phone_number
+    address_pairs = [
+        (transaction.get('blockchain_address'), transaction.get('alt_blockchain_address')) for transaction in transactions]
+    parties = resolve_transaction_accounts(address_pairs, session)
     session.close()
-    return transaction
+    for transaction, (account, alt_account) in zip(transactions, parties):
+        check_transaction_account(account, transaction.get('blockchain_address'), transaction.get('role'))
+    accounts = [party for account_pair in parties for party in account_pair]
+    metadata_ids = iter(standard_metadata_ids(accounts))
+    preferred_languages = {}
+    with cache_pipeline() as pipeline:
+        for transaction, (account, alt_account) in zip(transactions, parties):
+            blockchain_address = transaction.get('blockchain_address')
+            if blockchain_address not in preferred_languages:
+                preferred_languages[blockchain_address] = \
+                    get_cached_preferred_language(blockchain_address) or i18n.config.get('fallback')
+            preferred_language = preferred_languages[blockchain_address]
+            transaction['preferred_language'] = preferred_language
+            aux_transaction_data(preferred_language, transaction)
+            pipeline.cache_data(last_token_key(transaction), transaction.get('token_symbol'))
+            metadata_id = next(metadata_ids)
+            alt_metadata_id = next(metadata_ids)
+            transaction['alt_metadata_id'] = alt_metadata_id or OfficeSender.tag
+            transaction['metadata_id'] = metadata_id
+            transaction['phone_number'] = account.phone_number if account else None
+    return transactions
+
+
+def last_token_key(transaction: dict) -> str:
+    """This function returns the key the symbol of the token an account last received or sent is cached at.
+    :param transaction: Transaction object.
+    :type transaction: dict
+    :return: A cache key.
+    :rtype: str
+    """
+    identifier = bytes.fromhex(transaction.get('blockchain_address'))
+    if transaction.get('role') == 'recipient':
+        return cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_RECEIVED)
+    return cache_data_key(identifier=identifier, salt=MetadataPointer.TOKEN_LAST_SENT)
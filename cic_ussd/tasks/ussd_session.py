@@ -1,5 +1,4 @@
 # standard imports
-import json
 from datetime import timedelta
 
 # third party imports
@@ -7,7 +6,7 @@ import celery
 from celery.utils.log import get_logger
 
 # local imports
-from cic_ussd.cache import Cache, get_cached_data
+from cic_ussd.cache import Cache, get_cached_object
 from cic_ussd.db.models.base import SessionBase
 from cic_ussd.db.models.ussd_session import UssdSession
 from cic_ussd.error import SessionNotFoundError
@@ -29,8 +28,7 @@ def persist_session_to_db(external_session_id: str):
     :raises VersionTooLowError: If the session's version doesn't match the latest version.
     """
     session = SessionBase.create_session()
-    if cached_ussd_session := get_cached_data(external_session_id):
-        cached_ussd_session = json.loads(cached_ussd_session)
+    if cached_ussd_session := get_cached_object(external_session_id):
         ussd_session = session.query(UssdSession).filter_by(external_session_id=external_session_id).first()
         if ussd_session:
             ussd_session.update(
@@ -2,7 +2,11 @@
 This module is responsible for translation of ussd menu text based on a user's set preferred language.
 """
 # standard imports
+import hashlib
 import json
+import logging
+import pickle
+import time
 
 import i18n
 import os
@@ -11,12 +15,16 @@ from typing import Optional
 
 # external imports
 from cic_translations.processor import generate_translation_files, parse_csv
+from i18n import resource_loader
+from i18n.translator import pluralize, TranslationFormatter
 from cic_types.condiments import MetadataPointer
 
 # local imports
 from cic_ussd.cache import cache_data, cache_data_key
 from cic_ussd.phone_number import E164Format
 
+logg = logging.getLogger(__name__)
+
 
 def generate_locale_files(locale_dir: str, schema_file_path: str, translation_builder_path: str):
     """"""
@@ -33,6 +41,31 @@ def generate_locale_files(locale_dir: str, schema_file_path: str, translation_bu
             )
 
 
+def translation_sources_digest(schema_file_path: str, translation_builder_path: str) -> str:
+    """This function hashes the contents of the translation builder csv files and the schema files the locale files are
+    generated from.
+    :param schema_file_path: Path to the schema file or directory of schema files.
+    :type schema_file_path: str
+    :param translation_builder_path: Path to the directory holding the translation builder csv files.
+    :type translation_builder_path: str
+    :return: A hex digest that changes whenever any of the source files change.
+    :rtype: str
+    """
+    digest = hashlib.sha256(str(Translations.artifact_version).encode('utf-8'))
+    source_files = [os.path.join(translation_builder_path, file)
+                    for file in os.listdir(translation_builder_path) if Path(file).suffix == '.csv']
+    if os.path.isdir(schema_file_path):
+        for directory, _, files in os.walk(schema_file_path):
+            source_files += [os.path.join(directory, file) for file in files]
+    else:
+        source_files.append(schema_file_path)
+    for source_file in sorted(source_files):
+        digest.update(source_file.encode('utf-8'))
+        with open(source_file, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
 class Languages:
     languages_dict: dict = None
 
@@ -53,6 +86,156 @@ class Languages:
         cache_data(key, json.dumps(languages_list))
 
 
+class CompiledTemplate:
+    """This class describes a translation text split once into its literal text and placeholders so that rendering it
+    only joins the parts, with the same substitution rules as the i18n translation formatter.
+    """
+    __slots__ = ('segments', 'text')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.segments = []
+        position = 0
+        for match in TranslationFormatter.pattern.finditer(text):
+            self.segments.append(text[position:match.start()])
+            name = match.group('named') or match.group('braced')
+            if name is not None:
+                self.segments.append((name, match.group()))
+            elif match.group('escaped') is not None:
+                self.segments.append(TranslationFormatter.delimiter)
+            else:
+                self.segments.append(match.group())
+            position = match.end()
+        self.segments.append(text[position:])
+        if all(isinstance(segment, str) for segment in self.segments):
+            self.segments = None
+
+    def render(self, values: dict) -> str:
+        if self.segments is None:
+            return self.text
+        strict = i18n.config.get('error_on_missing_placeholder')
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            elif segment[0] in values:
+                parts.append(str(values[segment[0]]))
+            elif strict:
+                raise KeyError(segment[0])
+            else:
+                parts.append(segment[1])
+        return ''.join(parts)
+
+
+def _compile_translations(translations: dict, namespace: str, templates: dict):
+    for key, value in translations.items():
+        key = f'{namespace}{i18n.config.get("namespace_delimiter")}{key}'
+        if isinstance(value, dict) and len(set(resource_loader.PLURALS).intersection(value)) < 2:
+            _compile_translations(value, key, templates)
+        elif isinstance(value, dict):
+            templates[key] = {plural: CompiledTemplate(text) for plural, text in value.items()}
+        else:
+            templates[key] = CompiledTemplate(value)
+
+
+class Translations:
+    """This class holds the translations for every language in precompiled templates so that translating a text only
+    needs the language it is translated to, with no reliance on the process wide i18n locale.
+    :cvar artifact_file: Name of the file in the locale directory holding the pickled templates.
+    :type artifact_file: str
+    :cvar templates: Compiled templates indexed by language and then by translation key.
+    :type templates: dict
+    """
+    artifact_file = 'translations.pickle'
+    artifact_version = 1
+    templates: dict = {}
+
+    @classmethod
+    def build(cls, locale_dir: str, schema_file_path: str, translation_builder_path: str):
+        """This function loads the compiled templates from the locale directory's build artifact, it only regenerates
+        the locale files and recompiles the templates when the translation builder or schema files have changed since
+        the artifact was written.
+        :param locale_dir: Path to the directory holding the generated translation files.
+        :type locale_dir: str
+        :param schema_file_path: Path to the schema file or directory of schema files.
+        :type schema_file_path: str
+        :param translation_builder_path: Path to the directory holding the translation builder csv files.
+        :type translation_builder_path: str
+        """
+        start = time.perf_counter()
+        digest = translation_sources_digest(schema_file_path, translation_builder_path)
+        artifact_path = os.path.join(locale_dir, cls.artifact_file)
+        artifact = None
+        if os.path.isfile(artifact_path):
+            try:
+                with open(artifact_path, 'rb') as file:
+                    artifact = pickle.load(file)
+            except (AttributeError, EOFError, pickle.UnpicklingError):
+                logg.warning(f'Could not load translations build from: {artifact_path}, regenerating.')
+        if artifact and artifact.get('digest') == digest:
+            cls.templates = artifact.get('templates')
+            logg.info(f'Loaded translations build: {digest[:12]} in {(time.perf_counter() - start) * 1000:.2f}ms.')
+            return
+
+        generate_locale_files(locale_dir=locale_dir,
+                              schema_file_path=schema_file_path,
+                              translation_builder_path=translation_builder_path)
+        cls.load(locale_dir)
+        temporary_path = f'{artifact_path}.{os.getpid()}'
+        with open(temporary_path, 'wb') as file:
+            pickle.dump({'digest': digest, 'templates': cls.templates}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, artifact_path)
+        logg.info(f'Generated translations build: {digest[:12]} in {(time.perf_counter() - start) * 1000:.2f}ms.')
+
+    @classmethod
+    def load(cls, locale_dir: str):
+        """This function compiles all translation files in the locale directory.
+        :param locale_dir: Path to the directory holding the generated translation files.
+        :type locale_dir: str
+        """
+        templates = {}
+        filename_format = i18n.config.get('filename_format')
+        for file in sorted(os.listdir(locale_dir)):
+            if not file.endswith(i18n.config.get('file_format')):
+                continue
+            locale = file.split('.')[filename_format.split('.').index('{locale}')]
+            root_data = None if i18n.config.get('skip_locale_root_data') else locale
+            translations = resource_loader.load_resource(os.path.join(locale_dir, file), root_data)
+            namespace = resource_loader.get_namespace_from_filepath(file)
+            _compile_translations(translations, namespace, templates.setdefault(locale, {}))
+        cls.templates = templates
+        logg.debug(f'Compiled translations for: {", ".join(templates)}.')
+
+
+def render(key: str, language: Optional[str] = None, **kwargs) -> str:
+    """This function translates the text mapped to a key into a language, falling back to the fallback language when
+    the language has no such text.
+    :param key: Key to a specific YAML text entry
+    :type key: str
+    :param language: The language to translate to.
+    :type language: str
+    :param kwargs: Dynamic values to be interpolated into the texts for specific keys
+    :type kwargs: any
+    :return: Appropriately translated text for corresponding provided key
+    :rtype: str
+    """
+    fallback = i18n.config.get('fallback')
+    template = Translations.templates.get(language or fallback, {}).get(key)
+    if template is None and language and language != fallback:
+        template = Translations.templates.get(fallback, {}).get(key)
+    if template is None:
+        if 'default' in kwargs:
+            return kwargs['default']
+        if i18n.config.get('error_on_missing_translation'):
+            raise KeyError('key {0} not found'.format(key))
+        return key
+    if 'count' in kwargs:
+        template = pluralize(key, template, kwargs['count'])
+        if isinstance(template, str):
+            return CompiledTemplate(template).render(kwargs)
+    return template.render(kwargs)
+
+
 def translation_for(key: str, preferred_language: Optional[str] = None, **kwargs) -> str:
     """
     Translates text mapped to a specific YAML key into the user's set preferred language.
@@ -65,8 +248,6 @@ def translation_for(key: str, preferred_language: Optional[str] = None, **kwargs
     :return: Appropriately translated text for corresponding provided key
     :rtype: str
     """
-    if preferred_language:
-        i18n.set('locale', preferred_language)
-    else:
-        i18n.set('locale', i18n.config.get('fallback'))
-    return i18n.t(key, **kwargs)
+    if Translations.templates:
+        return render(key, preferred_language, **kwargs)
+    return i18n.t(key, locale=preferred_language or i18n.config.get('fallback'), **kwargs)
@@ -0,0 +1,5 @@
+#!/bin/bash
+
+. /root/db.sh
+
+exec /usr/local/bin/cic-user-session-persister $@
@@ -0,0 +1,7 @@
+#!/bin/bash
+
+. /root/db.sh
+
+user_ussd_server_port=${SERVER_PORT:-9000}
+
+exec /usr/local/bin/cic-user-ussd-asgi-server --port "$user_ussd_server_port" $@
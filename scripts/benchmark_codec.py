@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Compares the encode and decode time and the size of cached payloads in each codec format e.g.:
+
+    benchmark_codec.py --rounds 10000 --statement-length 50
+"""
+# standard imports
+import argparse
+import logging
+import random
+import time
+import uuid
+
+# third party imports
+
+# local imports
+from cic_ussd.codec import Codec
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument('--rounds', type=int, default=10000, help='number of times each payload is encoded and decoded')
+arg_parser.add_argument('--statement-length', dest='statement_length', type=int, default=50, help='number of transactions in a statement')
+arg_parser.add_argument('--compression-threshold', dest='compression_threshold', type=int, default=1024, help='size in bytes beyond which msgpack payloads are compressed')
+arg_parser.add_argument('-v', action='store_true', help='be verbose')
+args = arg_parser.parse_args()
+
+if args.v:
+    logg.setLevel(logging.INFO)
+
+
+def blockchain_address() -> str:
+    return uuid.uuid4().hex + uuid.uuid4().hex[:8]
+
+
+def ussd_session() -> dict:
+    return {
+        'data': {
+            'recipient_phone_number': '+254700000000',
+            'transaction_amount': '150',
+            'selected_token': {'symbol': 'GFT', 'name': 'Giftable', 'decimals': 6, 'balance': 550.25},
+            'selected_village': 'Bameka'
+        },
+        'external_session_id': 'AT-' + uuid.uuid4().hex,
+        'msisdn': '+254712345678',
+        'user_input': '1*2*3*4',
+        'service_code': '*483*46#',
+        'state': 'transaction_pin_authorization',
+        'version': 7
+    }
+
+
+def balances() -> list:
+    return [{
+        'address': blockchain_address(),
+        'converters': [],
+        'balance_network': 50000000,
+        'balance_outgoing': 0,
+        'balance_incoming': 0
+    }]
+
+
+def statement(length: int) -> list:
+    return [{
+        'blockchain_address': blockchain_address(),
+        'alt_blockchain_address': blockchain_address(),
+        'token_symbol': random.choice(['GFT', 'SRF', 'DET']),
+        'token_value': random.randint(1, 10000) * 1000000,
+        'token_decimals': 6,
+        'role': random.choice(['sender', 'recipient']),
+        'action_tag': 'Sent',
+        'direction_tag': 'To',
+        'metadata_id': 'John Doe +254712345678',
+        'phone_number': '+254712345678',
+        'timestamp': time.time(),
+        'preferred_language': 'en'
+    } for _ in range(length)]
+
+
+def token_list() -> list:
+    return [{
+        'description': 'A community inclusion currency for a village market.',
+        'symbol': symbol,
+        'issuer': 'Grassroots Economics',
+        'contact': '+254700000000',
+        'location': 'Kilifi',
+        'balance': random.random() * 1000
+    } for symbol in ['GFT', 'SRF', 'DET', 'BRT', 'KRB']]
+
+
+def time_codec(payload, rounds: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        value = Codec.encode(payload)
+    encoded = time.perf_counter()
+    for _ in range(rounds):
+        Codec.decode(value)
+    decoded = time.perf_counter()
+    size = len(value.encode('utf-8') if isinstance(value, str) else value)
+    return (encoded - start) / rounds, (decoded - encoded) / rounds, size
+
+
+def main():
+    payloads = {
+        'ussd_session': ussd_session(),
+        'balances': balances(),
+        'statement': statement(args.statement_length),
+        'token_list': token_list()
+    }
+    Codec.compression_threshold = args.compression_threshold
+    print(f'{"payload":<16}{"format":<10}{"encode µs":>12}{"decode µs":>12}{"bytes":>10}')
+    for name, payload in payloads.items():
+        for codec_format in Codec.formats:
+            Codec.format = codec_format
+            encode_time, decode_time, size = time_codec(payload, args.rounds)
+            print(f'{name:<16}{codec_format:<10}{encode_time * 1e6:>12.2f}{decode_time * 1e6:>12.2f}{size:>10}')
+
+
+if __name__ == '__main__':
+    main()
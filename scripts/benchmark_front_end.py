@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Drives concurrent ussd sessions against a running ussd server to compare the wsgi and asgi front ends e.g.:
+
+    benchmark_front_end.py --url http://localhost:9000/ --concurrency 64 --steps 8
+
+Run it once against each front end with the same number of cores available to the server.
+"""
+# standard imports
+import argparse
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+# third party imports
+
+# local imports
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument('--url', type=str, default='http://localhost:9000/', help='url of the ussd server')
+arg_parser.add_argument('--service-code', dest='service_code', type=str, default='*483*46#', help='ussd service code')
+arg_parser.add_argument('--concurrency', type=int, default=32, help='number of sessions run concurrently')
+arg_parser.add_argument('--sessions', type=int, default=256, help='number of sessions to run')
+arg_parser.add_argument('--steps', type=int, default=8, help='number of requests per session')
+arg_parser.add_argument('--server-cores', dest='server_cores', type=int, default=1, help='number of cores used by the server')
+arg_parser.add_argument('-v', action='store_true', help='be verbose')
+args = arg_parser.parse_args()
+
+if args.v:
+    logg.setLevel(logging.INFO)
+
+latencies = []
+failures = []
+lock = threading.Lock()
+
+
+def post(phone_number: str, user_input: str):
+    body = json.dumps({'ussd_code': args.service_code, 'msisdn': phone_number, 'ussd_response': user_input})
+    request = Request(args.url, data=body.encode('utf-8'), headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=60) as response:
+            response.read()
+    except Exception as error:
+        with lock:
+            failures.append(error)
+        return
+    with lock:
+        latencies.append(time.perf_counter() - start)
+
+
+def run_session(session: int):
+    phone_number = f'+2547{random.randint(10000000, 99999999)}'
+    post(phone_number, '')
+    for _ in range(args.steps - 1):
+        post(phone_number, str(random.randint(0, 9)))
+    logg.info(f'session: {session} for: {phone_number} done.')
+
+
+start = time.perf_counter()
+with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+    list(executor.map(run_session, range(args.sessions)))
+elapsed = time.perf_counter() - start
+
+latencies.sort()
+print(f'sessions: {args.sessions}, concurrency: {args.concurrency}, requests: {len(latencies)}, failures: {len(failures)}')
+if latencies:
+    print(f'latency p50: {statistics.median(latencies) * 1000:.1f}ms, '
+          f'p95: {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms, '
+          f'max: {latencies[-1] * 1000:.1f}ms')
+print(f'requests per second: {len(latencies) / elapsed:.1f}, per server core: {len(latencies) / elapsed / args.server_cores:.1f}')
+print(f'sessions per second per server core: {args.sessions / elapsed / args.server_cores:.2f}')
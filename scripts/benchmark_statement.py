@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""Compares the celery tasks, database queries and redis commands a statement refresh costs when each transaction is
+parsed in its own chain of tasks and when the statement is parsed in a single batch task e.g.:
+
+    benchmark_statement.py -c config/ --length 9 --rounds 10
+
+Tasks are run eagerly in process against the configured database and redis, for an account from the database with
+other accounts from the database as its counterparties. The account's cached statement is cleared before each round.
+"""
+# standard imports
+import argparse
+import logging
+import os
+import random
+import time
+import uuid
+
+# third party imports
+import celery
+import i18n
+import redis
+from celery.signals import task_prerun
+from cic_types.condiments import MetadataPointer
+from confini import Config
+from sqlalchemy import event
+
+# local imports
+from cic_ussd.account.statement import process, statement_pages_key
+from cic_ussd.cache import cache_data_key, configure_cache, Cache
+from cic_ussd.db import dsn_from_config
+from cic_ussd.db.models.account import Account
+from cic_ussd.db.models.base import SessionBase
+from cic_ussd.phone_number import OfficeSender
+from cic_ussd.time import TimezoneHandler
+from cic_ussd.translation import Translations
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+root_directory = os.path.dirname(os.path.dirname(__file__))
+config_directory = os.path.join(root_directory, 'config')
+
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument('-c', type=str, default=config_directory, help='config file')
+arg_parser.add_argument('--env-prefix', default=os.environ.get('CONFINI_ENV_PREFIX'), dest='env_prefix', type=str, help='environment prefix for variables to overwrite configuration')
+arg_parser.add_argument('--length', type=int, default=9, help='number of transactions in a statement refresh')
+arg_parser.add_argument('--rounds', type=int, default=10, help='number of statement refreshes per path')
+arg_parser.add_argument('-v', action='store_true', help='be verbose')
+args = arg_parser.parse_args()
+
+if args.v:
+    logg.setLevel(logging.INFO)
+
+config = Config(args.c, env_prefix=args.env_prefix)
+config.process()
+config.censor('PASSWORD', 'DATABASE')
+
+SessionBase.connect(dsn_from_config(config))
+Cache.store = redis.StrictRedis(host=config.get('REDIS_HOST'),
+                                port=config.get('REDIS_PORT'),
+                                password=config.get('REDIS_PASSWORD'),
+                                db=config.get('REDIS_DATABASE'),
+                                decode_responses=True)
+configure_cache(config)
+
+i18n.load_path.append(config.get('LOCALE_PATH'))
+i18n.set('fallback', config.get('LOCALE_FALLBACK'))
+Translations.build(locale_dir=config.get('LOCALE_PATH'),
+                   schema_file_path=config.get('SCHEMA_FILE_PATH'),
+                   translation_builder_path=config.get('LOCALE_FILE_BUILDERS'))
+TimezoneHandler.timezone = config.get('TIME_ZONE')
+OfficeSender.tag = config.get('OFFICE_SENDER_TAG')
+
+celery.current_app.conf.update({'task_always_eager': True, 'task_eager_propagates': True})
+import cic_ussd.tasks
+
+counts = {'tasks': 0, 'queries': 0}
+
+
+@task_prerun.connect
+def count_task(**kwargs):
+    counts['tasks'] += 1
+
+
+@event.listens_for(SessionBase.engine, 'before_cursor_execute')
+def count_query(*args, **kwargs):
+    counts['queries'] += 1
+
+
+def redis_commands() -> int:
+    return sum(stats.get('calls', 0) for stats in Cache.store.info('commandstats').values())
+
+
+def statement_transactions(account: Account, counterparties: list) -> list:
+    now = int(time.time())
+    transactions = []
+    for i in range(args.length):
+        role = random.choice(['recipient', 'sender'])
+        transactions.append({
+            'blockchain_address': account.blockchain_address,
+            'alt_blockchain_address': random.choice(counterparties).blockchain_address,
+            'role': role,
+            'token_symbol': 'GFT',
+            'token_value': random.randint(1, 10000) * 1000000,
+            'token_decimals': 6,
+            'timestamp': now - i * 60,
+            'tx_hash': '0x' + uuid.uuid4().hex + uuid.uuid4().hex
+        })
+    return transactions
+
+
+def per_transaction(account: Account, transactions: list):
+    for transaction in transactions:
+        s_generate_statement = celery.signature(
+            'cic_ussd.tasks.processor.generate_statement', [account.blockchain_address, dict(transaction)], queue=None
+        )
+        s_generate_statement.apply_async()
+
+
+def batched(account: Account, transactions: list):
+    process(account.blockchain_address, None, [dict(transaction) for transaction in transactions])
+
+
+def measure(refresh, account: Account, counterparties: list) -> dict:
+    identifier = bytes.fromhex(account.blockchain_address)
+    statement_keys = [cache_data_key(identifier, MetadataPointer.STATEMENT), statement_pages_key(identifier)]
+    totals = {'tasks': 0, 'queries': 0, 'redis': 0, 'seconds': 0.0}
+    for _ in range(args.rounds):
+        Cache.store.delete(*statement_keys)
+        transactions = statement_transactions(account, counterparties)
+        counts.update({'tasks': 0, 'queries': 0})
+        commands = redis_commands()
+        start = time.perf_counter()
+        refresh(account, transactions)
+        totals['seconds'] += time.perf_counter() - start
+        # the commandstats query itself is counted once.
+        totals['redis'] += redis_commands() - commands - 1
+        totals['tasks'] += counts['tasks']
+        totals['queries'] += counts['queries']
+    return {name: total / args.rounds for name, total in totals.items()}
+
+
+def main():
+    session = SessionBase.create_session()
+    accounts = session.query(Account).limit(args.length + 1).all()
+    session.close()
+    if len(accounts) < 2:
+        raise SystemExit('At least two accounts are required in the database.')
+    account, counterparties = accounts[0], accounts[1:]
+    print(f'statement refresh of: {args.length} transactions, mean of: {args.rounds} rounds')
+    print(f'{"path":<18}{"tasks":>8}{"queries":>10}{"redis":>8}{"ms":>10}')
+    for name, refresh in (('per transaction', per_transaction), ('batched', batched)):
+        result = measure(refresh, account, counterparties)
+        print(f'{name:<18}{result["tasks"]:>8.1f}{result["queries"]:>10.1f}{result["redis"]:>8.1f}'
+              f'{result["seconds"] * 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
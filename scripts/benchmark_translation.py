@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# standard imports
+import argparse
+import csv
+import logging
+import os
+import re
+import tempfile
+import time
+
+# third party imports
+import i18n
+from confini import Config
+
+# local imports
+from cic_ussd.translation import generate_locale_files, render, Translations
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+root_directory = os.path.dirname(os.path.dirname(__file__))
+config_directory = os.path.join(root_directory, 'config')
+
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument('-c', type=str, default=config_directory, help='config file')
+arg_parser.add_argument('--env-prefix', default=os.environ.get('CONFINI_ENV_PREFIX'), dest='env_prefix', type=str, help='environment prefix for variables to overwrite configuration')
+arg_parser.add_argument('--rounds', default=100, type=int, help='number of times each key is translated per language')
+arg_parser.add_argument('-v', action='store_true', help='be verbose')
+args = arg_parser.parse_args()
+
+if args.v:
+    logg.setLevel(logging.INFO)
+
+config = Config(args.c, env_prefix=args.env_prefix)
+config.process()
+logg.debug(f'config:\n{config}')
+
+placeholder = re.compile(r'%\{(\w+)\}')
+
+
+def load_cases(translation_builder_path: str) -> list:
+    cases = []
+    for file in ('ussd.csv', 'sms.csv', 'helpers.csv'):
+        namespace = os.path.splitext(file)[0]
+        with open(os.path.join(translation_builder_path, file)) as builder_file:
+            rows = list(csv.reader(builder_file))
+        languages = rows[0][1:]
+        for row in rows[1:]:
+            kwargs = {name: f'<{name}>' for name in placeholder.findall(''.join(row[1:]))}
+            cases += [(f'{namespace}.{row[0]}', language, kwargs) for language in languages]
+    return cases
+
+
+def global_locale_translation(key: str, language: str, **kwargs) -> str:
+    i18n.set('locale', language)
+    return i18n.t(key, **kwargs)
+
+
+def time_translations(translate, cases: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key, language, kwargs in cases:
+            translate(key, language, **kwargs)
+    return time.perf_counter() - start
+
+
+with tempfile.TemporaryDirectory() as locale_dir:
+    generate_locale_files(locale_dir=locale_dir,
+                          schema_file_path=config.get('SCHEMA_FILE_PATH'),
+                          translation_builder_path=config.get('LOCALE_FILE_BUILDERS'))
+    i18n.load_path.append(locale_dir)
+    i18n.set('fallback', config.get('LOCALE_FALLBACK'))
+
+    start = time.perf_counter()
+    Translations.load(locale_dir)
+    logg.info(f'compiled translations in {(time.perf_counter() - start) * 1000:.2f}ms')
+
+    cases = load_cases(config.get('LOCALE_FILE_BUILDERS'))
+    mismatches = [case for case in cases if global_locale_translation(*case[:2], **case[2]) != render(*case[:2], **case[2])]
+    for key, language, _ in mismatches:
+        logg.warning(f'translation mismatch for key: {key} in language: {language}')
+
+    calls = len(cases) * args.rounds
+    i18n_elapsed = time_translations(global_locale_translation, cases, args.rounds)
+    render_elapsed = time_translations(render, cases, args.rounds)
+
+print(f'keys x languages: {len(cases)}, rounds: {args.rounds}, mismatches: {len(mismatches)}')
+print(f'i18n.set + i18n.t: {i18n_elapsed / calls * 1e6:.2f}us per translation')
+print(f'render: {render_elapsed / calls * 1e6:.2f}us per translation')
+print(f'speedup: {i18n_elapsed / render_elapsed:.1f}x')
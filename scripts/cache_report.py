@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""Estimates the memory held by each cache namespace and optionally applies the configured retention policies to data
+cached before they existed. Also reports the fraction of metadata refreshes that found the metadata unchanged e.g.:
+
+    cache_report.py -c config/ --count 1000
+    cache_report.py -c config/ --sweep
+
+Cache keys are hashes, so keys are attributed to a namespace by deriving the keys of every account in the database and
+of every token listed for them. Keys that cannot be derived are reported as unattributed.
+"""
+# standard imports
+import argparse
+import logging
+import os
+import re
+from collections import defaultdict
+
+# third party imports
+import redis
+from chainlib.chain import ChainSpec
+from cic_types.condiments import MetadataPointer
+from confini import Config
+
+# local imports
+from cic_ussd.account.metadata import UssdMetadataPointer
+from cic_ussd.cache import cache_data_key, configure_cache, Cache, CachePolicy, get_many_objects
+from cic_ussd.db import dsn_from_config
+from cic_ussd.db.models.account import Account
+from cic_ussd.db.models.base import SessionBase
+from cic_ussd.metadata.base import MetadataRefresh
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+root_directory = os.path.dirname(os.path.dirname(__file__))
+config_directory = os.path.join(root_directory, 'config')
+
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument('-c', type=str, default=config_directory, help='config file')
+arg_parser.add_argument('--env-prefix', default=os.environ.get('CONFINI_ENV_PREFIX'), dest='env_prefix', type=str, help='environment prefix for variables to overwrite configuration')
+arg_parser.add_argument('--count', type=int, default=1000, help='number of keys examined per scan iteration')
+arg_parser.add_argument('--sweep', action='store_true', help='apply the configured ttl to persistent keys of each namespace')
+arg_parser.add_argument('-v', action='store_true', help='be verbose')
+args = arg_parser.parse_args()
+
+if args.v:
+    logg.setLevel(logging.INFO)
+
+config = Config(args.c, env_prefix=args.env_prefix)
+config.process()
+config.censor('PASSWORD', 'DATABASE')
+
+Cache.store = redis.StrictRedis(host=config.get('REDIS_HOST'),
+                                port=config.get('REDIS_PORT'),
+                                password=config.get('REDIS_PASSWORD'),
+                                db=config.get('REDIS_DATABASE'),
+                                decode_responses=True)
+configure_cache(config)
+
+SessionBase.connect(dsn_from_config(config))
+
+account_salts = (
+    MetadataPointer.BALANCES,
+    MetadataPointer.BALANCES_ADJUSTED,
+    MetadataPointer.CUSTOM,
+    MetadataPointer.PERSON,
+    MetadataPointer.PREFERENCES,
+    MetadataPointer.STATEMENT,
+    MetadataPointer.TOKEN_ACTIVE,
+    MetadataPointer.TOKEN_DATA_LIST,
+    MetadataPointer.TOKEN_LAST_RECEIVED,
+    MetadataPointer.TOKEN_LAST_SENT,
+    MetadataPointer.TOKEN_SYMBOLS_LIST,
+    UssdMetadataPointer.LOCKED_ACCOUNT_TOKEN,
+    UssdMetadataPointer.STATEMENT_PAGES
+)
+account_token_salts = (
+    MetadataPointer.BALANCES,
+    MetadataPointer.BALANCES_ADJUSTED,
+    UssdMetadataPointer.BALANCE_SPENDABLE
+)
+phone_number_salts = (
+    MetadataPointer.PHONE,
+    UssdMetadataPointer.ACCOUNT_VILLAGE
+)
+token_salts = (
+    MetadataPointer.TOKEN_DATA,
+    MetadataPointer.TOKEN_META_SYMBOL,
+    MetadataPointer.TOKEN_PROOF_SYMBOL,
+    UssdMetadataPointer.TOKEN_SINK_ADDRESS
+)
+uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+hash_pattern = re.compile(r'^[0-9a-f]{64}$')
+
+
+def index_keys() -> dict:
+    """Derives the cache keys of all accounts and tokens and maps each to the name of its namespace."""
+    index = {}
+    identifiers = []
+    token_symbols = set()
+    session = SessionBase.create_session()
+    accounts = session.query(Account.blockchain_address, Account.phone_number).yield_per(1000)
+    for blockchain_address, phone_number in accounts:
+        identifier = bytes.fromhex(blockchain_address)
+        identifiers.append(identifier)
+        for salt in account_salts:
+            index[cache_data_key(identifier, salt)] = CachePolicy.namespace(salt)
+        for salt in phone_number_salts:
+            index[cache_data_key(phone_number.encode('utf-8'), salt)] = CachePolicy.namespace(salt)
+    session.close()
+
+    for offset in range(0, len(identifiers), 1000):
+        keys = [cache_data_key(identifier, MetadataPointer.TOKEN_SYMBOLS_LIST)
+                for identifier in identifiers[offset:offset + 1000]]
+        for token_symbols_list in get_many_objects(keys):
+            if token_symbols_list:
+                token_symbols.update(token_symbols_list)
+    logg.info(f'Indexing keys of: {len(identifiers)} accounts and: {len(token_symbols)} tokens.')
+
+    for token_symbol in token_symbols:
+        symbol = token_symbol.encode('utf-8')
+        for salt in token_salts:
+            index[cache_data_key(symbol, salt)] = CachePolicy.namespace(salt)
+        for identifier in identifiers:
+            for salt in account_token_salts:
+                index[cache_data_key([identifier, symbol], salt)] = CachePolicy.namespace(salt)
+    chain_str = str(ChainSpec.from_chain_str(config.get('CHAIN_SPEC')))
+    index[cache_data_key(chain_str.encode('utf-8'), MetadataPointer.TOKEN_DEFAULT)] = 'token_default'
+    return index
+
+
+def namespace_of(key: str, index: dict) -> str:
+    if namespace := index.get(key):
+        return namespace
+    if key.endswith(':digest') and (namespace := index.get(key[:-len(':digest')])):
+        return namespace
+    if uuid_pattern.match(key):
+        return 'account_creation'
+    if key.startswith('refresh:') or key == MetadataRefresh.stats_key:
+        return 'refresh'
+    if hash_pattern.match(key):
+        return 'unattributed'
+    return 'other'
+
+
+def main():
+    index = index_keys()
+    report = defaultdict(lambda: {'keys': 0, 'bytes': 0, 'persistent': 0, 'swept': 0})
+    cursor = None
+    while cursor != 0:
+        cursor, keys = Cache.store.scan(cursor=cursor or 0, count=args.count)
+        pipeline = Cache.store.pipeline(transaction=False)
+        for key in keys:
+            pipeline.memory_usage(key)
+            pipeline.ttl(key)
+        results = pipeline.execute(raise_on_error=False)
+        sweep = Cache.store.pipeline(transaction=False)
+        for position, key in enumerate(keys):
+            memory_usage, ttl = results[position * 2:position * 2 + 2]
+            if not isinstance(memory_usage, int):
+                # the key expired or was deleted since it was scanned.
+                continue
+            namespace = namespace_of(key, index)
+            entry = report[namespace]
+            entry['keys'] += 1
+            entry['bytes'] += memory_usage
+            if ttl == -1:
+                entry['persistent'] += 1
+                if args.sweep and (namespace_ttl := CachePolicy.ttls.get(namespace)):
+                    sweep.expire(key, namespace_ttl)
+                    entry['swept'] += 1
+        sweep.execute()
+
+    print(f'{"namespace":<24}{"keys":>12}{"bytes":>16}{"bytes/key":>12}{"persistent":>12}{"swept":>10}  policy')
+    for namespace, entry in sorted(report.items(), key=lambda item: item[1]['bytes'], reverse=True):
+        ttl = CachePolicy.ttls.get(namespace)
+        policy = f'{"sliding " if namespace in CachePolicy.sliding else ""}ttl {ttl}s' if ttl else 'persist'
+        if namespace not in CachePolicy.namespaces:
+            policy = '-'
+        print(f'{namespace:<24}{entry["keys"]:>12}{entry["bytes"]:>16}{entry["bytes"] // entry["keys"]:>12}'
+              f'{entry["persistent"]:>12}{entry["swept"]:>10}  {policy}')
+
+    print(f'\n{"metadata refresh":<24}{"changed":>12}{"unchanged":>12}{"unchanged %":>14}')
+    for cic_type, entry in sorted(MetadataRefresh.stats().items()):
+        print(f'{cic_type:<24}{entry["changed"]:>12}{entry["unchanged"]:>12}{entry["unchanged_fraction"] * 100:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
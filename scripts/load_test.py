@@ -0,0 +1,537 @@
+#!/usr/bin/env python
+"""Simulates the dial sessions of a synthetic population of accounts against the ussd server and reports the latency of
+each menu, the throughput and the cache and database operations each request costs e.g.:
+
+    load_test.py -c config/test --accounts 200 --sessions 2000 --concurrency 8
+    load_test.py -c config/test --redis config --database config --celery eager --sessions 2000
+    load_test.py -c config/ --url http://localhost:9000/ --sessions 20000 --concurrency 64
+
+Without a url the server application is called in process through wsgi. Redis is replaced by fakeredis or is the
+configured redis, the database is a fresh sqlite file or the configured database, and celery tasks either run eagerly in
+process, so their cost is counted in the request that queued them, or are dropped in an in-memory broker. cic-eth is
+always replaced in process by a stand-in whose calls return placeholder results.
+
+With a url the requests are posted to a running server e.g. uwsgi. The population is written to the configured database
+and redis, which must be the ones the server uses, and redis commands are read from the server's command stats.
+
+A journey is a list of states a session passes through. The path between consecutive states is the shortest path
+through the transitions in the machine transitions directory that avoids exits and blocked pins, and the input for each
+step is derived from the condition guarding its transition. A session that ends or lands in any other state than its
+path expects is counted as diverged.
+"""
+# standard imports
+import argparse
+import collections
+import functools
+import io
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+# third party imports
+import celery
+import redis
+from cic_types.condiments import MetadataPointer
+from confini import Config
+from sqlalchemy import event
+
+# local imports
+from cic_ussd.account.metadata import UssdMetadataPointer
+from cic_ussd.cache import cache_data_key, Cache, get_cached_object, set_many
+from cic_ussd.db import dsn_from_config
+from cic_ussd.db.models.account import Account
+from cic_ussd.db.models.base import SessionBase
+from cic_ussd.files.local_files import json_file_parser
+from cic_ussd.phone_number import E164Format
+
+logging.basicConfig(level=logging.WARNING)
+logg = logging.getLogger()
+
+root_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+config_directory = os.path.join(root_directory, 'config', 'test')
+
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument('-c', type=str, default=config_directory, help='config directory')
+arg_parser.add_argument('--env-prefix', default=os.environ.get('CONFINI_ENV_PREFIX'), dest='env_prefix', type=str, help='environment prefix for variables to overwrite configuration')
+arg_parser.add_argument('--url', type=str, help='url of a running ussd server, the application is called in process if omitted')
+arg_parser.add_argument('--redis', choices=('fake', 'config'), default='fake', help='redis used in process')
+arg_parser.add_argument('--database', choices=('sqlite', 'config'), default='sqlite', help='database used in process')
+arg_parser.add_argument('--celery', choices=('eager', 'stub'), default='stub', help='run tasks eagerly in process or drop them in an in-memory broker')
+arg_parser.add_argument('--accounts', type=int, default=100, help='number of accounts in the synthetic population')
+arg_parser.add_argument('--sessions', type=int, default=1000, help='number of dial sessions to run')
+arg_parser.add_argument('--concurrency', type=int, default=8, help='number of sessions run concurrently')
+arg_parser.add_argument('--journeys', type=str, help='comma separated names of the journeys to run, all by default')
+arg_parser.add_argument('--seed', type=int, help='seed of the random choice of accounts, journeys and inputs')
+arg_parser.add_argument('-v', action='store_true', help='be verbose')
+args = arg_parser.parse_args()
+
+if args.v:
+    logg.setLevel(logging.INFO)
+if args.seed is not None:
+    random.seed(args.seed)
+
+token_symbol = 'GFT'
+default_token_data = {
+    'symbol': token_symbol,
+    'address': '32e860c2a0645d1b7b005273696905f5d6dc5d05',
+    'name': 'Giftable Token',
+    'decimals': 6,
+    'converters': []
+}
+
+# journeys by name with the weight they are chosen with and the states their sessions pass through.
+journeys = {
+    'balance': (30, ['start', 'account_balances']),
+    'send': (25, ['start', 'exit_successful_transaction']),
+    'statement': (20, ['start', 'first_transaction_set']),
+    'signup': (10, ['initial_language_selection', 'account_creation_prompt']),
+    'pin_change': (5, ['start', 'enter_current_pin', 'complete']),
+    'guardian_addition': (5, ['start', 'exit_guardian_addition_success']),
+    'guardian_list': (5, ['start', 'guardian_list'])
+}
+
+# conditions a path may not take.
+avoided_conditions = {'is_blocked_pin', 'is_locked_account'}
+
+# inputs satisfying the conditions guarding transitions, by the name of the condition.
+menu_inputs = {
+    'menu_one_selected': '1',
+    'menu_two_selected': '2',
+    'menu_three_selected': '3',
+    'menu_four_selected': '4',
+    'menu_five_selected': '5',
+    'menu_six_selected': '6',
+    'menu_nine_selected': '9',
+    'menu_eleven_selected': '11',
+    'menu_twenty_two_selected': '22',
+    'menu_ninety_nine_selected': '99',
+    'menu_zero_zero_selected': '00',
+    'is_age_valid': '30',
+    'is_valid_date': '1990',
+    'is_valid_transaction_amount': '1'
+}
+
+# inputs of transitions without a condition, by source state.
+unconditioned_inputs = {
+    'enter_full_name': 'Wanjiku Njeri'
+}
+
+
+def transition_conditions(transition: dict) -> list:
+    conditions = transition.get('conditions') or []
+    conditions = [conditions] if isinstance(conditions, str) else conditions
+    return [condition.rsplit('.', 1)[-1] for condition in conditions]
+
+
+def load_transitions(transitions_directory: str) -> dict:
+    transitions = collections.defaultdict(list)
+    for transition in json_file_parser(filepath=transitions_directory):
+        transitions[transition.get('source')].append(transition)
+    return transitions
+
+
+def shortest_path(transitions: dict, source: str, dest: str) -> list:
+    """Finds the fewest transitions from a state to another that do not pass through exits or blocked pins."""
+    paths = collections.deque([(source, [])])
+    visited = {source}
+    while paths:
+        state, path = paths.popleft()
+        for transition in transitions.get(state, []):
+            if transition.get('dest') == dest:
+                return path + [transition]
+            if transition.get('dest') in visited or transition.get('dest').startswith('exit'):
+                continue
+            if avoided_conditions.intersection(transition_conditions(transition)):
+                continue
+            visited.add(transition.get('dest'))
+            paths.append((transition.get('dest'), path + [transition]))
+    raise ValueError(f'No path from: {source} to: {dest} in the transitions.')
+
+
+def build_journeys(transitions: dict) -> dict:
+    """Expands the states of each journey into the transitions between them."""
+    names = args.journeys.split(',') if args.journeys else list(journeys)
+    built = {}
+    for name in names:
+        weight, states = journeys[name]
+        path = []
+        for source, dest in zip(states, states[1:]):
+            path += shortest_path(transitions, source, dest)
+        built[name] = (weight, states[0], path)
+        logg.info(f'journey: {name} passes through: {[transition.get("dest") for transition in path]}')
+    return built
+
+
+class Dialer:
+    """An account of the synthetic population, or a new phone number for a signup, and the pins it knows."""
+
+    def __init__(self, phone_number: str, pin: str = None):
+        self.phone_number = phone_number
+        self.pin = pin
+
+    def new_pin(self) -> str:
+        return '1111' if self.pin == '0000' else '0000'
+
+
+def step_input(transition: dict, dialer: Dialer, population: list) -> str:
+    """Derives the input that takes a session through a transition."""
+    for condition in transition_conditions(transition):
+        if condition in menu_inputs:
+            return menu_inputs[condition]
+        if condition == 'is_authorized_pin':
+            return dialer.pin
+        if condition in ('is_valid_pin', 'is_valid_new_pin', 'pins_match'):
+            return dialer.new_pin() if dialer.pin else '0000'
+        if condition in ('is_valid_recipient', 'is_valid_guardian_addition'):
+            return random.choice([other for other in population if other is not dialer]).phone_number
+    if not transition_conditions(transition):
+        return unconditioned_inputs.get(transition.get('source'), '1')
+    # selections of languages, villages, tokens, products, genders and survey bands.
+    return '1'
+
+
+def phone_number() -> str:
+    return f'+2547{random.randint(10000000, 99999999)}'
+
+
+def create_population(session) -> list:
+    """Creates activated accounts holding a balance of the default token with their preferences cached."""
+    population = []
+    mapping = {}
+    for _ in range(args.accounts):
+        account = Account(uuid.uuid4().hex + uuid.uuid4().hex[:8], phone_number())
+        account.create_password('0000')
+        account.activate_account()
+        session.add(account)
+        population.append(Dialer(account.phone_number, '0000'))
+
+        identifier = bytes.fromhex(account.blockchain_address)
+        balances_identifier = [identifier, token_symbol.encode('utf-8')]
+        mapping[cache_data_key(identifier, MetadataPointer.TOKEN_ACTIVE)] = token_symbol
+        mapping[cache_data_key(identifier, MetadataPointer.TOKEN_SYMBOLS_LIST)] = json.dumps([token_symbol])
+        mapping[cache_data_key(identifier, MetadataPointer.TOKEN_DATA_LIST)] = json.dumps([default_token_data])
+        mapping[cache_data_key(identifier, MetadataPointer.PREFERENCES)] = json.dumps(
+            {'preferred_language': random.choice(['en', 'sw'])})
+        mapping[cache_data_key(balances_identifier, MetadataPointer.BALANCES)] = json.dumps({
+            'address': default_token_data.get('address'),
+            'converters': [],
+            'balance_network': 50000000,
+            'balance_outgoing': 0,
+            'balance_incoming': 0
+        })
+        mapping[cache_data_key(balances_identifier, UssdMetadataPointer.BALANCE_SPENDABLE)] = 50.0
+    session.commit()
+    mapping[cache_data_key(token_symbol.encode('utf-8'), MetadataPointer.TOKEN_DATA)] = json.dumps(default_token_data)
+    set_many(mapping)
+    return population
+
+
+class Operations:
+    """Counts the redis commands, redis round trips and sql statements made by the thread handling a request."""
+    counts = threading.local()
+
+    @classmethod
+    def reset(cls):
+        cls.counts.redis_commands = 0
+        cls.counts.redis_round_trips = 0
+        cls.counts.sql = 0
+
+    @classmethod
+    def add(cls, name: str, count: int = 1):
+        if hasattr(cls.counts, name):
+            setattr(cls.counts, name, getattr(cls.counts, name) + count)
+
+    @classmethod
+    def read(cls) -> dict:
+        return {name: getattr(cls.counts, name) for name in ('redis_commands', 'redis_round_trips', 'sql')}
+
+    @classmethod
+    def install(cls, engine):
+        execute_command = redis.client.Redis.execute_command
+        immediate_execute_command = redis.client.Pipeline.immediate_execute_command
+        pipeline_execute = redis.client.Pipeline.execute
+
+        def counted_execute_command(client, *command_args, **options):
+            cls.add('redis_commands')
+            cls.add('redis_round_trips')
+            return execute_command(client, *command_args, **options)
+
+        def counted_immediate_execute_command(pipeline, *command_args, **options):
+            cls.add('redis_commands')
+            cls.add('redis_round_trips')
+            return immediate_execute_command(pipeline, *command_args, **options)
+
+        def counted_pipeline_execute(pipeline, *execute_args, **options):
+            if pipeline.command_stack:
+                cls.add('redis_commands', len(pipeline.command_stack))
+                cls.add('redis_round_trips')
+            return pipeline_execute(pipeline, *execute_args, **options)
+
+        redis.client.Redis.execute_command = counted_execute_command
+        redis.client.Pipeline.immediate_execute_command = counted_immediate_execute_command
+        redis.client.Pipeline.execute = counted_pipeline_execute
+        event.listen(engine, 'before_cursor_execute', lambda *event_args, **event_kwargs: cls.add('sql'))
+
+
+class CicEthResult:
+    """Stands in for the result of a cic-eth task."""
+
+    def __init__(self, value=None):
+        self.id = str(uuid.uuid4())
+        self.value = value
+
+    def get(self, *get_args, **get_kwargs):
+        return self.value
+
+
+class CicEthStandIn:
+    """Stands in for the cic-eth api, calls return placeholder results without reaching a chain."""
+
+    def __init__(self, *api_args, **api_kwargs):
+        pass
+
+    def default_token(self, *call_args, **call_kwargs):
+        return CicEthResult(default_token_data)
+
+    def __getattr__(self, name):
+        return lambda *call_args, **call_kwargs: CicEthResult()
+
+
+def install_cic_eth_stand_in():
+    import cic_ussd.account.balance
+    import cic_ussd.account.statement
+    import cic_ussd.account.tokens
+    import cic_ussd.account.transaction
+    import cic_ussd.db.models.account
+    for module in (cic_ussd.account.balance,
+                   cic_ussd.account.statement,
+                   cic_ussd.account.tokens,
+                   cic_ussd.account.transaction,
+                   cic_ussd.db.models.account):
+        module.Api = CicEthStandIn
+    cic_ussd.account.balance.DemurrageApi = CicEthStandIn
+
+
+def migrate(data_source_name: str, engine: str):
+    import alembic.command
+    from alembic.config import Config as AlembicConfig
+    migrations_directory = os.path.join(root_directory, 'cic_ussd', 'db', 'migrations', engine)
+    if not os.path.isdir(migrations_directory):
+        migrations_directory = os.path.join(root_directory, 'cic_ussd', 'db', 'migrations', 'default')
+    alembic_config = AlembicConfig(os.path.join(migrations_directory, 'alembic.ini'))
+    alembic_config.set_main_option('sqlalchemy.url', data_source_name)
+    alembic_config.set_main_option('script_location', migrations_directory)
+    alembic.command.upgrade(alembic_config, 'head')
+
+
+def in_process_server():
+    """Loads the ussd server with the chosen stand-ins and returns a function posting a request body to it."""
+    # the server reads its config on import, the stand-ins are configured through the environment it overrides it from.
+    overrides = {'CELERY_BROKER_URL': 'memory://', 'CELERY_RESULT_URL': 'cache+memory://'}
+    if args.database == 'sqlite':
+        overrides.update({
+            'DATABASE_ENGINE': 'sqlite',
+            'DATABASE_DRIVER': 'pysqlite',
+            'DATABASE_NAME': os.path.join(tempfile.mkdtemp(), 'cic_ussd_load_test.sqlite'),
+            'DATABASE_POOL_SIZE': '1'
+        })
+        # sqlite connections are not shared across the threads running sessions.
+        SessionBase.poolable = False
+        SessionBase.transactional = False
+    for name, value in overrides.items():
+        os.environ[f'{args.env_prefix or ""}{name}'] = value
+    if args.redis == 'fake':
+        import fakeredis
+        redis.StrictRedis = functools.partial(fakeredis.FakeStrictRedis, server=fakeredis.FakeServer())
+    install_cic_eth_stand_in()
+
+    sys.argv = [sys.argv[0], '-c', args.c]
+    if args.env_prefix:
+        sys.argv += ['--env-prefix', args.env_prefix]
+    from cic_ussd.runnable.daemons import cic_user_ussd_server as server
+
+    if args.database == 'sqlite':
+        migrate(server.data_source_name, 'sqlite')
+    if args.celery == 'eager':
+        celery.current_app.conf.update({'task_always_eager': True})
+        import cic_ussd.tasks
+    Operations.install(SessionBase.engine)
+
+    def post(body: bytes) -> tuple:
+        environ = {
+            'REQUEST_METHOD': 'POST',
+            'PATH_INFO': '/',
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body)
+        }
+        status = []
+        response = b''.join(server.application(environ, lambda response_status, headers: status.append(response_status)))
+        return status[0].startswith('200'), response.decode('utf-8')
+
+    return post, server.valid_service_codes[0], server.config
+
+
+def remote_server():
+    """Connects to the database and redis of a running ussd server and returns a function posting a request body to it."""
+    config = Config(args.c, env_prefix=args.env_prefix)
+    config.process()
+    config.censor('PASSWORD', 'DATABASE')
+    SessionBase.connect(dsn_from_config(config), pool_size=int(config.get('DATABASE_POOL_SIZE') or 1))
+    Cache.store = redis.StrictRedis(host=config.get('REDIS_HOST'),
+                                    port=config.get('REDIS_PORT'),
+                                    password=config.get('REDIS_PASSWORD'),
+                                    db=config.get('REDIS_DATABASE'),
+                                    decode_responses=True)
+    E164Format.region = config.get('E164_REGION')
+
+    def post(body: bytes) -> tuple:
+        request = Request(args.url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with urlopen(request, timeout=60) as response:
+                return response.status == 200, response.read().decode('utf-8')
+        except Exception as error:
+            logg.info(f'request failed: {error}')
+            return False, ''
+
+    return post, config.get('USSD_SERVICE_CODE').split(',')[0], config
+
+
+def redis_commands() -> int:
+    return sum(stats.get('calls', 0) for stats in Cache.store.info('commandstats').values())
+
+
+class Report:
+    """Collects the latency and operations of each request by the menu it was expected to render."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = collections.defaultdict(list)
+        self.operations = collections.defaultdict(collections.Counter)
+        self.journeys = collections.defaultdict(collections.Counter)
+        self.failures = 0
+
+    def request(self, menu: str, latency: float, operations: dict):
+        with self.lock:
+            self.latencies[menu].append(latency)
+            self.operations[menu].update(operations)
+
+    def journey(self, name: str, outcome: str):
+        with self.lock:
+            self.journeys[name][outcome] += 1
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+def run_journey(name: str, entry: str, path: list, dialer: Dialer, population: list, post, service_code: str,
+                report: Report, in_process: bool):
+    """Dials a session through the path of a journey and records each request."""
+    external_session_id = cache_data_key(dialer.phone_number.encode('utf-8'), MetadataPointer.NONE)
+    # the provider starts a new session for each dial.
+    Cache.store.delete(external_session_id)
+    inputs = []
+    steps = [(entry, None)] + [(transition.get('dest'), transition) for transition in path]
+    for position, (menu, transition) in enumerate(steps):
+        if transition is not None:
+            inputs.append(step_input(transition, dialer, population))
+        body = json.dumps({'ussd_code': service_code, 'msisdn': dialer.phone_number, 'ussd_response': '*'.join(inputs)})
+        Operations.reset()
+        start = time.perf_counter()
+        ok, response = post(body.encode('utf-8'))
+        latency = time.perf_counter() - start
+        if not ok:
+            report.failure()
+            report.journey(name, 'failed')
+            return
+        report.request(menu, latency, Operations.read() if in_process else {})
+        ended = response.startswith('END') and position < len(steps) - 1
+        if in_process:
+            ussd_session = get_cached_object(external_session_id) or {}
+            ended = ended or ussd_session.get('state') != menu
+        if ended:
+            logg.info(f'journey: {name} of: {dialer.phone_number} diverged at: {menu}, inputs: {inputs}')
+            report.journey(name, 'diverged')
+            return
+    if name == 'pin_change':
+        dialer.pin = dialer.new_pin()
+    report.journey(name, 'completed')
+
+
+def main():
+    in_process = args.url is None
+    post, service_code, config = in_process_server() if in_process else remote_server()
+    journey_paths = build_journeys(load_transitions(config.get('MACHINE_TRANSITIONS')))
+
+    session = SessionBase.create_session()
+    population = create_population(session)
+    session.close()
+    if len(population) < 2:
+        raise SystemExit('At least two accounts are required for send and guardian journeys.')
+
+    idle = queue.Queue()
+    for dialer in population:
+        idle.put(dialer)
+    names = list(journey_paths)
+    weights = [journey_paths[name][0] for name in names]
+    report = Report()
+
+    def run_session(_):
+        name = random.choices(names, weights)[0]
+        weight, entry, path = journey_paths[name]
+        if name == 'signup':
+            run_journey(name, entry, path, Dialer(phone_number()), population, post, service_code, report, in_process)
+            return
+        # a dialer runs one session at a time since its session is keyed by its phone number.
+        dialer = idle.get()
+        try:
+            run_journey(name, entry, path, dialer, population, post, service_code, report, in_process)
+        finally:
+            idle.put(dialer)
+
+    commands = None if in_process else redis_commands()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(run_session, range(args.sessions)))
+    elapsed = time.perf_counter() - start
+
+    requests = sum(len(latencies) for latencies in report.latencies.values())
+    print(f'sessions: {args.sessions}, concurrency: {args.concurrency}, requests: {requests}, '
+          f'failures: {report.failures}, {"in process" if in_process else args.url}, redis: {args.redis}, '
+          f'database: {args.database}, celery: {args.celery}')
+    print(f'requests per second: {requests / elapsed:.1f}, sessions per second: {args.sessions / elapsed:.1f}')
+    if not in_process and requests:
+        # the command stats queries themselves are not counted.
+        print(f'redis commands per request: {(redis_commands() - commands - 1) / requests:.1f}')
+
+    print(f'\n{"journey":<20}{"completed":>10}{"diverged":>10}{"failed":>8}')
+    for name, outcomes in sorted(report.journeys.items()):
+        print(f'{name:<20}{outcomes["completed"]:>10}{outcomes["diverged"]:>10}{outcomes["failed"]:>8}')
+
+    print(f'\n{"menu":<36}{"requests":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}'
+          f'{"redis":>8}{"trips":>8}{"sql":>8}')
+    for menu, latencies in sorted(report.latencies.items(), key=lambda item: len(item[1]), reverse=True):
+        latencies.sort()
+        operations = report.operations[menu]
+        counts = ''.join(f'{operations[name] / len(latencies):>8.1f}' if in_process else f'{"-":>8}'
+                         for name in ('redis_commands', 'redis_round_trips', 'sql'))
+        print(f'{menu:<36}{len(latencies):>9}{percentile(latencies, 0.5) * 1000:>9.1f}'
+              f'{percentile(latencies, 0.95) * 1000:>9.1f}{percentile(latencies, 0.99) * 1000:>9.1f}{counts}')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,10 @@ import json
 from cic_types.models.person import get_contact_data_from_vcard
 
 # local imports
-from cic_ussd.account.metadata import get_cached_preferred_language, parse_account_metadata
+from cic_ussd.account.metadata import (DisplayNames,
+                                       get_cached_preferred_language,
+                                       parse_account_metadata,
+                                       standard_metadata_ids)
 
 # test imports
 from tests.helpers.accounts import blockchain_address
@@ -26,3 +29,23 @@ def test_parse_account_metadata(person_metadata):
     parsed_account_metadata = f'{given_name} {family_name} {phone_number}'
     assert parse_account_metadata(person_metadata) == parsed_account_metadata
 
+
+
+def test_display_names(monkeypatch, person_metadata):
+    DisplayNames.clear()
+    monkeypatch.setattr(DisplayNames, 'capacity', 1)
+    cached_person_metadata = json.dumps(person_metadata)
+    misses = DisplayNames.misses
+    assert DisplayNames.get(cached_person_metadata) == parse_account_metadata(person_metadata)
+    assert DisplayNames.get(cached_person_metadata) == parse_account_metadata(person_metadata)
+    assert DisplayNames.misses == misses + 1
+    DisplayNames.get(json.dumps(person_metadata, indent=1))
+    assert len(DisplayNames.entries) == 1
+    DisplayNames.get(cached_person_metadata)
+    assert DisplayNames.misses == misses + 3
+
+
+def test_standard_metadata_ids(activated_account, cache_person_metadata, pending_account, person_metadata):
+    assert standard_metadata_ids([activated_account, None, pending_account, activated_account]) == [
+        parse_account_metadata(person_metadata), None, pending_account.phone_number, parse_account_metadata(person_metadata)]
+    assert standard_metadata_ids([]) == []
@@ -0,0 +1,73 @@
+# standard imports
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# external imports
+import pytest
+from chainlib.eth.address import to_checksum_address
+
+# local imports
+from cic_ussd.account.chain import Chain
+from cic_ussd.account.sink_address import SINK_ADDRESS_SELECTOR, SinkAddressResolver
+from cic_ussd.account.tokens import retrieve_sink_address
+from cic_ussd.error import JsonRpcError
+
+# test imports
+from tests.helpers.accounts import blockchain_address
+
+
+@pytest.fixture(scope='function')
+def stub_rpc_server(monkeypatch):
+    calls = []
+    sink_addresses = {}
+
+    class RpcHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            call = payload['params'][0]
+            calls.append(call)
+            response = {'jsonrpc': '2.0', 'id': payload['id']}
+            if sink_address := sink_addresses.get(call['to'][-40:].lower()):
+                response['result'] = f'0x{sink_address.lower().rjust(64, "0")}'
+            else:
+                response['error'] = {'code': -32000, 'message': 'execution reverted'}
+            body = json.dumps(response).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RpcHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(Chain, 'rpc_provider', f'http://127.0.0.1:{server.server_port}')
+    monkeypatch.setattr(SinkAddressResolver, 'resolved', {})
+    yield calls, sink_addresses
+    server.shutdown()
+    server.server_close()
+
+
+def test_retrieve_sink_address(stub_rpc_server):
+    calls, sink_addresses = stub_rpc_server
+    token_address = blockchain_address()
+    sink_address = blockchain_address()
+    sink_addresses[token_address] = sink_address
+
+    assert retrieve_sink_address(token_address) == sink_address.lower()
+    assert retrieve_sink_address(token_address) == sink_address.lower()
+    assert calls == [{'to': to_checksum_address(token_address), 'data': SINK_ADDRESS_SELECTOR, 'gas': hex(100000)}]
+
+    SinkAddressResolver.resolved[to_checksum_address(token_address)] = (sink_address, 0)
+    retrieve_sink_address(token_address)
+    assert len(calls) == 2
+
+    with pytest.raises(JsonRpcError):
+        retrieve_sink_address(blockchain_address())
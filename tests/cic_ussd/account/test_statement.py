@@ -8,12 +8,15 @@ from cic_types.condiments import MetadataPointer
 
 # local imports
 from cic_ussd.account.statement import (filter_statement_transactions,
-                                        generate,
                                         get_cached_statement,
+                                        insert_statement_transaction,
                                         parse_statement_transactions,
-                                        query_statement)
+                                        process,
+                                        query_statement,
+                                        render_statement_pages)
 from cic_ussd.account.transaction import transaction_actors
 from cic_ussd.cache import cache_data_key, get_cached_data
+from cic_ussd.translation import translation_for
 
 # test imports
 from tests.helpers.accounts import blockchain_address
@@ -24,26 +27,28 @@ def test_filter_statement_transactions(transactions_list):
     assert len(filter_statement_transactions(transactions_list)) == 1
 
 
-def test_generate(activated_account,
-                  cache_default_token_data,
-                  cache_preferences,
-                  celery_session_worker,
-                  init_cache,
-                  init_database,
-                  set_locale_files,
-                  preferences,
-                  preferences_metadata_url,
-                  transactions_list):
+def test_process(activated_account,
+                 cache_default_token_data,
+                 cache_preferences,
+                 celery_session_worker,
+                 init_cache,
+                 init_database,
+                 set_locale_files,
+                 preferences,
+                 preferences_metadata_url,
+                 transactions_list):
     statement_transactions = filter_statement_transactions(transactions_list)
+    querying_party = activated_account.blockchain_address
+    transactions = []
     for transaction in statement_transactions:
-        querying_party = activated_account.blockchain_address
         recipient_transaction, sender_transaction = transaction_actors(transaction)
         if recipient_transaction.get('blockchain_address') == querying_party:
             recipient_transaction['alt_blockchain_address'] = sender_transaction.get('blockchain_address')
-            generate(querying_party, None, recipient_transaction)
+            transactions.append(recipient_transaction)
         if sender_transaction.get('blockchain_address') == querying_party:
             sender_transaction['alt_blockchain_address'] = recipient_transaction.get('blockchain_address')
-            generate(querying_party, None, sender_transaction)
+            transactions.append(sender_transaction)
+    process(querying_party, None, transactions)
     time.sleep(2)
     identifier = bytes.fromhex(activated_account.blockchain_address)
     key = cache_data_key(identifier, MetadataPointer.STATEMENT)
@@ -65,6 +70,27 @@ def test_parse_statement_transactions(cache_default_token_data, statement, load_
     parsed_transaction.startswith('Sent')
 
 
+def test_insert_statement_transaction(statement):
+    transactions = [{**statement[0], 'tx_hash': f'0x{i:064x}', 'timestamp': 1626272000 + i} for i in range(12)]
+    statement_transactions = []
+    for transaction in reversed(transactions):
+        statement_transactions = insert_statement_transaction(statement_transactions, transaction)
+    assert [transaction['timestamp'] for transaction in statement_transactions] == \
+           [1626272000 + i for i in range(11, 2, -1)]
+    updated_transaction = {**transactions[11], 'token_value': 60000000}
+    statement_transactions = insert_statement_transaction(statement_transactions, updated_transaction)
+    assert len(statement_transactions) == 9
+    assert statement_transactions[0] == updated_transaction
+    older_transaction = {**transactions[0], 'tx_hash': '0x01'}
+    assert insert_statement_transaction(statement_transactions, older_transaction) == statement_transactions
+
+
+def test_render_statement_pages(cache_default_token_data, load_timezone, set_locale_files, statement):
+    statement_pages = render_statement_pages(statement, ['en', 'fr'])
+    assert statement_pages['en'][0] == parse_statement_transactions(statement)[0]
+    assert statement_pages['fr'][0].startswith(translation_for('helpers.sent', 'fr'))
+
+
 @pytest.mark.parametrize('blockchain_address, limit', [
     (blockchain_address(), 10),
     (blockchain_address(), 5)
@@ -7,6 +7,7 @@ import pytest
 from cic_ussd.account.chain import Chain
 from cic_ussd.account.transaction import (aux_transaction_data,
                                           from_wei,
+                                          resolve_transaction_accounts,
                                           to_wei,
                                           truncate,
                                           transaction_actors,
@@ -18,6 +19,7 @@ from cic_ussd.translation import translation_for
 
 
 # test imports
+from tests.helpers.accounts import blockchain_address
 
 
 def check_aux_data(action_tag_key, direction_tag_key, preferred_language, transaction_with_aux_data):
@@ -92,6 +94,21 @@ def test_validate_transaction_account(activated_account, init_database, transact
     assert f'Tx from sender: {sender_transaction.get("blockchain_address")} has no matching account in system.'
 
 
+def test_resolve_transaction_accounts(activated_account, init_database, valid_recipient):
+    unknown_address = blockchain_address()
+    address_pairs = [
+        (activated_account.blockchain_address, valid_recipient.blockchain_address),
+        (valid_recipient.blockchain_address, unknown_address),
+        (unknown_address, None)
+    ]
+    assert resolve_transaction_accounts(address_pairs, init_database) == [
+        (activated_account, valid_recipient),
+        (valid_recipient, None),
+        (None, None)
+    ]
+    assert resolve_transaction_accounts([], init_database) == []
+
+
 @pytest.mark.parametrize("amount", [50, 0.10])
 def test_outgoing_transaction_processor(activated_account,
                                         amount,
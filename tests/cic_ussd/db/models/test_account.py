@@ -8,9 +8,11 @@ from cic_types.models.person import get_contact_data_from_vcard
 # local imports
 from cic_ussd.account.chain import Chain
 from cic_ussd.cache import get_cached_data
+from cic_ussd.context import RequestContext
 from cic_ussd.db.enum import AccountStatus
 from cic_ussd.db.models.account import Account, create, cache_creation_task_uuid
 from cic_ussd.db.models.task_tracker import TaskTracker
+from cic_ussd.encoder import password_hash_rounds, PinHasher
 
 # test imports
 from tests.helpers.accounts import blockchain_address, phone_number
@@ -55,6 +57,15 @@ def test_account_statuses(init_database, pending_account):
 def test_get_by_phone_number(activated_account, init_database):
     account = Account.get_by_phone_number(activated_account.phone_number, init_database)
     assert account == activated_account
+    account = Account.get_by_phone_number(activated_account.phone_number.strip('+'), init_database)
+    assert account == activated_account
+
+
+def test_get_by_phone_numbers(activated_account, init_database, valid_recipient):
+    phone_numbers = [valid_recipient.phone_number, phone_number(), activated_account.phone_number.strip('+')]
+    accounts = Account.get_by_phone_numbers(phone_numbers, init_database)
+    assert accounts == [valid_recipient, None, activated_account]
+    assert Account.get_by_phone_numbers([], init_database) == []
 
 
 def test_has_preferred_language(activated_account, cache_preferences):
@@ -103,3 +114,27 @@ def test_reset_pin(init_database, activated_account):
     assert activated_account.get_status(init_database) == AccountStatus.ACTIVE.name
     activated_account.reset_pin(init_database)
     assert activated_account.get_status(init_database) == AccountStatus.RESET.name
+
+
+def test_verify_password_rehash(init_database, monkeypatch, pending_account):
+    monkeypatch.setattr(PinHasher, 'rounds', 4)
+    pending_account.create_password('0000')
+    monkeypatch.setattr(PinHasher, 'rounds', 5)
+    assert pending_account.verify_password('1111') is False
+    assert password_hash_rounds(pending_account.password_hash) == 4
+    assert pending_account.verify_password('0000') is True
+    assert password_hash_rounds(pending_account.password_hash) == 5
+    assert pending_account.verify_password('0000') is True
+
+
+def test_get_status_flushes_on_change(activated_account, init_database):
+    with RequestContext() as context:
+        for _ in range(3):
+            assert activated_account.get_status(init_database) == AccountStatus.ACTIVE.name
+            assert activated_account.has_valid_pin(init_database) is True
+            assert activated_account.pin_is_blocked(init_database) is False
+        assert context.flushes == 0
+        activated_account.failed_pin_attempts = 3
+        assert activated_account.pin_is_blocked(init_database) is True
+        assert activated_account.get_status(init_database) == AccountStatus.LOCKED.name
+        assert context.flushes == 1
@@ -1,4 +1,5 @@
 # local imports
+from cic_ussd.context import RequestContext
 from cic_ussd.db.models.task_tracker import TaskTracker
 
 
@@ -11,3 +12,9 @@ def test_task_tracker(init_database):
 
     queried_task = init_database.query(TaskTracker).get(1)
     assert queried_task.task_uuid == task_uuid
+
+
+def test_task_tracker_add_counts_flush(init_database):
+    with RequestContext() as context:
+        TaskTracker.add(init_database, '31e85315-feee-4b6d-995e-223569082cc4')
+        assert context.flushes == 1
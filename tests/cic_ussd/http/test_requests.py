@@ -12,6 +12,7 @@ from cic_ussd.http.requests import (error_handler,
                                     get_query_parameters,
                                     get_request_endpoint,
                                     get_request_method,
+                                    HttpClient,
                                     make_request)
 from cic_ussd.error import UnsupportedMethodError
 # test imports
@@ -67,3 +68,18 @@ def test_make_request(mock_response, mock_url):
             request_mocker.register_uri('DELETE', mock_url, status_code=200, reason='OK')
             make_request('DELETE', mock_url)
         assert str(error.value) == 'Unsupported method: DELETE'
+
+
+def test_http_client(mock_response, mock_url):
+    session = HttpClient.session()
+    assert HttpClient.session() is session
+    adapter = session.get_adapter(mock_url)
+    assert adapter._pool_maxsize == HttpClient.pool_size
+    assert adapter.max_retries.total == HttpClient.retries
+    with requests_mock.Mocker(real_http=False) as request_mocker:
+        request_mocker.register_uri('GET', mock_url, status_code=200, reason='OK', json=mock_response)
+        response = HttpClient.request('GET', mock_url)
+        assert response.json() == mock_response
+        assert request_mocker.last_request.timeout == HttpClient.timeout
+        HttpClient.request('GET', mock_url, timeout=1)
+        assert request_mocker.last_request.timeout == 1
@@ -21,6 +21,10 @@ def test_pin_reset(method, expected_response, expected_message, init_database, p
     assert response == expected_response
     assert message == expected_message
 
+    response, message = pin_reset(uwsgi_env, pin_blocked_account.phone_number.lstrip('+'), init_database)
+    assert response == expected_response
+    assert message == expected_message
+
     response, message = pin_reset(uwsgi_env, '070000000', init_database)
     assert response == ''
     assert message == '404 Not found'
@@ -5,6 +5,7 @@ import os
 import pytest
 
 # local imports
+from cic_ussd.error import InitializationError
 from cic_ussd.files.local_files import create_local_file_data_stores
 from cic_ussd.menu.ussd_menu import UssdMenu
 
@@ -51,3 +52,26 @@ def test_failed_create_ussd_menu():
     assert str(error.value) == "Menu already exists!"
     os.close(descriptor)
     os.remove(tmp_file)
+
+
+def test_menu_registry(load_ussd_menu):
+    assert UssdMenu.parent_menu('enter_current_pin') is UssdMenu.find_by_name('account_management')
+    assert UssdMenu.parent_menu('start')['name'] == 'exit_invalid_request'
+    assert UssdMenu.parent_menu('no_such_menu')['name'] == 'exit_invalid_request'
+    assert UssdMenu.find_by_name('no_such_menu')['name'] == 'exit_invalid_request'
+    assert UssdMenu.find_by_name('start')['display_key'] == 'ussd.start'
+    with pytest.raises(TypeError):
+        UssdMenu.find_by_name('start')['name'] = 'foo'
+
+
+def test_menu_registry_validation():
+    descriptor, tmp_file = create_tmp_file()
+    ussd_menu_db = create_local_file_data_stores(file_location=tmp_file, table_name="ussd_menu")
+    UssdMenu.ussd_menu_db = ussd_menu_db
+    UssdMenu(name='exit_invalid_request', description='foo-bar', parent=None)
+    UssdMenu(name='fizz', description='buzz', parent='foo')
+    with pytest.raises(InitializationError) as error:
+        UssdMenu.load_registry(['exit_invalid_request', 'fizz', 'bar'])
+    assert str(error.value) == 'No USSD Menu with names: bar, foo'
+    os.close(descriptor)
+    os.remove(tmp_file)
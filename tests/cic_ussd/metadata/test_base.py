@@ -3,13 +3,15 @@ import json
 import os
 
 # external imports
+import pytest
 import requests_mock
+from requests.exceptions import HTTPError
 from chainlib.hash import strip_0x
 from cic_types.condiments import MetadataPointer
 from cic_types.processor import generate_metadata_pointer
 
 # local imports
-from cic_ussd.metadata.base import UssdMetadataHandler
+from cic_ussd.metadata.base import create_many, MetadataRefresh, UssdMetadataHandler
 
 
 # external imports
@@ -41,3 +43,72 @@ def test_ussd_metadata_handler(activated_account,
         request_mocker.register_uri('GET', metadata_client.url, status_code=200, reason='OK', json=person_metadata)
         result = metadata_client.query().json()
         assert result == person_metadata
+
+
+def test_create_many(activated_account,
+                     custom_metadata,
+                     init_cache,
+                     person_metadata,
+                     setup_metadata_request_handler,
+                     setup_metadata_signer):
+    identifier = bytes.fromhex(strip_0x(activated_account.blockchain_address))
+    submissions = [
+        (UssdMetadataHandler(cic_type=MetadataPointer.PERSON, identifier=identifier), person_metadata),
+        (UssdMetadataHandler(cic_type=MetadataPointer.CUSTOM, identifier=identifier), custom_metadata)
+    ]
+    with requests_mock.Mocker(real_http=False) as request_mocker:
+        for handler, data in submissions:
+            request_mocker.register_uri('POST', handler.url, status_code=200, reason='OK', json=data)
+            request_mocker.register_uri('PUT', handler.url, status_code=200, reason='OK', json=data)
+        results = create_many(submissions)
+        assert [result.json() for result in results] == [person_metadata, custom_metadata]
+        assert len([request for request in request_mocker.request_history if request.method == 'POST']) == 2
+
+    with requests_mock.Mocker(real_http=False) as request_mocker:
+        handler, data = submissions[0]
+        request_mocker.register_uri('POST', handler.url, status_code=200, reason='OK', json=data)
+        request_mocker.register_uri('PUT', handler.url, status_code=200, reason='OK', json=data)
+        handler, data = submissions[1]
+        request_mocker.register_uri('POST', handler.url, status_code=400, reason='BAD REQUEST')
+        with pytest.raises(HTTPError):
+            create_many(submissions)
+        assert request_mocker.call_count == 3
+
+
+def test_refresh(activated_account,
+                 init_cache,
+                 mocker,
+                 preferences,
+                 setup_metadata_request_handler,
+                 setup_metadata_signer):
+    identifier = bytes.fromhex(strip_0x(activated_account.blockchain_address))
+    metadata_client = UssdMetadataHandler(cic_type=MetadataPointer.PREFERENCES, identifier=identifier)
+    transform = mocker.Mock(side_effect=json.dumps)
+    with requests_mock.Mocker(real_http=False) as request_mocker:
+        request_mocker.register_uri('GET', metadata_client.url, status_code=200, reason='OK', json=preferences)
+        assert metadata_client.refresh(transform) is True
+        assert json.loads(metadata_client.get_cached_metadata()) == preferences
+        assert request_mocker.last_request.headers.get('If-None-Match') is None
+
+        assert metadata_client.refresh(transform) is False
+        assert request_mocker.last_request.headers.get('If-None-Match') is not None
+        assert transform.call_count == 1
+
+        request_mocker.register_uri('GET', metadata_client.url, status_code=304, reason='NOT MODIFIED')
+        assert metadata_client.refresh(transform) is False
+        assert transform.call_count == 1
+
+        preferences = dict(preferences, preferred_language='sw')
+        request_mocker.register_uri('GET', metadata_client.url, status_code=200, reason='OK', json=preferences)
+        assert metadata_client.refresh(transform) is True
+        assert json.loads(metadata_client.get_cached_metadata()) == preferences
+        assert transform.call_count == 2
+
+        metadata_client.cache_metadata(json.dumps(preferences))
+        assert metadata_client.refresh(transform) is True
+        assert request_mocker.last_request.headers.get('If-None-Match') is None
+
+    stats = MetadataRefresh.stats()['preferences']
+    assert stats['changed'] == 3
+    assert stats['unchanged'] == 2
+    assert stats['unchanged_fraction'] == 0.4
@@ -10,15 +10,18 @@ from cic_ussd.account.balance import get_cached_display_balance
 from cic_ussd.account.metadata import get_cached_preferred_language
 from cic_ussd.account.statement import (
     get_cached_statement,
-    parse_statement_transactions
+    render_statement_pages,
+    statement_pages_key
 )
 from cic_ussd.account.tokens import (get_active_token_symbol,
                                      get_cached_token_data)
 from cic_ussd.account.transaction import from_wei, to_wei
-from cic_ussd.cache import cache_data, cache_data_key, get_cached_data
+from cic_ussd.cache import cache_data, cache_data_key, get_cached_data, prefetch_cached_data
+from cic_ussd.context import RequestContext
+from cic_ussd.menu.ussd_menu import UssdMenu
 from cic_ussd.metadata import PersonMetadata
 from cic_ussd.phone_number import Support
-from cic_ussd.processor.menu import response, MenuProcessor
+from cic_ussd.processor.menu import response, MenuProcessor, MenuRenderer
 from cic_ussd.processor.util import parse_person_metadata, ussd_menu_list
 from cic_ussd.state_machine.logic.util import cash_rounding_precision
 from cic_ussd.translation import translation_for
@@ -69,7 +72,8 @@ def test_account_statement(activated_account,
     blockchain_address = activated_account.blockchain_address
     preferred_language = get_cached_preferred_language(blockchain_address)
     cached_statement = get_cached_statement(blockchain_address)
-    statement_list = parse_statement_transactions(statement=json.loads(cached_statement))
+    cached_statement = sorted(json.loads(cached_statement), key=lambda d: d['timestamp'], reverse=True)
+    statement_list = render_statement_pages(cached_statement, [preferred_language])[preferred_language]
     first_transaction_set = 'ussd.first_transaction_set'
     middle_transaction_set = 'ussd.middle_transaction_set'
     last_transaction_set = 'ussd.last_transaction_set'
@@ -85,6 +89,8 @@ def test_account_statement(activated_account,
     resp = response(activated_account, last_transaction_set, last_transaction_set[5:], init_database,
                     generic_ussd_session)
     assert resp == translation_for(last_transaction_set, preferred_language, last_transaction_set=transaction_sets[2])
+    identifier = bytes.fromhex(blockchain_address)
+    assert json.loads(get_cached_data(statement_pages_key(identifier))) == {preferred_language: statement_list}
 
 
 def test_add_guardian_pin_authorization(activated_account,
@@ -429,6 +435,17 @@ def test_exit_invalid_menu_option(activated_account, cache_preferences, generic_
     assert resp == translation_for(exit_invalid_menu_option, preferred_language, support_phone=Support.phone_number)
 
 
+def test_exit_invalid_new_pin(activated_account, cache_preferences, generic_ussd_session, init_database,
+                              load_support_phone):
+    blockchain_address = activated_account.blockchain_address
+    preferred_language = get_cached_preferred_language(blockchain_address)
+    exit_invalid_new_pin = 'ussd.exit_invalid_new_pin'
+    resp = response(activated_account, exit_invalid_new_pin, exit_invalid_new_pin[5:], init_database,
+                    generic_ussd_session)
+    assert resp == translation_for(exit_invalid_new_pin, preferred_language, support_phone=Support.phone_number)
+    assert '%{support_phone}' not in resp
+
+
 def test_exit_pin_blocked(activated_account, cache_preferences, generic_ussd_session, init_database,
                           load_support_phone):
     blockchain_address = activated_account.blockchain_address
@@ -475,3 +492,27 @@ def test_exit_successful_transaction(activated_account, cache_preferences, cache
                                    token_symbol=token_symbol,
                                    recipient_information=tx_recipient_information,
                                    sender_information=tx_sender_information)
+
+
+def test_menu_renderer(activated_account,
+                       cache_balances,
+                       cache_preferences,
+                       init_cache,
+                       load_ussd_menu,
+                       preferences,
+                       set_active_token):
+    MenuRenderer.load(UssdMenu.registry)
+    assert MenuRenderer.find('start') is MenuProcessor.start_menu
+    assert MenuRenderer.find('standard_pin_authorization') is MenuProcessor.pin_authorization
+    assert MenuRenderer.find('middle_transaction_set') is MenuProcessor.account_statement
+    assert MenuRenderer.find('no_such_menu') is MenuProcessor.default
+    assert MenuProcessor.start_menu.data == {'balances', 'preferred_language', 'token_list'}
+
+    blockchain_address = activated_account.blockchain_address
+    keys = MenuRenderer.data_keys(activated_account, MenuProcessor.start_menu.data)
+    assert len(keys) == 5
+    with RequestContext() as context:
+        prefetch_cached_data(keys)
+        assert get_cached_preferred_language(blockchain_address) == preferences.get('preferred_language')
+        assert context.reads == 1
+        assert context.avoided_reads == 1
@@ -1,5 +1,6 @@
 # standard imports
 import logging
+import threading
 import time
 from queue import Queue
 
@@ -10,7 +11,8 @@ from cic_types.condiments import MetadataPointer
 # local imports
 from cic_ussd.cache import cache_data, cache_data_key, get_cached_data
 from cic_ussd.error import MaxRetryReached
-from cic_ussd.processor.poller import poller, wait_for_cache, wait_for_session_data
+from cic_ussd.processor.poller import notified_poller, poller, wait_for_cache, wait_for_session_data
+from cic_ussd.session.ussd_session import create_ussd_session, save_session_data
 
 # test imports
 
@@ -42,7 +44,7 @@ def test_wait_for_cache(activated_account, caplog, init_cache, token_symbol):
     assert f'Polling for resource: {resource_name} at: {key} every: {interval} second(s) for {max_retry} seconds.' in caplog.text
 
 
-def test_wait_for_session_data(activated_account, caplog, generic_ussd_session):
+def test_wait_for_session_data(activated_account, caplog, generic_ussd_session, init_cache):
     caplog.set_level(logging.DEBUG)
     generic_ussd_session.__delitem__('data')
     interval = 1
@@ -67,3 +69,45 @@ def test_wait_for_session_data(activated_account, caplog, generic_ussd_session):
     assert f'Data poller with max retry at: {max_retry}. Checking for every: {interval} seconds.' in caplog.text
     assert f'Session data poller for: {resource_name} with max retry at: {max_retry}. Checking for every: {interval} seconds.' in caplog.text
     assert f'Resource: {expected_value} now available.' in caplog.text
+
+
+def test_notified_poller_checks(init_cache):
+    checks = []
+
+    def target():
+        checks.append(None)
+        return None
+
+    with pytest.raises(MaxRetryReached):
+        notified_poller(channel='test:poller', interval=0.1, max_retry=3, store=init_cache, target=target)
+    assert len(checks) == 3
+
+
+def test_wait_for_cache_notification(activated_account, init_cache, token_symbol):
+    identifier = bytes.fromhex(activated_account.blockchain_address)
+    key = cache_data_key(identifier, MetadataPointer.TOKEN_ACTIVE)
+    threading.Timer(0.2, cache_data, args=(key, token_symbol)).start()
+    start = time.monotonic()
+    assert wait_for_cache(identifier, 'Active Token', MetadataPointer.TOKEN_ACTIVE, 10, 2) == token_symbol
+    assert time.monotonic() - start < 5
+    with pytest.raises(MaxRetryReached) as error:
+        wait_for_cache(identifier, 'Active Token', MetadataPointer.BALANCES, 0.1, 2)
+    assert str(error.value) == str(MaxRetryReached([None, None], None))
+
+
+def test_wait_for_session_data_notification(activated_account, init_cache, load_config):
+    ussd_session = create_ussd_session(state='account_tokens',
+                                       external_session_id='AT-wait-001',
+                                       msisdn=activated_account.phone_number,
+                                       service_code=load_config.get('USSD_SERVICE_CODE').split(',')[0],
+                                       user_input='1',
+                                       data={}).to_json()
+    waiting_ussd_session = dict(ussd_session)
+    data = {'selected_token': {'symbol': 'GFT'}}
+    threading.Timer(0.2, save_session_data, kwargs={
+        'queue': None, 'session': None, 'data': data, 'ussd_session': ussd_session}).start()
+    start = time.monotonic()
+    wait_for_session_data('Selected token', 'selected_token', waiting_ussd_session, 10, 2)
+    assert time.monotonic() - start < 5
+    assert waiting_ussd_session['data'] == data
+    assert waiting_ussd_session['version'] == ussd_session['version']
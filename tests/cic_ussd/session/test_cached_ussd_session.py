@@ -2,10 +2,13 @@
 import json
 
 # external imports
+import pytest
 
 # local imports
 from cic_ussd.cache import get_cached_data
+from cic_ussd.codec import Codec
 from cic_ussd.db.models.ussd_session import UssdSession as PersistedUssdSession
+from cic_ussd.error import SessionVersionConflictError
 from cic_ussd.menu.ussd_menu import UssdMenu
 from cic_ussd.session.ussd_session import (create_or_update_session,
                                            create_ussd_session,
@@ -70,3 +73,27 @@ def test_save_session_data(activated_account_ussd_session,
     ussd_session = get_cached_data(external_session_id)
     ussd_session = json.loads(ussd_session)
     assert ussd_session.get('data') == ussd_session_data
+
+
+@pytest.mark.parametrize('codec_format', ['json', 'msgpack'])
+def test_concurrent_session_updates(cached_ussd_session, codec_format, init_cache, monkeypatch):
+    # the cached session is written as JSON before the codec format is set.
+    monkeypatch.setattr(Codec, 'format', codec_format)
+    first_ussd_session = cached_ussd_session.to_json()
+    second_ussd_session = cached_ussd_session.to_json()
+    update_ussd_session(ussd_session=first_ussd_session, user_input='1*2', state='initial_pin_entry', data={'a': '1'})
+    ussd_session = update_ussd_session(
+        ussd_session=second_ussd_session, user_input='1*2*3', state='initial_pin_confirmation', data={'b': '2'})
+    assert ussd_session.version == 3
+    cached_ussd_session = json.loads(get_cached_data(ussd_session.external_session_id))
+    assert cached_ussd_session == ussd_session.to_json()
+    assert cached_ussd_session.get('data') == {'a': '1', 'b': '2'}
+    assert cached_ussd_session.get('state') == 'initial_pin_confirmation'
+
+
+def test_session_version_conflict(cached_ussd_session, init_cache, monkeypatch):
+    monkeypatch.setattr(UssdSession, 'max_conflict_retries', 0)
+    stale_ussd_session = cached_ussd_session.to_json()
+    update_ussd_session(ussd_session=cached_ussd_session.to_json(), user_input='1*2', state='initial_pin_entry')
+    with pytest.raises(SessionVersionConflictError):
+        update_ussd_session(ussd_session=stale_ussd_session, user_input='1*2', state='initial_pin_entry')
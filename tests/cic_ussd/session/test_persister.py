@@ -0,0 +1,76 @@
+# standard imports
+
+# external imports
+import pytest
+
+# local imports
+from cic_ussd.db.models.ussd_session import UssdSession as PersistedUssdSession
+from cic_ussd.session.persister import SessionPersister
+from cic_ussd.session.ussd_session import persist_ussd_session, update_ussd_session
+
+# test imports
+
+
+def test_session_persister(cached_ussd_session, init_cache, init_database, monkeypatch):
+    monkeypatch.setattr(SessionPersister, 'enabled', True)
+    monkeypatch.setattr(SessionPersister, 'batch_size', 2)
+    external_session_id = cached_ussd_session.external_session_id
+    persist_ussd_session(external_session_id, None)
+    persist_ussd_session(external_session_id, None)
+    persist_ussd_session('expired-session-id', None)
+    assert init_cache.scard(SessionPersister.dirty_key) == 2
+    assert SessionPersister.flush(init_database) == 2
+    assert SessionPersister.flush(init_database) == 0
+    persisted_ussd_session = init_database.query(PersistedUssdSession).filter_by(
+        external_session_id=external_session_id).one()
+    assert persisted_ussd_session.to_json() == cached_ussd_session.to_json()
+    assert 0 < init_cache.ttl(external_session_id) <= SessionPersister.expiry
+    assert init_database.query(PersistedUssdSession).count() == 1
+
+    ussd_session = update_ussd_session(
+        ussd_session=cached_ussd_session.to_json(), user_input='1*2', state='initial_pin_entry', data={'a': '1'})
+    persist_ussd_session(external_session_id, None)
+    SessionPersister.flush(init_database)
+    init_database.expire_all()
+    persisted_ussd_session = init_database.query(PersistedUssdSession).filter_by(
+        external_session_id=external_session_id).one()
+    assert persisted_ussd_session.to_json() == ussd_session.to_json()
+
+    # a persisted version newer than the cached one is kept.
+    persisted_ussd_session.version = 5
+    init_database.commit()
+    update_ussd_session(ussd_session=ussd_session.to_json(), user_input='1*2*3', state='exit', data={'a': '2'})
+    persist_ussd_session(external_session_id, None)
+    SessionPersister.flush(init_database)
+    init_database.expire_all()
+    persisted_ussd_session = init_database.query(PersistedUssdSession).filter_by(
+        external_session_id=external_session_id).one()
+    assert persisted_ussd_session.version == 5
+    assert persisted_ussd_session.data == {'a': '1'}
+
+
+def test_session_persister_keeps_unpersisted_sessions_dirty(cached_ussd_session, init_cache, init_database, monkeypatch):
+    monkeypatch.setattr(SessionPersister, 'enabled', True)
+    external_session_id = cached_ussd_session.external_session_id
+    persist_ussd_session(external_session_id, None)
+    execute = init_database.execute
+
+    def failing_execute(*args, **kwargs):
+        raise RuntimeError('connection lost')
+
+    monkeypatch.setattr(init_database, 'execute', failing_execute)
+    with pytest.raises(RuntimeError):
+        SessionPersister.flush(init_database)
+    assert init_cache.sismember(SessionPersister.dirty_key, external_session_id)
+
+    # a session written again while its previous version is persisted stays dirty.
+    def concurrent_execute(*args, **kwargs):
+        update_ussd_session(ussd_session=cached_ussd_session.to_json(), user_input='1*2', state='exit', data={})
+        return execute(*args, **kwargs)
+
+    monkeypatch.setattr(init_database, 'execute', concurrent_execute)
+    SessionPersister.flush(init_database)
+    assert init_cache.sismember(SessionPersister.dirty_key, external_session_id)
+    monkeypatch.setattr(init_database, 'execute', execute)
+    SessionPersister.flush(init_database)
+    assert init_cache.scard(SessionPersister.dirty_key) == 0
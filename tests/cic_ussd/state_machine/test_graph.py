@@ -0,0 +1,110 @@
+# standard imports
+import itertools
+import json
+import os
+import random
+
+# external imports
+import pytest
+from transitions import MachineError
+
+# local imports
+from cic_ussd.files.local_files import json_file_parser
+from cic_ussd.state_machine import UssdStateGraph, UssdStateMachine
+
+# test imports
+from tests.fixtures.config import root_directory
+
+transitions_directory = os.path.join(root_directory, 'transitions')
+transition_files = sorted(os.listdir(transitions_directory))
+
+
+def listify(value) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def transition_sources(transition: dict, states: list) -> list:
+    source = transition.get('source')
+    return states if source == '*' else listify(source)
+
+
+def outcome_assignments(conditions: list, limit: int = 256):
+    if 2 ** len(conditions) <= limit:
+        for values in itertools.product([True, False], repeat=len(conditions)):
+            yield dict(zip(conditions, values))
+    else:
+        randomizer = random.Random(len(conditions))
+        for _ in range(limit):
+            yield {condition: randomizer.choice([True, False]) for condition in conditions}
+
+
+def replay(engine, state: str, state_machine_data: tuple, calls: list):
+    calls.clear()
+    try:
+        result = engine(state, state_machine_data)
+    except (MachineError, ValueError) as error:
+        result = type(error)
+    return result, list(calls)
+
+
+def machine_engine(state: str, state_machine_data: tuple):
+    ussd_session = {'state': state}
+    state_machine = UssdStateMachine(ussd_session=ussd_session)
+    state_machine.scan_data(state_machine_data)
+    return state_machine.state
+
+
+@pytest.mark.parametrize('transition_file', transition_files)
+def test_graph_parity(load_config, monkeypatch, transition_file):
+    states = json_file_parser(filepath=load_config.get('MACHINE_STATES'))
+    transitions = json_file_parser(filepath=load_config.get('MACHINE_TRANSITIONS'))
+
+    calls = []
+    outcomes = {}
+
+    def stub(path):
+        def callback(state_machine_data):
+            calls.append(path)
+            return outcomes.get(path)
+        return callback
+
+    paths = set()
+    for transition in transitions:
+        for key in ('prepare', 'conditions', 'unless', 'before', 'after'):
+            paths.update(listify(transition.get(key)))
+    for path in paths:
+        monkeypatch.setattr(path, stub(path))
+
+    UssdStateMachine.states = states
+    UssdStateMachine.transitions = transitions
+    UssdStateGraph.compile(states, transitions)
+
+    with open(os.path.join(transitions_directory, transition_file)) as data_file:
+        file_transitions = json.load(data_file)
+    sources = set()
+    for transition in file_transitions:
+        sources.update(transition_sources(transition, states))
+
+    state_machine_data = ('', {}, None, None)
+    for source in sorted(sources):
+        conditions = sorted({
+            path
+            for transition in transitions
+            if source in transition_sources(transition, states)
+            for key in ('conditions', 'unless')
+            for path in listify(transition.get(key))
+        })
+        for assignment in outcome_assignments(conditions):
+            outcomes.clear()
+            outcomes.update(assignment)
+            expected = replay(machine_engine, source, state_machine_data, calls)
+            compiled = replay(UssdStateGraph.next_state, source, state_machine_data, calls)
+            assert compiled == expected, f'{source} with {assignment}'
+
+
+def test_graph_without_transitions(init_state_machine):
+    with pytest.raises(MachineError) as error:
+        UssdStateGraph.next_state('exit', ('', {}, None, None))
+    assert error.value.value == "Can't trigger event scan_data from state exit!"
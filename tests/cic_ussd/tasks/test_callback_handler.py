@@ -54,9 +54,7 @@ def test_account_creation_callback(account_creation_data,
     cached_account_creation_data = get_cached_data(task_uuid)
     cached_account_creation_data = json.loads(cached_account_creation_data)
     assert cached_account_creation_data.get('status') == account_creation_data.get('status')
-    mock_add_preferences_metadata = mocker.patch('cic_ussd.tasks.metadata.add_preferences_metadata.apply_async')
-    mock_add_phone_pointer = mocker.patch('cic_ussd.tasks.metadata.add_phone_pointer.apply_async')
-    mock_add_custom_metadata = mocker.patch('cic_ussd.tasks.metadata.add_custom_metadata.apply_async')
+    mock_create_account_metadata = mocker.patch('cic_ussd.tasks.metadata.create_account_metadata.apply_async')
     preferred_language = preferences.get('preferred_language')
     s_account_creation_callback = celery.signature(
         'cic_ussd.tasks.callback_handler.account_creation_callback', [result, preferred_language, 0]
@@ -67,9 +65,10 @@ def test_account_creation_callback(account_creation_data,
     cached_account_creation_data = get_cached_data(task_uuid)
     cached_account_creation_data = json.loads(cached_account_creation_data)
     assert cached_account_creation_data.get('status') == 'CREATED'
-    mock_add_preferences_metadata.assert_called_with((result, preferences), {}, queue='cic-ussd')
-    mock_add_phone_pointer.assert_called_with((result, phone_number), {}, queue='cic-ussd')
-    mock_add_custom_metadata.assert_called_with((result, custom_metadata), {}, queue='cic-ussd')
+    person_metadata = mock_create_account_metadata.call_args[0][0][4]
+    assert person_metadata is not None
+    mock_create_account_metadata.assert_called_with(
+        (result, phone_number, preferences, custom_metadata, person_metadata), {}, queue='cic-ussd')
 
     task_uuid = celery.uuid()
     mock_task.root_id = task_uuid
@@ -113,7 +112,7 @@ def test_statement_callback(activated_account, mocker, transactions_list):
 
     mock_task = mocker.patch('celery.app.task.Task.request')
     mock_task.delivery_info = {'routing_key': 'cic-ussd'}
-    mock_statement_generate = mocker.patch('cic_ussd.tasks.processor.generate_statement.apply_async')
+    mock_process_statement = mocker.patch('cic_ussd.tasks.processor.process_statement.apply_async')
     status_code = 0
     s_statement_callback = celery.signature(
         'cic_ussd.tasks.callback_handler.statement_callback',
@@ -122,8 +121,8 @@ def test_statement_callback(activated_account, mocker, transactions_list):
     statement_transactions = filter_statement_transactions(transactions_list)
     recipient_transaction, sender_transaction = transaction_actors(statement_transactions[0])
     sender_transaction['alt_blockchain_address'] = recipient_transaction.get('blockchain_address')
-    mock_statement_generate.assert_called_with(
-        (activated_account.blockchain_address, sender_transaction), {}, queue='cic-ussd')
+    mock_process_statement.assert_called_once_with(
+        (activated_account.blockchain_address, [sender_transaction]), {}, queue='cic-ussd')
 
 
 def test_token_data_callback(activated_account,
@@ -9,7 +9,7 @@ from cic_types.condiments import MetadataPointer
 
 # local imports
 from cic_ussd.cache import cache_data_key, get_cached_data
-from cic_ussd.metadata import PersonMetadata, PreferencesMetadata
+from cic_ussd.metadata import CustomMetadata, PersonMetadata, PhonePointerMetadata, PreferencesMetadata
 
 # tests imports
 
@@ -50,3 +50,34 @@ def test_query_preferences_metadata(activated_account,
         cached_preferences_metadata = get_cached_data(key)
         cached_preferences_metadata = json.loads(cached_preferences_metadata)
         assert cached_preferences_metadata == preferences
+
+
+def test_create_account_metadata(activated_account,
+                                 celery_session_worker,
+                                 custom_metadata,
+                                 init_cache,
+                                 mocker,
+                                 person_metadata,
+                                 preferences,
+                                 setup_metadata_request_handler,
+                                 setup_metadata_signer):
+    blockchain_address = activated_account.blockchain_address
+    identifier = bytes.fromhex(strip_0x(blockchain_address))
+    phone_number = activated_account.phone_number
+    mock_add_custom_metadata = mocker.patch('cic_ussd.tasks.metadata.add_custom_metadata.apply_async')
+    mock_add_phone_pointer = mocker.patch('cic_ussd.tasks.metadata.add_phone_pointer.apply_async')
+    with requests_mock.Mocker(real_http=False) as request_mocker:
+        for metadata_client, data in [(PreferencesMetadata(identifier), preferences),
+                                      (PhonePointerMetadata(phone_number.encode('utf-8')), blockchain_address),
+                                      (PersonMetadata(identifier), person_metadata)]:
+            request_mocker.register_uri('POST', metadata_client.url, status_code=200, reason='OK', json=data)
+            request_mocker.register_uri('PUT', metadata_client.url, status_code=200, reason='OK', json=data)
+        request_mocker.register_uri('POST', CustomMetadata(identifier).url, status_code=503, reason='UNAVAILABLE')
+        s_create_account_metadata = celery.signature(
+            'cic_ussd.tasks.metadata.create_account_metadata',
+            [blockchain_address, phone_number, preferences, custom_metadata, person_metadata])
+        s_create_account_metadata.apply().get()
+        assert len([request for request in request_mocker.request_history if request.method == 'PUT']) == 3
+    mock_add_custom_metadata.assert_called_once()
+    assert mock_add_custom_metadata.call_args[0][0] == (blockchain_address, custom_metadata)
+    mock_add_phone_pointer.assert_not_called()
@@ -7,6 +7,7 @@ from chainlib.hash import strip_0x
 from cic_types.condiments import MetadataPointer
 
 # local imports
+from cic_ussd.account.statement import statement_pages_key
 from cic_ussd.account.transaction import transaction_actors
 from cic_ussd.cache import cache_data_key, get_cached_data
 
@@ -63,7 +64,10 @@ def test_cache_statement(activated_account,
     s_cache_statement.apply_async().get()
     cached_statement = get_cached_data(key)
     cached_statement = json.loads(cached_statement)
-    assert len(cached_statement) == 2
+    assert len(cached_statement) == 1
+    assert cached_statement[0].get('token_value') == 60.0
+    statement_pages = json.loads(get_cached_data(statement_pages_key(identifier)))
+    assert len(statement_pages[result.get('preferred_language')]) == 1
 
 
 def test_parse_transaction(activated_account,
@@ -80,3 +84,33 @@ def test_parse_transaction(activated_account,
     result = s_parse_transaction.apply_async().get()
     assert result.get('metadata_id') == activated_account.standard_metadata_id()
     assert result.get('phone_number') == activated_account.phone_number
+
+
+def test_process_statement(activated_account,
+                           cache_default_token_data,
+                           cache_person_metadata,
+                           cache_preferences,
+                           celery_session_worker,
+                           init_database,
+                           transactions_list,
+                           valid_recipient):
+    transactions = []
+    for transaction in transactions_list[:2]:
+        recipient_transaction, sender_transaction = transaction_actors(transaction)
+        sender_transaction['blockchain_address'] = activated_account.blockchain_address
+        sender_transaction['alt_blockchain_address'] = valid_recipient.blockchain_address
+        transactions.append(sender_transaction)
+    transactions.append(dict(transactions[0]))
+    s_process_statement = celery.signature(
+        'cic_ussd.tasks.processor.process_statement', [activated_account.blockchain_address, transactions])
+    s_process_statement.apply_async().get()
+    identifier = bytes.fromhex(activated_account.blockchain_address)
+    cached_statement = json.loads(get_cached_data(cache_data_key(identifier, MetadataPointer.STATEMENT)))
+    assert [transaction.get('tx_hash') for transaction in cached_statement] == \
+           [transactions_list[1].get('hash'), transactions_list[0].get('hash')]
+    assert cached_statement[0].get('alt_metadata_id') == valid_recipient.standard_metadata_id()
+    assert cached_statement[0].get('metadata_id') == activated_account.standard_metadata_id()
+    statement_pages = json.loads(get_cached_data(statement_pages_key(identifier)))
+    assert len(statement_pages[cached_statement[0].get('preferred_language')]) == 2
+    key = cache_data_key(identifier, MetadataPointer.TOKEN_LAST_SENT)
+    assert get_cached_data(key) == transactions_list[1].get('source_token_symbol')
@@ -1,12 +1,31 @@
 # standard imports
 import hashlib
 import json
+import time
+from collections import OrderedDict
 
 # external imports
+import pytest
 from cic_types.condiments import MetadataPointer
 
 # local imports
-from cic_ussd.cache import cache_data, cache_data_key, get_cached_data
+from cic_ussd.cache import (cache_data,
+                            cache_data_key,
+                            cache_object,
+                            cache_pipeline,
+                            CacheKey,
+                            CachePolicy,
+                            configure_cache,
+                            get_cached_data,
+                            get_cached_object,
+                            get_many,
+                            get_many_objects,
+                            L1Cache,
+                            set_many,
+                            update_cached_objects)
+from cic_ussd.codec import Codec
+from cic_ussd.context import RequestContext
+from cic_ussd.error import InitializationError
 
 # test imports
 
@@ -32,3 +51,158 @@ def test_get_cached_data(cached_ussd_session):
     ussd_session = get_cached_data(cached_ussd_session.external_session_id)
     ussd_session = json.loads(ussd_session)
     assert ussd_session.get('msisdn') == cached_ussd_session.msisdn
+
+
+def test_cache_data_ttl(init_cache):
+    cache_data('some_key', 'some_value', ttl=60)
+    assert 0 < init_cache.ttl('some_key') <= 60
+    cache_data('some_key', 'some_value')
+    assert init_cache.ttl('some_key') == -1
+
+
+def test_get_many_set_many(init_cache):
+    assert get_many(['a', 'b']) == [None, None]
+    set_many({'a': '1', 'b': '2'}, ttl=60)
+    assert get_many(['b', 'c', 'a']) == ['2', None, '1']
+    assert 0 < init_cache.ttl('a') <= 60
+    with RequestContext() as context:
+        context.cached_data['a'] = 'held'
+        assert get_many(['a', 'b']) == ['held', '2']
+        assert context.reads == 1
+        assert context.avoided_reads == 1
+
+
+def test_cache_pipeline(init_cache):
+    with RequestContext() as context:
+        context.cached_data['a'] = None
+        with cache_pipeline() as pipeline:
+            pipeline.cache_data('a', '1')
+            pipeline.cache_data('b', '2', 60)
+            assert get_cached_data('b') is None
+        assert 'a' not in context.cached_data
+    assert get_many(['a', 'b']) == ['1', '2']
+    try:
+        with cache_pipeline() as pipeline:
+            pipeline.cache_data('c', '3')
+            raise ValueError()
+    except ValueError:
+        pass
+    assert get_cached_data('c') is None
+
+
+def test_configure_cache(load_config, monkeypatch):
+    for cls, names in [(CachePolicy, ['ttls', 'sliding']),
+                       (Codec, ['format', 'compression_threshold']),
+                       (L1Cache, ['maxsize', 'namespaces', 'policies'])]:
+        for name in names:
+            monkeypatch.setattr(cls, name, getattr(cls, name))
+    configure_cache(load_config)
+    assert CachePolicy.ttls['person'] == int(load_config.get('REDIS_TTL_PERSON'))
+    assert 'person' in CachePolicy.sliding
+    assert Codec.format == load_config.get('REDIS_CODEC')
+    assert L1Cache.policies == {'token_data': 300, 'token_default': 300, 'token_sink_address': 3600}
+    assert L1Cache.namespaces == {'system:languages'.encode('utf-8'): 3600}
+
+    monkeypatch.setitem(load_config.store, 'REDIS_CODEC', 'pickle')
+    with pytest.raises(InitializationError):
+        configure_cache(load_config)
+
+
+def test_l1_cache(init_cache, monkeypatch):
+    monkeypatch.setattr(L1Cache, 'policies', {'token_data': 60})
+    monkeypatch.setattr(L1Cache, 'maxsize', 2)
+    for name, value in [('entries', OrderedDict()), ('key_ttls', {}), ('hits', 0), ('misses', 0), ('evictions', 0)]:
+        monkeypatch.setattr(L1Cache, name, value)
+    key = cache_data_key('GFT'.encode('utf-8'), MetadataPointer.TOKEN_DATA)
+    person_key = cache_data_key('GFT'.encode('utf-8'), MetadataPointer.PERSON)
+    assert list(L1Cache.key_ttls) == [key]
+
+    cache_data(key, 'token data')
+    cache_data(person_key, 'person')
+    assert get_cached_data(key) == 'token data'
+    init_cache.set(key, 'changed underneath')
+    init_cache.set(person_key, 'changed underneath')
+    assert get_cached_data(key) == 'token data'
+    assert get_cached_data(person_key) == 'changed underneath'
+    assert L1Cache.stats() == {'entries': 1, 'evictions': 0, 'hits': 1, 'misses': 1}
+
+    cache_data(key, 'token data update')
+    assert get_cached_data(key) == 'token data update'
+
+    # a write published by another process.
+    init_cache.set(key, 'remote update')
+    init_cache.publish(L1Cache.channel, key)
+    for _ in range(50):
+        if key not in L1Cache.entries:
+            break
+        time.sleep(0.1)
+    assert get_cached_data(key) == 'remote update'
+
+    for symbol in ['DET', 'SRF']:
+        other_key = cache_data_key(symbol.encode('utf-8'), MetadataPointer.TOKEN_DATA)
+        cache_data(other_key, symbol)
+        assert get_many([other_key]) == [symbol]
+    assert key not in L1Cache.entries
+    assert L1Cache.stats()['evictions'] == 1
+
+
+def test_cache_policy(init_cache, monkeypatch):
+    monkeypatch.setattr(CachePolicy, 'ttls', {'balances': 600, 'person': 60, 'account_creation': 30})
+    monkeypatch.setattr(CachePolicy, 'sliding', {'person'})
+    balances_key = cache_data_key('0xabc'.encode('utf-8'), MetadataPointer.BALANCES)
+    person_key = cache_data_key('0xabc'.encode('utf-8'), MetadataPointer.PERSON)
+    token_key = cache_data_key('GFT'.encode('utf-8'), MetadataPointer.TOKEN_DATA)
+    assert balances_key.namespace == 'balances'
+    assert cache_data_key('0xabc'.encode('utf-8'), MetadataPointer.NONE).namespace is None
+
+    cache_data(balances_key, 'balances')
+    cache_data(person_key, 'person')
+    cache_data(token_key, 'token data')
+    cache_data(CacheKey('task-uuid', 'account_creation'), 'pending')
+    cache_data(balances_key.__str__(), 'balances', 5)
+    assert 0 < init_cache.ttl(balances_key) <= 5
+    cache_data(balances_key, 'balances')
+    assert 5 < init_cache.ttl(balances_key) <= 600
+    assert 0 < init_cache.ttl('task-uuid') <= 30
+    assert init_cache.ttl(token_key) == -1
+
+    init_cache.expire(person_key, 10)
+    init_cache.expire(balances_key, 10)
+    assert get_cached_data(person_key) == 'person'
+    assert get_many([balances_key]) == ['balances']
+    assert init_cache.ttl(person_key) > 10
+    assert init_cache.ttl(balances_key) <= 10
+
+
+def test_cache_object(init_cache, monkeypatch):
+    monkeypatch.setattr(Codec, 'format', 'msgpack')
+    statement = [{'token_symbol': 'GFT', 'token_value': 25000000}]
+    cache_object('statement', statement)
+    cache_data('balances', json.dumps({'balance_network': 50000000}))
+    assert init_cache.connection_pool.connection_kwargs.get('decode_responses')
+    assert get_cached_object('statement') == statement
+    assert json.loads(get_cached_data('statement')) == statement
+    assert get_many_objects(['balances', 'statement', 'missing']) == [{'balance_network': 50000000}, statement, None]
+    with RequestContext():
+        with cache_pipeline() as pipeline:
+            pipeline.cache_object('statement', statement * 2)
+        assert get_many_objects(['statement']) == [statement * 2]
+
+
+def test_update_cached_objects(init_cache):
+    cache_object('statement', [1])
+    calls = []
+
+    def update(cached):
+        calls.append(cached)
+        if len(calls) == 1:
+            cache_object('statement', [1, 2])
+        statement, pages = cached
+        return [statement + [3], {'en': len(statement) + 1}]
+
+    assert update_cached_objects(['statement', 'pages'], update) == [[1, 2, 3], {'en': 3}]
+    assert calls == [[[1], None], [[1, 2], None]]
+    assert get_many_objects(['statement', 'pages']) == [[1, 2, 3], {'en': 3}]
+
+    assert update_cached_objects(['statement', 'pages'], lambda cached: [None, {'sw': 3}]) == [None, {'sw': 3}]
+    assert get_many_objects(['statement', 'pages']) == [[1, 2, 3], {'sw': 3}]
@@ -0,0 +1,45 @@
+# standard imports
+import json
+
+# external imports
+import pytest
+
+# local imports
+from cic_ussd.codec import binary_client, Codec, MSGPACK_TAG, MSGPACK_ZLIB_TAG
+
+# test imports
+
+
+@pytest.mark.parametrize('codec_format, compression_threshold, tag', [
+    ('json', 0, ord('{')),
+    ('msgpack', 0, MSGPACK_TAG),
+    ('msgpack', 64, MSGPACK_ZLIB_TAG),
+])
+def test_codec(codec_format, compression_threshold, monkeypatch, tag):
+    monkeypatch.setattr(Codec, 'format', codec_format)
+    monkeypatch.setattr(Codec, 'compression_threshold', compression_threshold)
+    data = {'transactions': [{'token_symbol': 'GFT', 'token_value': 25000000, 'name': 'Jöhn'}] * 10, 'version': 2}
+    value = Codec.encode(data)
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    assert value[0] == tag
+    assert Codec.decode(value) == data
+    assert json.loads(Codec.text(value)) == data
+    assert Codec.encode(data, compress=False)[0] != MSGPACK_ZLIB_TAG
+
+
+def test_codec_reads_json(init_cache, monkeypatch):
+    monkeypatch.setattr(Codec, 'format', 'msgpack')
+    init_cache.set('legacy', json.dumps({'a': 'ü'}))
+    init_cache.set('binary', Codec.encode({'a': 'ü'}))
+    store = binary_client(init_cache)
+    assert store is binary_client(init_cache)
+    assert Codec.decode(store.get('legacy')) == Codec.decode(store.get('binary')) == {'a': 'ü'}
+    assert Codec.text(store.get('legacy')) == json.dumps({'a': 'ü'})
+    assert Codec.decode(store.get('missing')) is None
+
+
+def test_codec_unknown_format(monkeypatch):
+    monkeypatch.setattr(Codec, 'format', 'yaml')
+    with pytest.raises(ValueError):
+        Codec.encode({})
@@ -0,0 +1,51 @@
+# standard imports
+
+# external imports
+
+# local imports
+from cic_ussd.account.tokens import get_active_token_symbol, set_active_token
+from cic_ussd.context import current_context, forget, memoized, RequestContext
+
+# test imports
+
+
+def test_memoized_without_context():
+    calls = []
+
+    def loader(value):
+        calls.append(value)
+        return value
+
+    assert current_context() is None
+    assert memoized(loader, 'a') == 'a'
+    assert memoized(loader, 'a') == 'a'
+    assert calls == ['a', 'a']
+
+
+def test_request_context():
+    calls = []
+
+    def loader(value, identifier):
+        calls.append(value)
+        return f'{value}:{len(identifier)}'
+
+    with RequestContext() as context:
+        assert current_context() is context
+        assert memoized(loader, 'a', [b'x', b'y']) == 'a:2'
+        assert memoized(loader, 'a', [b'x', b'y']) == 'a:2'
+        assert memoized(loader, 'b', [b'x']) == 'b:1'
+        forget(loader, 'b', [b'x'])
+        assert memoized(loader, 'b', [b'x']) == 'b:1'
+    assert current_context() is None
+    assert calls == ['a', 'b', 'b']
+    assert context.reads == 3
+    assert context.avoided_reads == 1
+
+
+def test_active_token_change_in_context(activated_account, init_cache, token_symbol):
+    blockchain_address = activated_account.blockchain_address
+    set_active_token(blockchain_address, token_symbol)
+    with RequestContext():
+        assert memoized(get_active_token_symbol, blockchain_address) == token_symbol
+        set_active_token(blockchain_address, 'TEST')
+        assert memoized(get_active_token_symbol, blockchain_address) == 'TEST'
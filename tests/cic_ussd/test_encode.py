@@ -1,5 +1,14 @@
+# external imports
+import bcrypt
+import pytest
+
 # local imports
-from cic_ussd.encoder import check_password_hash, create_password_hash
+from cic_ussd.encoder import (check_password_hash,
+                              create_password_hash,
+                              needs_rehash,
+                              password_hash_rounds,
+                              PinHasher)
+from cic_ussd.error import InitializationError
 
 
 def test_create_password_hash(load_config):
@@ -11,3 +20,35 @@ def test_create_password_hash(load_config):
 def test_check_password_hash():
     password_hash = create_password_hash(password='Password')
     assert check_password_hash(password='Password', hashed_password=password_hash) is True
+
+
+def test_password_hash_rounds(monkeypatch):
+    monkeypatch.setattr(PinHasher, 'rounds', 4)
+    password_hash = create_password_hash(password='Password')
+    assert password_hash_rounds(password_hash) == 4
+    assert needs_rehash(password_hash) is False
+    monkeypatch.setattr(PinHasher, 'rounds', 5)
+    assert needs_rehash(password_hash) is True
+
+
+def test_pin_hasher_configure(load_config, monkeypatch):
+    monkeypatch.setattr(PinHasher, 'rounds', PinHasher.rounds)
+    monkeypatch.setattr(PinHasher, 'max_workers', PinHasher.max_workers)
+    monkeypatch.setitem(load_config.store, 'PIN_ROUNDS', '5')
+    PinHasher.configure(load_config)
+    assert PinHasher.rounds == 5
+    assert password_hash_rounds(create_password_hash(password='Password')) == 5
+
+    monkeypatch.setitem(load_config.store, 'PIN_ROUNDS', '32')
+    with pytest.raises(InitializationError):
+        PinHasher.configure(load_config)
+
+
+def test_pin_hasher_stats():
+    hashes = PinHasher.stats().get('hashes')
+    futures = [PinHasher.submit(bcrypt.hashpw, b'0000', bcrypt.gensalt(4)) for _ in range(3)]
+    assert all(future.result().startswith(b'$2b$04$') for future in futures)
+    stats = PinHasher.stats()
+    assert stats.get('hashes') == hashes + 3
+    assert stats.get('max_hash_seconds') > 0
+    assert stats.get('max_queue_seconds') >= stats.get('mean_queue_seconds') >= 0
@@ -4,7 +4,7 @@
 import pytest
 
 # local imports
-from cic_ussd.phone_number import process_phone_number
+from cic_ussd.phone_number import normalize_phone_number, process_phone_number
 
 # tests imports
 
@@ -16,3 +16,14 @@ from cic_ussd.phone_number import process_phone_number
 def test_process_phone_number(expected_result, phone_number, region):
     processed_phone_number = process_phone_number(phone_number=phone_number, region=region)
     assert processed_phone_number == expected_result
+
+
+@pytest.mark.parametrize("phone_number, region, expected_result", [
+    ("0712345678", "KE", "+254712345678"),
+    ("254712345678", "KE", "+254712345678"),
+    ("254712345678", None, "+254712345678"),
+    ("+254712345678", None, "+254712345678"),
+    ("not a number", "KE", "not a number")
+])
+def test_normalize_phone_number(expected_result, phone_number, region):
+    assert normalize_phone_number(phone_number, region) == expected_result
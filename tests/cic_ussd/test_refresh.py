@@ -0,0 +1,27 @@
+# standard imports
+
+# external imports
+
+# local imports
+from cic_ussd.refresh import RefreshScheduler
+
+# test imports
+
+
+def test_refresh_scheduler(activated_account, init_cache, load_config, monkeypatch):
+    windows = {resource: int(load_config.get(f'REFRESH_{resource.upper()}')) for resource in RefreshScheduler.resources}
+    assert windows == {resource: 0 for resource in RefreshScheduler.resources}
+    blockchain_address = activated_account.blockchain_address
+    assert RefreshScheduler.claim('statement', blockchain_address) is True
+    assert RefreshScheduler.claim('statement', blockchain_address) is True
+
+    monkeypatch.setattr(RefreshScheduler, 'windows', {'statement': 30})
+    assert RefreshScheduler.claim('statement', blockchain_address) is True
+    assert RefreshScheduler.claim('statement', blockchain_address) is False
+    assert RefreshScheduler.claim('statement', blockchain_address) is False
+    assert RefreshScheduler.claim('statement', 'other') is True
+    assert RefreshScheduler.claim('balances', blockchain_address) is True
+    assert init_cache.ttl(f'refresh:statement:{blockchain_address}') <= 30
+    stats = RefreshScheduler.stats()
+    assert stats['statement'] == {'enqueued': 2, 'suppressed': 2}
+    assert stats['balances'] == {'enqueued': 0, 'suppressed': 0}
@@ -1,9 +1,11 @@
 # standard imports
+import os
+import shutil
 
 # external imports
 
 # local imports
-from cic_ussd.translation import translation_for
+from cic_ussd.translation import CompiledTemplate, render, translation_for, Translations
 
 # tests imports
 
@@ -19,3 +21,46 @@ def test_translation_for(set_locale_files):
     )
     assert swahili_translation == 'END Chaguo si sahihi'
     assert english_translation == 'END Invalid request.'
+
+
+def test_render(set_locale_files):
+    assert render('ussd.exit_invalid_request', 'sw') == translation_for('ussd.exit_invalid_request', 'sw')
+    assert render('ussd.exit_invalid_request') == translation_for('ussd.exit_invalid_request', 'en')
+    assert render('ussd.exit_invalid_request', 'xx') == 'END Invalid request.'
+    assert render('ussd.no_such_key', 'en') == 'ussd.no_such_key'
+    assert render('ussd.no_such_key', 'en', default='default') == 'default'
+
+
+def test_compiled_template():
+    template = CompiledTemplate('CON Balance %{token_balance} %{token_symbol} %%{escaped}')
+    assert template.render({'token_balance': 50, 'token_symbol': 'GFT'}) == 'CON Balance 50 GFT %{escaped}'
+    assert template.render({'token_balance': 50}) == 'CON Balance 50 %{token_symbol} %{escaped}'
+    assert CompiledTemplate('END Thank you.').render({}) == 'END Thank you.'
+
+
+def test_translations_build(load_config, monkeypatch, tmpdir_factory):
+    import cic_translations
+    schema_file_path = os.path.join(cic_translations.__path__[0], load_config.get('SCHEMA_FILE_PATH'))
+    translation_builder_path = str(tmpdir_factory.mktemp('builders'))
+    locale_dir = str(tmpdir_factory.mktemp('locale'))
+    for file in os.listdir(load_config.get('LOCALE_FILE_BUILDERS')):
+        shutil.copy(os.path.join(load_config.get('LOCALE_FILE_BUILDERS'), file), translation_builder_path)
+
+    Translations.build(locale_dir, schema_file_path, translation_builder_path)
+    templates = Translations.templates
+    assert os.path.isfile(os.path.join(locale_dir, Translations.artifact_file))
+
+    def fail(**kwargs):
+        raise AssertionError('locale files regenerated.')
+    with monkeypatch.context() as patch:
+        patch.setattr('cic_ussd.translation.generate_locale_files', fail)
+        Translations.build(locale_dir, schema_file_path, translation_builder_path)
+    assert Translations.templates.keys() == templates.keys()
+    assert render('ussd.exit_invalid_request', 'en') == 'END Invalid request.'
+
+    with open(os.path.join(translation_builder_path, 'ussd.csv'), 'a') as builder_file:
+        builder_file.write('\n')
+    generated = []
+    monkeypatch.setattr('cic_ussd.translation.generate_locale_files', lambda **kwargs: generated.append(kwargs))
+    Translations.build(locale_dir, schema_file_path, translation_builder_path)
+    assert len(generated) == 1
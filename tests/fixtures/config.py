@@ -14,9 +14,9 @@ from cic_ussd.account.guardianship import Guardianship
 from cic_ussd.files.local_files import create_local_file_data_stores, json_file_parser
 from cic_ussd.menu.ussd_menu import UssdMenu
 from cic_ussd.phone_number import E164Format, Support
-from cic_ussd.state_machine import UssdStateMachine
+from cic_ussd.state_machine import UssdStateGraph, UssdStateMachine
 from cic_ussd.state_machine.logic.manager import States
-from cic_ussd.translation import generate_locale_files, Languages
+from cic_ussd.translation import generate_locale_files, Languages, Translations
 from cic_ussd.validator import validate_presence
 from cic_ussd.time import TimezoneHandler
 
@@ -40,6 +40,7 @@ def alembic_config():
 def init_state_machine(load_config):
     UssdStateMachine.states = json_file_parser(filepath=load_config.get('MACHINE_STATES'))
     UssdStateMachine.transitions = json_file_parser(filepath=load_config.get('MACHINE_TRANSITIONS'))
+    UssdStateGraph.compile(UssdStateMachine.states, UssdStateMachine.transitions)
 
 
 @pytest.fixture(scope='function')
@@ -84,6 +85,7 @@ def load_support_phone(load_config):
 def load_ussd_menu(load_config):
     ussd_menu_db = create_local_file_data_stores(file_location=load_config.get('USSD_MENU_FILE'), table_name="ussd_menu")
     UssdMenu.ussd_menu_db = ussd_menu_db
+    UssdMenu.load_registry(json_file_parser(filepath=load_config.get('MACHINE_STATES')))
 
 
 @pytest.fixture(scope='function')
@@ -106,6 +108,7 @@ def set_locale_files(load_config, tmpdir_factory):
                           translation_builder_path=load_config.get('LOCALE_FILE_BUILDERS'))
     i18n.load_path.append(tmpdir_path)
     i18n.set('fallback', load_config.get('LOCALE_FALLBACK'))
+    Translations.load(tmpdir_path)
 
 
 @pytest.fixture(scope='function')